@@ -1,14 +1,18 @@
 import datetime as dt
-from .generador import Generador
+from .generador import Generador, np
 
 class GeneradorUniforme(Generador):
     """Generador con probabilidad uniforme de llegada por minuto."""
 
-    def __init__(self, poblacion: int, probabilidad: float = 0.05, **kwargs):
+    def __init__(self, poblacion: int, probabilidad: float = 0.05, vectorizado: bool = False, **kwargs):
         super().__init__(poblacion, **kwargs)
         self.probabilidad = probabilidad
+        self.vectorizado = vectorizado
 
     def generar_clientes(self, minutos: int, constructor, update: bool = True):
+        if self.vectorizado:
+            return self._generar_clientes_vectorizado(minutos, constructor, update)
+
         clientes = []
         for m in range(minutos):
             if self.rdm.random() < self.probabilidad:
@@ -19,4 +23,29 @@ class GeneradorUniforme(Generador):
         if update:
             self.current_datetime += dt.timedelta(minutes=minutos)
 
-        return clientes
\ No newline at end of file
+        return clientes
+
+    def generar_arreglos(self, minutos: int, update: bool = True):
+        """
+        Genera las llegadas de `minutos` minutos en un solo lote con NumPy.
+
+        Retorna (minutos_llegada, ids): arreglos int64 donde minutos_llegada
+        es el desfase en minutos desde current_datetime antes de la llamada.
+        Con la misma semilla y parámetros el resultado es reproducible.
+        """
+        rng = self.rng_numpy()
+        minutos_llegada = np.flatnonzero(rng.random(minutos) < self.probabilidad)
+        ids = rng.integers(1, self.poblacion, size=len(minutos_llegada), endpoint=True)
+
+        if update:
+            self.current_datetime += dt.timedelta(minutes=minutos)
+
+        return minutos_llegada, ids
+
+    def _generar_clientes_vectorizado(self, minutos: int, constructor, update: bool = True):
+        inicio = self.current_datetime
+        minutos_llegada, ids = self.generar_arreglos(minutos, update)
+        return [
+            constructor(cliente_id, inicio + dt.timedelta(minutes=m))
+            for m, cliente_id in zip(minutos_llegada.tolist(), ids.tolist())
+        ]
\ No newline at end of file
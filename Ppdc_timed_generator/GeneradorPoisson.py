@@ -0,0 +1,78 @@
+import datetime as dt
+from typing import Dict, Sequence, Union
+from .generador import Generador, np
+
+MINUTOS_DIA = 24 * 60
+
+class GeneradorPoisson(Generador):
+    """
+    Generador de llegadas según un proceso de Poisson no homogéneo.
+
+    La tasa se define por hora del día (llegadas por hora) y vale cero fuera
+    del horario entre hora_apertura y hora_cierre. Como la tasa es constante
+    dentro de cada minuto, la cantidad de llegadas por minuto se muestrea de
+    una Poisson con la tasa integrada del minuto, y cada llegada se ubica de
+    forma uniforme dentro de él (se admiten varias llegadas por minuto).
+    Todo se calcula en lotes con NumPy.
+    """
+
+    def __init__(self, poblacion: int, perfil_horario: Union[Sequence[float], Dict[int, float]], **kwargs):
+        super().__init__(poblacion, **kwargs)
+        self.perfil_horario = self._normalizar_perfil(perfil_horario)
+
+    @staticmethod
+    def _normalizar_perfil(perfil) -> list:
+        """Convierte el perfil a una lista de 24 tasas (llegadas por hora)."""
+        if isinstance(perfil, dict):
+            tasas = [0.0] * 24
+            for hora, tasa in perfil.items():
+                if not 0 <= hora < 24:
+                    raise ValueError(f"Hora fuera de rango en el perfil: {hora}")
+                tasas[hora] = float(tasa)
+        else:
+            tasas = [float(tasa) for tasa in perfil]
+            if len(tasas) != 24:
+                raise ValueError("El perfil horario debe tener 24 tasas (una por hora)")
+
+        if any(tasa < 0 for tasa in tasas):
+            raise ValueError("Las tasas del perfil no pueden ser negativas")
+        return tasas
+
+    def tasas_por_minuto(self, minutos: int):
+        """Llegadas esperadas en cada minuto del lapso, desde current_datetime."""
+        inicio = self.current_datetime.hour * 60 + self.current_datetime.minute
+        minuto_del_dia = (inicio + np.arange(minutos)) % MINUTOS_DIA
+
+        apertura = self.hora_apertura.hour * 60 + self.hora_apertura.minute
+        cierre = self.hora_cierre.hour * 60 + self.hora_cierre.minute
+        abierto = (minuto_del_dia >= apertura) & (minuto_del_dia < cierre)
+
+        tasas = np.asarray(self.perfil_horario)[minuto_del_dia // 60] / 60
+        return np.where(abierto, tasas, 0.0)
+
+    def generar_arreglos(self, minutos: int, update: bool = True):
+        """
+        Genera las llegadas de `minutos` minutos en un solo lote.
+
+        Retorna (minutos_llegada, ids): minutos_llegada es un arreglo float
+        ordenado con el desfase en minutos desde current_datetime antes de la
+        llamada, e ids los clientes correspondientes.
+        """
+        rng = self.rng_numpy()
+        conteos = rng.poisson(self.tasas_por_minuto(minutos))
+        minuto_entero = np.repeat(np.arange(minutos), conteos)
+        minutos_llegada = np.sort(minuto_entero + rng.random(len(minuto_entero)))
+        ids = rng.integers(1, self.poblacion, size=len(minutos_llegada), endpoint=True)
+
+        if update:
+            self.current_datetime += dt.timedelta(minutes=minutos)
+
+        return minutos_llegada, ids
+
+    def generar_clientes(self, minutos: int, constructor, update: bool = True):
+        inicio = self.current_datetime
+        minutos_llegada, ids = self.generar_arreglos(minutos, update)
+        return [
+            constructor(cliente_id, inicio + dt.timedelta(minutes=m))
+            for m, cliente_id in zip(minutos_llegada.tolist(), ids.tolist())
+        ]
@@ -1,13 +1,15 @@
 __version__ = "1.1.0"
 __license__ = "MIT"
 from .generador import Generador
-from .generadores import GeneradorUniforme
+from .GeneradoorUniforme import GeneradorUniforme
+from .GeneradorPoisson import GeneradorPoisson
 
 # Define public API
 __all__ = [
     # Core classes
     "Generador",
     "GeneradorUniforme",
+    "GeneradorPoisson",
     # Metadata
     "__version__",
 ]
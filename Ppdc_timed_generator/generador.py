@@ -1,7 +1,12 @@
 import datetime as dt
 import random
 from abc import ABC, abstractmethod
-from typing import Any, Callable
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo usan los métodos vectorizados
+    np = None
 
 class Generador(ABC):
     def __init__(
@@ -18,6 +23,48 @@ class Generador(ABC):
         self.hora_apertura = hora_apertura
         self.hora_cierre = hora_cierre
         self.current_datetime: dt.datetime = fecha_inicial
+        self._rng_numpy = None
+
+    def rng_numpy(self):
+        """Generador de NumPy con la misma semilla, creado al primer uso."""
+        if np is None:
+            raise ImportError("La generación vectorizada requiere NumPy (pip install numpy)")
+        if self._rng_numpy is None:
+            self._rng_numpy = np.random.default_rng(self.seed)
+        return self._rng_numpy
+
+    def generar_por_bloques(
+        self,
+        minutos: Optional[int],
+        constructor: Callable[[int, dt.datetime], Any],
+        minutos_por_bloque: int = 24 * 60,
+    ) -> Iterator[list[Any]]:
+        """
+        Genera las llegadas en bloques de `minutos_por_bloque` minutos.
+
+        Cada bloque se entrega en orden de tiempo y avanza current_datetime,
+        por lo que la memoria depende del tamaño del bloque y no del
+        horizonte. Con minutos=None el flujo no termina.
+        """
+        if minutos_por_bloque <= 0:
+            raise ValueError("minutos_por_bloque debe ser mayor a 0")
+
+        restantes = minutos
+        while restantes is None or restantes > 0:
+            bloque = minutos_por_bloque if restantes is None else min(minutos_por_bloque, restantes)
+            yield self.generar_clientes(bloque, constructor, update=True)
+            if restantes is not None:
+                restantes -= bloque
+
+    def iterar_clientes(
+        self,
+        minutos: Optional[int],
+        constructor: Callable[[int, dt.datetime], Any],
+        minutos_por_bloque: int = 24 * 60,
+    ) -> Iterator[Any]:
+        """Igual que generar_por_bloques, pero entrega los clientes de a uno."""
+        for bloque in self.generar_por_bloques(minutos, constructor, minutos_por_bloque):
+            yield from bloque
 
     def minutos_de_funcionamiento(self) -> int:
         horas = self.hora_cierre.hour - self.hora_apertura.hour
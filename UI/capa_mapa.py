@@ -0,0 +1,492 @@
+"""
+Capa de mapa en modo retenido para el canvas del simulador.
+Guarda los ids de los elementos dibujados por estación y por ruta y, al
+sincronizar, solo crea, elimina o mueve (coords) lo que cambió, en vez de
+borrar y redibujar todo el canvas en cada edición.
+
+Además, solo se materializan los elementos dentro del área visible (más un
+margen), consultando una rejilla espacial, y con poco zoom se ocultan las
+etiquetas y se fusionan las rutas cortas. Desplazar, redimensionar o hacer
+zoom programa un único refresco diferido.
+"""
+
+import math
+import tkinter as tk
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from models.clases import Estacion, Ruta
+from models.rejilla_espacial import RejillaEspacial, TAMANO_CELDA
+
+
+# Apariencia del mapa
+RADIO_ESTACION = 5
+DESPLAZAMIENTO_ETIQUETA = 15
+MARGEN_SCROLL = 50
+SCROLLREGION_VACIA = (0, 0, 500, 500)
+
+# Tags comunes a cada tipo de elemento
+TAG_RUTA = "ruta"
+TAG_ESTACION = "estacion"
+TAG_ETIQUETA = "etiqueta"
+TAG_TREN = "tren"
+
+# Lado (en píxeles) del cuadrado que representa a cada tren
+LADO_TREN = 8
+
+# Zoom y nivel de detalle
+ESCALA_MIN = 0.05
+ESCALA_MAX = 8.0
+FACTOR_ZOOM = 1.2
+ESCALA_MIN_ETIQUETAS = 0.75   # Bajo esta escala no se dibujan etiquetas
+ESCALA_FUSION_RUTAS = 0.5     # Bajo esta escala se fusionan las rutas cortas
+CELDA_FUSION_PX = 12          # Lado (en píxeles) de las celdas de fusión de rutas
+MARGEN_VISTA_PX = 100         # Margen alrededor del área visible que también se dibuja
+
+
+class CapaMapa:
+    """
+    Mantiene sincronizado el canvas con las estaciones y rutas.
+
+    Cada estación dibuja un óvalo y una etiqueta, y cada ruta una línea.
+    Todos llevan un tag común (TAG_RUTA, TAG_ESTACION, TAG_ETIQUETA) para
+    operar sobre grupos, y las rutas siempre quedan bajo las estaciones.
+    Las coordenadas del canvas son las del mapa multiplicadas por la escala.
+
+    Attributes:
+        canvas: Canvas donde se dibuja el mapa
+        escala: Factor de zoom actual
+    """
+
+    def __init__(self, canvas: tk.Canvas, tamano_celda: float = TAMANO_CELDA):
+        self.canvas = canvas
+        self.escala = 1.0
+
+        # Modelo: posiciones en coordenadas del mapa
+        self._posiciones: Dict[str, Tuple[float, float]] = {}
+        self._rutas: Dict[int, Tuple[str, str]] = {}
+        self._rutas_por_estacion: Dict[str, Set[int]] = {}
+        self._rejilla_estaciones = RejillaEspacial(tamano_celda)
+        self._rejilla_rutas = RejillaEspacial(tamano_celda)
+
+        # Elementos materializados en el canvas
+        # {nombre: (id_ovalo, id_etiqueta o None, x, y)}
+        self._items_estaciones: Dict[str, Tuple[int, Optional[int], float, float]] = {}
+        # {clave: (id_linea, coordenadas)}
+        self._items_rutas: Dict[object, Tuple[int, Tuple[float, ...]]] = {}
+
+        self._limites: Optional[Tuple[float, float, float, float]] = None
+        self._limites_sucios = False
+        self._scrollregion: Optional[Tuple[float, float, float, float]] = None
+        self._refresco_pendiente: Optional[str] = None
+
+        # Pasajeros esperando que se muestran junto al nombre de cada estación
+        self._conteos: Dict[str, int] = {}
+
+        # Trenes: posición en coordenadas del mapa e id del cuadrado dibujado
+        self._posiciones_trenes: Dict[str, Tuple[float, float]] = {}
+        self._items_trenes: Dict[str, int] = {}
+
+        # Cantidad de operaciones de canvas del último refresco
+        self.ultimos_cambios = 0
+
+    def conectar(self, barra_vertical: tk.Scrollbar, barra_horizontal: tk.Scrollbar):
+        """
+        Conecta las barras de desplazamiento y los eventos del canvas para
+        refrescar la vista al desplazar, redimensionar o hacer zoom
+        (Control + rueda del mouse).
+        """
+        barra_vertical.config(command=self._desplazar_y)
+        barra_horizontal.config(command=self._desplazar_x)
+        self.canvas.bind("<Configure>", lambda e: self.programar_refresco())
+        self.canvas.bind("<Control-MouseWheel>", self._zoom_rueda)
+        self.canvas.bind("<Control-Button-4>", lambda e: self.zoom(FACTOR_ZOOM, e.x, e.y))
+        self.canvas.bind("<Control-Button-5>", lambda e: self.zoom(1 / FACTOR_ZOOM, e.x, e.y))
+
+    # ========== SINCRONIZACIÓN DEL MODELO ==========
+
+    def sincronizar(self, estaciones: Dict[str, Estacion], rutas: Iterable[Ruta]) -> int:
+        """
+        Actualiza el modelo con las estaciones y rutas actuales y aplica al
+        canvas solo las diferencias visibles.
+
+        Args:
+            estaciones: Diccionario {nombre: Estacion} actual
+            rutas: Rutas actuales (las que apuntan a estaciones inexistentes
+                no se dibujan)
+
+        Returns:
+            Cantidad de elementos creados, eliminados o modificados
+        """
+        movidas = self._sincronizar_estaciones(estaciones)
+        self._sincronizar_rutas(estaciones, rutas, movidas)
+        return self.refrescar()
+
+    def _sincronizar_estaciones(self, estaciones: Dict[str, Estacion]) -> Set[str]:
+        """Registra altas, bajas y movimientos. Retorna los nombres que se movieron."""
+        movidas = set()
+
+        for nombre in [n for n in self._posiciones if n not in estaciones]:
+            x, y = self._posiciones.pop(nombre)
+            self._rejilla_estaciones.quitar(nombre)
+            self._descartar_limite(x, y)
+
+        for nombre, estacion in estaciones.items():
+            posicion = (estacion.coordenada_x, estacion.coordenada_y)
+            anterior = self._posiciones.get(nombre)
+            if anterior == posicion:
+                continue
+            if anterior is not None:
+                self._descartar_limite(*anterior)
+                movidas.add(nombre)
+            self._posiciones[nombre] = posicion
+            self._rejilla_estaciones.insertar(nombre, *posicion)
+            self._extender_limites(*posicion)
+
+        return movidas
+
+    def _sincronizar_rutas(self, estaciones: Dict[str, Estacion], rutas: Iterable[Ruta], movidas: Set[str]):
+        """Registra altas, bajas y rutas cuyos extremos cambiaron."""
+        vigentes = {
+            id(ruta): (ruta.origen, ruta.destino)
+            for ruta in rutas
+            if ruta.origen in estaciones and ruta.destino in estaciones
+        }
+
+        for clave in [c for c in self._rutas if vigentes.get(c) != self._rutas[c]]:
+            self._quitar_ruta(clave)
+
+        actualizar = {
+            clave
+            for nombre in movidas
+            for clave in self._rutas_por_estacion.get(nombre, ())
+        }
+        for clave, extremos in vigentes.items():
+            if clave not in self._rutas:
+                self._rutas[clave] = extremos
+                for nombre in extremos:
+                    self._rutas_por_estacion.setdefault(nombre, set()).add(clave)
+                actualizar.add(clave)
+
+        for clave in actualizar:
+            origen, destino = self._rutas[clave]
+            self._rejilla_rutas.insertar(clave, *self._posiciones[origen], *self._posiciones[destino])
+
+    def _quitar_ruta(self, clave: int):
+        for nombre in self._rutas.pop(clave):
+            claves = self._rutas_por_estacion.get(nombre)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._rutas_por_estacion[nombre]
+        self._rejilla_rutas.quitar(clave)
+
+    # ========== VISTA ==========
+
+    def _vista_mapa(self) -> Optional[Tuple[float, float, float, float]]:
+        """Rectángulo visible (más el margen) en coordenadas del mapa, None si aún no hay ventana."""
+        ancho, alto = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if ancho <= 1 or alto <= 1:
+            return None
+
+        x1 = self.canvas.canvasx(0) - MARGEN_VISTA_PX
+        y1 = self.canvas.canvasy(0) - MARGEN_VISTA_PX
+        x2 = self.canvas.canvasx(ancho) + MARGEN_VISTA_PX
+        y2 = self.canvas.canvasy(alto) + MARGEN_VISTA_PX
+        return x1 / self.escala, y1 / self.escala, x2 / self.escala, y2 / self.escala
+
+    def programar_refresco(self):
+        """Programa un refresco cuando Tk esté libre. Varias llamadas se combinan en una."""
+        if self._refresco_pendiente is None:
+            self._refresco_pendiente = self.canvas.after_idle(self._refresco_diferido)
+
+    def _refresco_diferido(self):
+        self._refresco_pendiente = None
+        self.refrescar()
+
+    def refrescar(self) -> int:
+        """
+        Materializa los elementos visibles y elimina los que salieron de la vista.
+
+        Returns:
+            Cantidad de elementos creados, eliminados o modificados
+        """
+        if self._refresco_pendiente is not None:
+            self.canvas.after_cancel(self._refresco_pendiente)
+            self._refresco_pendiente = None
+
+        self.ultimos_cambios = 0
+        self._actualizar_scrollregion()
+
+        vista = self._vista_mapa()
+        if vista is None:
+            estaciones_visibles = set(self._posiciones)
+            rutas_visibles = set(self._rutas)
+        else:
+            estaciones_visibles = self._rejilla_estaciones.en_rectangulo(*vista)
+            rutas_visibles = self._rejilla_rutas.en_rectangulo(*vista)
+
+        self._aplicar_rutas(self._rutas_deseadas(rutas_visibles))
+        self._aplicar_estaciones(estaciones_visibles)
+        if self.ultimos_cambios and self._items_trenes:
+            self.canvas.tag_raise(TAG_TREN)
+        self._aplicar_trenes()
+        return self.ultimos_cambios
+
+    def _rutas_deseadas(self, claves: Set[int]) -> Dict[object, Tuple[float, ...]]:
+        """Coordenadas de canvas de cada línea a dibujar según el nivel de detalle."""
+        escala = self.escala
+        deseadas = {}
+
+        if escala >= ESCALA_FUSION_RUTAS:
+            for clave in claves:
+                origen, destino = self._rutas[clave]
+                (x1, y1), (x2, y2) = self._posiciones[origen], self._posiciones[destino]
+                deseadas[clave] = (x1 * escala, y1 * escala, x2 * escala, y2 * escala)
+            return deseadas
+
+        # Con poco zoom, las rutas entre las mismas celdas de pantalla se dibujan como
+        # una sola línea entre los centros de celda y las que no salen de su celda se omiten
+        def celda(x: float, y: float) -> Tuple[int, int]:
+            return math.floor(x * escala / CELDA_FUSION_PX), math.floor(y * escala / CELDA_FUSION_PX)
+
+        for clave in claves:
+            origen, destino = self._rutas[clave]
+            celda_a, celda_b = celda(*self._posiciones[origen]), celda(*self._posiciones[destino])
+            if celda_a == celda_b:
+                continue
+            celda_a, celda_b = min(celda_a, celda_b), max(celda_a, celda_b)
+            deseadas[("fusion", celda_a, celda_b)] = tuple(
+                (c + 0.5) * CELDA_FUSION_PX for c in (*celda_a, *celda_b)
+            )
+        return deseadas
+
+    def _aplicar_rutas(self, deseadas: Dict[object, Tuple[float, ...]]):
+        """Aplica al canvas las diferencias entre las líneas dibujadas y las deseadas."""
+        for clave in [c for c in self._items_rutas if c not in deseadas]:
+            self.canvas.delete(self._items_rutas.pop(clave)[0])
+            self.ultimos_cambios += 1
+
+        for clave, coordenadas in deseadas.items():
+            dibujada = self._items_rutas.get(clave)
+            if dibujada is None:
+                linea = self.canvas.create_line(
+                    *coordenadas, dash=(4, 2), width=2, fill="gray", tags=(TAG_RUTA,)
+                )
+                # Las rutas van bajo las estaciones para no tapar los óvalos
+                self.canvas.tag_lower(linea)
+                self._items_rutas[clave] = (linea, coordenadas)
+            elif dibujada[1] != coordenadas:
+                self.canvas.coords(dibujada[0], *coordenadas)
+                self._items_rutas[clave] = (dibujada[0], coordenadas)
+            else:
+                continue
+            self.ultimos_cambios += 1
+
+    def _aplicar_estaciones(self, visibles: Set[str]):
+        """Aplica al canvas las diferencias entre las estaciones dibujadas y las visibles."""
+        con_etiquetas = self.escala >= ESCALA_MIN_ETIQUETAS
+
+        for nombre in [n for n in self._items_estaciones if n not in visibles]:
+            ovalo, etiqueta, _, _ = self._items_estaciones.pop(nombre)
+            self.canvas.delete(ovalo)
+            if etiqueta is not None:
+                self.canvas.delete(etiqueta)
+            self.ultimos_cambios += 1
+
+        for nombre in visibles:
+            x, y = self._posiciones[nombre]
+            x, y = x * self.escala, y * self.escala
+            dibujada = self._items_estaciones.get(nombre)
+
+            if dibujada is None:
+                ovalo = self.canvas.create_oval(
+                    x - RADIO_ESTACION, y - RADIO_ESTACION,
+                    x + RADIO_ESTACION, y + RADIO_ESTACION,
+                    fill="blue", outline="black", tags=(TAG_ESTACION,)
+                )
+                etiqueta = self._crear_etiqueta(nombre, x, y) if con_etiquetas else None
+                self._items_estaciones[nombre] = (ovalo, etiqueta, x, y)
+                self.ultimos_cambios += 1
+                continue
+
+            ovalo, etiqueta, x_anterior, y_anterior = dibujada
+            cambio = False
+            if (x_anterior, y_anterior) != (x, y):
+                self.canvas.coords(
+                    ovalo,
+                    x - RADIO_ESTACION, y - RADIO_ESTACION,
+                    x + RADIO_ESTACION, y + RADIO_ESTACION
+                )
+                if etiqueta is not None:
+                    self.canvas.coords(etiqueta, x, y - DESPLAZAMIENTO_ETIQUETA)
+                cambio = True
+
+            if con_etiquetas and etiqueta is None:
+                etiqueta = self._crear_etiqueta(nombre, x, y)
+                cambio = True
+            elif not con_etiquetas and etiqueta is not None:
+                self.canvas.delete(etiqueta)
+                etiqueta = None
+                cambio = True
+
+            if cambio:
+                self._items_estaciones[nombre] = (ovalo, etiqueta, x, y)
+                self.ultimos_cambios += 1
+
+    def _texto_etiqueta(self, nombre: str) -> str:
+        conteo = self._conteos.get(nombre)
+        return nombre if conteo is None else f"{nombre} ({conteo})"
+
+    def _crear_etiqueta(self, nombre: str, x: float, y: float) -> int:
+        return self.canvas.create_text(
+            x, y - DESPLAZAMIENTO_ETIQUETA,
+            text=self._texto_etiqueta(nombre), anchor=tk.S, fill="black", tags=(TAG_ETIQUETA,)
+        )
+
+    def mostrar_conteos(self, conteos: Dict[str, int]):
+        """
+        Actualiza la cantidad mostrada junto al nombre de algunas estaciones.
+        Solo se reescriben las etiquetas materializadas; las demás toman el
+        valor al entrar en la vista.
+        """
+        self._conteos.update(conteos)
+        for nombre in conteos:
+            dibujada = self._items_estaciones.get(nombre)
+            if dibujada is not None and dibujada[1] is not None:
+                self.canvas.itemconfig(dibujada[1], text=self._texto_etiqueta(nombre))
+
+    def limpiar_conteos(self):
+        """Vuelve a mostrar solo los nombres de las estaciones."""
+        nombres = list(self._conteos)
+        self._conteos.clear()
+        for nombre in nombres:
+            dibujada = self._items_estaciones.get(nombre)
+            if dibujada is not None and dibujada[1] is not None:
+                self.canvas.itemconfig(dibujada[1], text=nombre)
+
+    # ========== TRENES ==========
+
+    def mostrar_trenes(self, posiciones: Dict[str, Tuple[float, float]]):
+        """
+        Mueve los trenes a sus nuevas posiciones (en coordenadas del mapa).
+        Los cuadrados existentes se desplazan con coords; solo se crean o
+        eliminan los de trenes que aparecen o desaparecen.
+        """
+        for nombre in [n for n in self._items_trenes if n not in posiciones]:
+            self.canvas.delete(self._items_trenes.pop(nombre))
+        self._posiciones_trenes = dict(posiciones)
+        self._aplicar_trenes()
+
+    def quitar_trenes(self):
+        """Borra todos los trenes del mapa."""
+        self.mostrar_trenes({})
+
+    def _aplicar_trenes(self):
+        medio = LADO_TREN / 2
+        for nombre, (x, y) in self._posiciones_trenes.items():
+            x, y = x * self.escala, y * self.escala
+            item = self._items_trenes.get(nombre)
+            if item is None:
+                self._items_trenes[nombre] = self.canvas.create_rectangle(
+                    x - medio, y - medio, x + medio, y + medio,
+                    fill="red", outline="black", tags=(TAG_TREN,)
+                )
+            else:
+                self.canvas.coords(item, x - medio, y - medio, x + medio, y + medio)
+
+    def limpiar(self):
+        """Borra todos los elementos del mapa y el modelo."""
+        for tag in (TAG_RUTA, TAG_ESTACION, TAG_ETIQUETA, TAG_TREN):
+            self.canvas.delete(tag)
+        self._items_trenes.clear()
+        self._posiciones_trenes.clear()
+        self._items_estaciones.clear()
+        self._items_rutas.clear()
+        self._posiciones.clear()
+        self._rutas.clear()
+        self._rutas_por_estacion.clear()
+        self._rejilla_estaciones.limpiar()
+        self._rejilla_rutas.limpiar()
+        self._limites = None
+        self._limites_sucios = False
+
+    # ========== DESPLAZAMIENTO Y ZOOM ==========
+
+    def _desplazar_x(self, *args):
+        self.canvas.xview(*args)
+        self.programar_refresco()
+
+    def _desplazar_y(self, *args):
+        self.canvas.yview(*args)
+        self.programar_refresco()
+
+    def _zoom_rueda(self, evento):
+        factor = FACTOR_ZOOM if evento.delta > 0 else 1 / FACTOR_ZOOM
+        self.zoom(factor, evento.x, evento.y)
+
+    def zoom(self, factor: float, x_pantalla: Optional[int] = None, y_pantalla: Optional[int] = None):
+        """
+        Multiplica la escala por un factor, manteniendo fijo el punto del
+        mapa bajo (x_pantalla, y_pantalla) si se indica.
+        """
+        nueva = min(ESCALA_MAX, max(ESCALA_MIN, self.escala * factor))
+        if nueva == self.escala:
+            return
+
+        punto = None
+        if x_pantalla is not None and y_pantalla is not None:
+            punto = (
+                self.canvas.canvasx(x_pantalla) / self.escala,
+                self.canvas.canvasy(y_pantalla) / self.escala
+            )
+
+        self.escala = nueva
+        self._actualizar_scrollregion()
+
+        if punto is not None:
+            x1, y1, x2, y2 = self._scrollregion
+            self.canvas.xview_moveto(max(0.0, (punto[0] * nueva - x_pantalla - x1) / (x2 - x1)))
+            self.canvas.yview_moveto(max(0.0, (punto[1] * nueva - y_pantalla - y1) / (y2 - y1)))
+
+        self.programar_refresco()
+
+    # ========== SCROLLREGION ==========
+
+    def _extender_limites(self, x: float, y: float):
+        """Amplía los límites con un punto nuevo en O(1)."""
+        if self._limites_sucios:
+            return
+        if self._limites is None:
+            self._limites = (x, y, x, y)
+            return
+        min_x, min_y, max_x, max_y = self._limites
+        self._limites = (min(min_x, x), min(min_y, y), max(max_x, x), max(max_y, y))
+
+    def _descartar_limite(self, x: float, y: float):
+        """Solo si el punto quitado estaba en el borde hay que recalcular."""
+        if self._limites is None or self._limites_sucios:
+            return
+        min_x, min_y, max_x, max_y = self._limites
+        if x in (min_x, max_x) or y in (min_y, max_y):
+            self._limites_sucios = True
+
+    def _actualizar_scrollregion(self):
+        """Actualiza la scrollregion del canvas solo si cambió."""
+        if self._limites_sucios:
+            self._limites_sucios = False
+            self._limites = None
+            for x, y in self._posiciones.values():
+                self._extender_limites(x, y)
+
+        if self._limites is None:
+            region = SCROLLREGION_VACIA
+        else:
+            min_x, min_y, max_x, max_y = (valor * self.escala for valor in self._limites)
+            region = (
+                min_x - MARGEN_SCROLL, min_y - MARGEN_SCROLL,
+                max_x + MARGEN_SCROLL, max_y + MARGEN_SCROLL
+            )
+
+        if region != self._scrollregion:
+            self._scrollregion = region
+            self.canvas.config(scrollregion=region)
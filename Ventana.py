@@ -3,8 +3,24 @@ from tkinter import ttk, messagebox
 import datetime as dt
 from typing import Dict, List, Optional
 
-from logic.Guardado import guardar_datos, cargar_datos
-from models.clases import Tren, Estacion, Ruta, Pasajero
+from logic.Guardado import serializar_trenes, serializar_estaciones, serializar_rutas
+from models.clases import Tren, Estacion, Ruta
+from models.registro_rutas import RegistroRutas
+from models.indice_estaciones import IndiceEstaciones
+from logic.enrutamiento import notificar_cambio_red
+from logic.matrices_viaje import obtener_matrices
+from logic.bitacora_guardado import BitacoraGuardado
+from logic.simulacion_sin_interfaz import SimulacionSinInterfaz
+from logic.hilo_simulacion import HiloSimulacion, FPS_MAXIMO
+from logic.movimiento_trenes import MovimientoTrenes
+from UI.capa_mapa import CapaMapa
+
+
+# Distancia máxima (en píxeles) entre el click y una estación para seleccionarla
+RADIO_SELECCION = 10
+
+# Segundos simulados por segundo real durante la animación de los trenes
+SEGUNDOS_SIMULADOS_POR_SEGUNDO = 1800
 
 
 class SimuladorTrenes:
@@ -17,15 +33,24 @@ class SimuladorTrenes:
         # Estructuras de datos principales
         self.trenes: Dict[str, Tren] = {}
         self.estaciones: Dict[str, Estacion] = {}
-        self.rutas: List[Ruta] = []
+        self.rutas: RegistroRutas = RegistroRutas()
+        self.indice_estaciones = IndiceEstaciones()
+        self.hilo_simulacion: Optional[HiloSimulacion] = None
+        self.movimiento_trenes: Optional[MovimientoTrenes] = None
+        # Pasajeros a bordo de cada tren según el último delta de la simulación
+        self.a_bordo_simulacion: Dict[str, int] = {}
+        self.bitacora = BitacoraGuardado()
         
         # Referencias a widgets
         self.trenes_listbox: Optional[tk.Listbox] = None
         self.map_canvas: Optional[tk.Canvas] = None
+        self.capa_mapa: Optional[CapaMapa] = None
         self.main_content_frame: Optional[ttk.Frame] = None
         self.paneles: Dict[str, ttk.Frame] = {}
+        self.estado_simulacion_var = tk.StringVar(master, value="Simulación detenida")
         
         self._inicializar_datos()
+        self.indice_estaciones.sincronizar(self.estaciones)
         self.crear_interfaz()
 
     def _configurar_ventana(self):
@@ -37,14 +62,15 @@ class SimuladorTrenes:
 
     def _inicializar_datos(self):
         """Carga datos guardados o inicializa con valores por defecto."""
-        data = cargar_datos()
+        data = self.bitacora.cargar()
         
         if not data["trenes"] and not data["estaciones"]:
             self._cargar_datos_default()
         else:
-            self.trenes = self._deserializar_trenes(data["trenes"])
-            self.estaciones = self._deserializar_estaciones(data["estaciones"])
-            self.rutas = self._deserializar_rutas(data["rutas"])
+            self.trenes = data["trenes"]
+            self.estaciones = data["estaciones"]
+            self.rutas = data["rutas"]
+            self.bitacora.marcar_guardado(self.trenes, self.estaciones, self.rutas, self.bitacora.id_cargado)
 
     def _cargar_datos_default(self):
         """Carga los datos por defecto del sistema."""
@@ -60,76 +86,12 @@ class SimuladorTrenes:
             "Chillán": Estacion("Chillán", 450, 400)
         }
         
-        self.rutas = [
+        self.rutas = RegistroRutas([
             Ruta("Estación Central", "Rancagua", 87),
             Ruta("Rancagua", "Talca", 200),
             Ruta("Talca", "Chillán", 180),
             Ruta("Estación Central", "Chillán", 254)
-        ]
-
-    # ========== MÉTODOS DE DESERIALIZACIÓN ==========
-    
-    def _deserializar_trenes(self, trenes_dict: dict) -> Dict[str, Tren]:
-        """Convierte diccionarios JSON a objetos Tren."""
-        return {
-            nombre: Tren(
-                nombre=nombre,
-                capacidad=specs['capacidad'],
-                combustible=specs['combustible'],
-                velocidad_max=specs['velocidad_max']
-            )
-            for nombre, specs in trenes_dict.items()
-        }
-
-    def _deserializar_pasajero(self, pasajero_dict: dict) -> Pasajero:
-        """Convierte un diccionario a objeto Pasajero."""
-        tiempo_llegada = dt.datetime.fromisoformat(pasajero_dict["tiempo_llegada"])
-        tiempo_partida = (
-            dt.datetime.fromisoformat(pasajero_dict["tiempo_partida"])
-            if pasajero_dict["tiempo_partida"] else None
-        )
-        
-        pasajero = Pasajero(
-            origen=pasajero_dict["origen"],
-            destino=pasajero_dict["destino"],
-            tiempo_llegada=tiempo_llegada
-        )
-        pasajero.id = pasajero_dict["id"]
-        pasajero.tiempo_partida = tiempo_partida
-        
-        # Actualizar contador estático si es necesario
-        if pasajero.id >= Pasajero.id_counter:
-            Pasajero.id_counter = pasajero.id + 1
-            
-        return pasajero
-
-    def _deserializar_estaciones(self, estaciones_dict: dict) -> Dict[str, Estacion]:
-        """Convierte diccionarios JSON a objetos Estacion con sus pasajeros."""
-        objetos_estacion = {}
-        
-        for nombre, specs in estaciones_dict.items():
-            estacion = Estacion(
-                nombre=nombre,
-                coordenada_x=specs['coord_x'],
-                coordenada_y=specs['coord_y']
-            )
-            
-            # Reconstruir pasajeros si existen
-            if specs.get("pasajeros_esperando"):
-                for p_dict in specs["pasajeros_esperando"]:
-                    pasajero = self._deserializar_pasajero(p_dict)
-                    estacion.agregar_pasajero(pasajero)
-            
-            objetos_estacion[nombre] = estacion
-            
-        return objetos_estacion
-    
-    def _deserializar_rutas(self, rutas_lista: list) -> List[Ruta]:
-        """Convierte lista de tuplas a objetos Ruta."""
-        return [
-            Ruta(origen=origen, destino=destino, distancia_km=distancia)
-            for origen, destino, distancia in rutas_lista
-        ]
+        ])
 
     # ========== INTERFAZ PRINCIPAL ==========
 
@@ -154,7 +116,8 @@ class SimuladorTrenes:
         # Lista de botones con sus comandos
         botones = [
             ("Iniciar simulación", self.iniciar_simulacion),
-            ("Ver Pasajeros a Bordo", self.mostrar_pasajeros_abordo)
+            ("Detener simulación", self.detener_simulacion),
+            ("Ver Pasajeros a Bordo", self.mostrar_pasajeros_abordo),
             ("Acceder a datos de trenes", lambda: self.show_panel("trenes")),
             ("Acceder a datos de estación", lambda: self.show_panel("estaciones")),
             ("Acceder a datos de ruta", lambda: self.show_panel("rutas")),
@@ -309,6 +272,11 @@ class SimuladorTrenes:
         map_container.grid_rowconfigure(0, weight=1)
         map_container.grid_columnconfigure(0, weight=1)
         
+        # Estado de la simulación en curso
+        ttk.Label(map_panel, textvariable=self.estado_simulacion_var).grid(
+            row=1, column=0, sticky="w", pady=(5, 0)
+        )
+        
         # Crear scrollbars
         v_scrollbar = ttk.Scrollbar(map_container, orient="vertical")
         h_scrollbar = ttk.Scrollbar(map_container, orient="horizontal")
@@ -321,9 +289,10 @@ class SimuladorTrenes:
             xscrollcommand=h_scrollbar.set
         )
         
-        # Configurar scrollbars
-        v_scrollbar.config(command=self.map_canvas.yview)
-        h_scrollbar.config(command=self.map_canvas.xview)
+        # Capa del mapa: maneja las scrollbars, el zoom y el refresco de la vista
+        self.capa_mapa = CapaMapa(self.map_canvas)
+        self.capa_mapa.conectar(v_scrollbar, h_scrollbar)
+        self.map_canvas.bind("<Button-1>", self._seleccionar_estacion_mapa)
         
         # Colocar elementos
         self.map_canvas.grid(row=0, column=0, sticky="nsew")
@@ -335,58 +304,29 @@ class SimuladorTrenes:
         return map_panel
 
     def dibujar_mapa(self):
-        """Dibuja las estaciones y rutas en el canvas."""
+        """
+        Sincroniza las estaciones y rutas con el canvas.
+        Solo se crean, eliminan o mueven los elementos que cambiaron.
+        """
         if not self.map_canvas:
             return
-            
-        self.map_canvas.delete("all")
-        
-        RADIO_ESTACION = 5
-        coordenadas = []
-        
-        # Dibujar rutas (líneas entre estaciones)
-        for ruta in self.rutas:
-            if ruta.origen in self.estaciones and ruta.destino in self.estaciones:
-                est_origen = self.estaciones[ruta.origen]
-                est_destino = self.estaciones[ruta.destino]
-                
-                self.map_canvas.create_line(
-                    est_origen.coordenada_x, est_origen.coordenada_y,
-                    est_destino.coordenada_x, est_destino.coordenada_y,
-                    dash=(4, 2), width=2, fill="gray"
-                )
         
-        # Dibujar estaciones
-        for nombre, estacion in self.estaciones.items():
-            x, y = estacion.coordenada_x, estacion.coordenada_y
-            
-            # Círculo de la estación
-            self.map_canvas.create_oval(
-                x - RADIO_ESTACION, y - RADIO_ESTACION,
-                x + RADIO_ESTACION, y + RADIO_ESTACION,
-                fill="blue", outline="black"
-            )
-            
-            # Etiqueta de la estación
-            self.map_canvas.create_text(
-                x, y - 15,
-                text=nombre,
-                anchor=tk.S,
-                fill="black"
-            )
-            
-            coordenadas.extend([x, y])
-        
-        # Configurar scrollregion
-        if coordenadas:
-            min_x = min(coordenadas[::2]) - 50
-            min_y = min(coordenadas[1::2]) - 50
-            max_x = max(coordenadas[::2]) + 50
-            max_y = max(coordenadas[1::2]) + 50
-        else:
-            min_x, min_y, max_x, max_y = 0, 0, 500, 500
+        if self.capa_mapa is None:
+            self.capa_mapa = CapaMapa(self.map_canvas)
+        
+        self.capa_mapa.sincronizar(self.estaciones, self.rutas)
+
+    def _seleccionar_estacion_mapa(self, event):
+        """Muestra la información de la estación clickeada en el mapa."""
+        escala = self.capa_mapa.escala
+        x = self.map_canvas.canvasx(event.x) / escala
+        y = self.map_canvas.canvasy(event.y) / escala
         
-        self.map_canvas.config(scrollregion=(min_x, min_y, max_x, max_y))
+        nombre = self.indice_estaciones.mas_cercana(x, y, RADIO_SELECCION / escala)
+        if nombre is None or nombre not in self.estaciones:
+            return
+        
+        messagebox.showinfo("Estación", str(self.estaciones[nombre]))
 
     # ========== ACCIONES DEL MENÚ ==========
 
@@ -399,55 +339,94 @@ class SimuladorTrenes:
             )
             return
         
-        self.generar_pasajeros_estaciones()
-        self.actualizar_pasajeros()
-
-        mensaje = (
-            f"Simulación de Trenes Iniciada.\n\n"
-            f"Parámetros cargados:\n"
-            f"- Tipos de trenes: {len(self.trenes)}\n"
-            f"- Estaciones: {len(self.estaciones)}\n"
-            f"- Rutas definidas: {len(self.rutas)}\n\n"
-            f"El motor de simulación está calculando los trayectos..."
+        if self.hilo_simulacion is not None:
+            messagebox.showinfo("Simulación en Curso", "La simulación ya se está ejecutando.")
+            return
+        
+        # El hilo trabaja sobre una copia del estado: la interfaz solo recibe deltas
+        try:
+            simulacion = SimulacionSinInterfaz.desde_datos({
+                "trenes": serializar_trenes(self.trenes),
+                "estaciones": serializar_estaciones(self.estaciones),
+                "rutas": serializar_rutas(self.rutas)
+            })
+        except ValueError as e:
+            messagebox.showerror("Error de Simulación", str(e))
+            return
+        
+        # Un paso por cuadro para que los trenes avancen de forma continua
+        self.hilo_simulacion = HiloSimulacion(
+            simulacion,
+            paso_segundos=SEGUNDOS_SIMULADOS_POR_SEGUNDO / FPS_MAXIMO,
+            segundos_por_segundo=SEGUNDOS_SIMULADOS_POR_SEGUNDO
         )
-        messagebox.showinfo("Simulación en Curso", mensaje)
+        self.movimiento_trenes = MovimientoTrenes(self.estaciones)
+        self.a_bordo_simulacion = {}
+        self.hilo_simulacion.start()
+        self.estado_simulacion_var.set("Simulación iniciada...")
+        self.master.after(1000 // FPS_MAXIMO, self._drenar_simulacion)
+    
+    def detener_simulacion(self):
+        """Detiene la simulación en curso al terminar el paso actual."""
+        if self.hilo_simulacion is not None:
+            self.hilo_simulacion.detener()
     
-        # ========== GENERA PASAJEROS  ==========
-    def generar_pasajeros_estaciones(self):
-        """Genera pasajeros aleatorios en cada estación."""
-        import random
-        from models.clases import Pasajero
+    def _drenar_simulacion(self):
+        """
+        Aplica en la interfaz los cambios publicados por el hilo de simulación.
+        Se reprograma con after() como máximo FPS_MAXIMO veces por segundo y
+        combina todos los deltas acumulados desde la llamada anterior.
+        """
+        hilo = self.hilo_simulacion
+        if hilo is None:
+            return
+        
+        delta = hilo.obtener_delta()
+        if delta is not None:
+            metricas = delta["metricas"]
+            self.estado_simulacion_var.set(
+                f"{delta['fecha'].replace('T', ' ')} | "
+                f"Generados: {metricas['pasajeros_generados']} | "
+                f"Transportados: {metricas['pasajeros_transportados']} | "
+                f"Esperando: {metricas['pasajeros_esperando']} | "
+                f"A bordo: {metricas['pasajeros_a_bordo']}"
+            )
+            # Solo llegan los tramos que cambiaron; las posiciones se interpolan todas juntas
+            for nombre, (_, a_bordo, tramo) in delta["trenes"].items():
+                self.a_bordo_simulacion[nombre] = a_bordo
+                if tramo is not None:
+                    self.movimiento_trenes.establecer_tramo(nombre, *tramo)
+            
+            if self.capa_mapa is not None:
+                self.capa_mapa.mostrar_conteos(delta["estaciones"])
+                self.capa_mapa.mostrar_trenes(
+                    self.movimiento_trenes.posiciones(dt.datetime.fromisoformat(delta["fecha"]))
+                )
+            
+            if delta["terminada"]:
+                self.hilo_simulacion = None
+                self.movimiento_trenes = None
+                if self.capa_mapa is not None:
+                    self.capa_mapa.limpiar_conteos()
+                    self.capa_mapa.quitar_trenes()
+                if hilo.error is not None:
+                    messagebox.showerror("Error de Simulación", str(hilo.error))
+                self.estado_simulacion_var.set("Simulación terminada | " + self.estado_simulacion_var.get())
+                return
+        
+        self.master.after(1000 // FPS_MAXIMO, self._drenar_simulacion)
     
-        for estacion in self.estaciones.values():
-            num_pasajeros = random.randint(0, 3)  # máximo 3 pasajeros por estación por turno
-            for _ in range(num_pasajeros):
-                origen = estacion.nombre
-                destino = random.choice([e for e in self.estaciones.keys() if e != origen])
-                pasajero = Pasajero(origen, destino, dt.datetime.now())
-                estacion.agregar_pasajero(pasajero)
-
-    def actualizar_pasajeros(self):
-        """Hace que los pasajeros suban y bajen del tren."""
-        for tren in self.trenes.values():
-            # Bajar pasajeros en la estación actual
-            pasajeros_a_bajar = [p for p in getattr(tren, "pasajeros", []) if p.destino == getattr(tren, "ubicacion", None)]
-            for p in pasajeros_a_bajar:
-                tren.pasajeros.remove(p)
-                if tren.ubicacion in self.estaciones:
-                    self.estaciones[tren.ubicacion].agregar_pasajero(p)
-
-        # Subir pasajeros desde la estación actual
-            estacion = self.estaciones.get(getattr(tren, "ubicacion", None))
-            if estacion:
-                while estacion.pasajeros_esperando and len(getattr(tren, "pasajeros", [])) < tren.capacidad:
-                    pasajero = estacion.pasajeros_esperando.pop(0)
-                    tren.pasajeros.append(pasajero)
+    # ========== PASAJEROS ==========
 
     def mostrar_pasajeros_abordo(self):
-        """Muestra cuántos pasajeros hay en cada tren."""
+        """
+        Muestra cuántos pasajeros hay en cada tren.
+        La simulación corre sobre una copia del estado, así que los conteos
+        salen del último delta recibido; sin simulación se usan los trenes cargados.
+        """
         mensaje = ""
         for nombre, tren in self.trenes.items():
-            cantidad = len(getattr(tren, "pasajeros", []))
+            cantidad = self.a_bordo_simulacion.get(nombre, len(tren.pasajeros))
             mensaje += f"{nombre}: {cantidad} pasajeros a bordo\n"
         messagebox.showinfo("Pasajeros a Bordo", mensaje)
     
@@ -582,19 +561,28 @@ class SimuladorTrenes:
 
     def guardar_estado(self):
         """Guarda el estado actual del simulador."""
-        if guardar_datos(self.trenes, self.estaciones, self.rutas):
+        if self.bitacora.guardar(self.trenes, self.estaciones, self.rutas):
+            matrices = obtener_matrices(self)
+            if matrices is not None:
+                matrices.guardar()
             messagebox.showinfo("Guardado", "El estado ha sido guardado correctamente.")
         else:
             messagebox.showerror("Error", "No se pudo guardar el archivo de datos.")
 
     def cargar_estado(self):
         """Carga un estado previamente guardado."""
-        data = cargar_datos()
+        data = self.bitacora.cargar()
         
         if data["trenes"] or data["estaciones"]:
-            self.trenes = self._deserializar_trenes(data["trenes"])
-            self.estaciones = self._deserializar_estaciones(data["estaciones"])
-            self.rutas = self._deserializar_rutas(data["rutas"])
+            self.trenes = data["trenes"]
+            self.estaciones = data["estaciones"]
+            self.rutas = data["rutas"]
+            self.bitacora.marcar_guardado(self.trenes, self.estaciones, self.rutas, self.bitacora.id_cargado)
+            self.indice_estaciones.sincronizar(self.estaciones)
+            notificar_cambio_red(self)
+            matrices = obtener_matrices(self)
+            if matrices is not None:
+                matrices.cargar()
             
             self._actualizar_listado_trenes()
             self.dibujar_mapa()
@@ -0,0 +1,126 @@
+"""
+Benchmark del abordaje y desembarque de pasajeros en una parada.
+Compara el esquema anterior (lista a bordo con remove() en un ciclo y
+pop(0) sobre la lista de espera) contra PasajerosABordo y
+Estacion.despachar_por_destino, con miles de pasajeros por parada.
+
+Uso:
+    python -m benchmarks.abordaje --pasajeros 20000
+"""
+
+import argparse
+import datetime as dt
+import random
+import time
+from typing import Dict, List
+
+from models.clases import Estacion, Pasajero, PasajerosABordo
+
+
+FECHA = dt.datetime(2015, 3, 1, 7, 0)
+
+
+def _generar(cantidad: int, origen: str, destinos: List[str], rng: random.Random) -> List[Pasajero]:
+    """Pasajeros que llegan un segundo después del anterior."""
+    return [
+        Pasajero(origen, rng.choice(destinos), FECHA + dt.timedelta(seconds=i))
+        for i in range(cantidad)
+    ]
+
+
+def _parada_lista(a_bordo: List[Pasajero], esperando: List[Pasajero], ubicacion: str, capacidad: int) -> int:
+    """Esquema anterior: remove() por cada pasajero que baja y pop(0) por cada uno que sube."""
+    pasajeros_a_bajar = [p for p in a_bordo if p.destino == ubicacion]
+    for p in pasajeros_a_bajar:
+        a_bordo.remove(p)
+
+    while esperando and len(a_bordo) < capacidad:
+        pasajero = esperando.pop(0)
+        pasajero.registrar_partida(FECHA)
+        a_bordo.append(pasajero)
+    return len(pasajeros_a_bajar)
+
+
+def _parada_grupos(a_bordo: PasajerosABordo, estacion: Estacion, ubicacion: str, capacidad: int) -> int:
+    """Esquema nuevo: un grupo por destino y bloques desde las colas de la estación."""
+    bajan = len(a_bordo.bajar(ubicacion))
+    for destino, pasajeros in estacion.despachar_por_destino(capacidad - len(a_bordo), FECHA).items():
+        a_bordo.abordar(destino, pasajeros)
+    return bajan
+
+
+def ejecutar_benchmark(
+    pasajeros: int = 20_000,
+    destinos: int = 8,
+    repeticiones: int = 3,
+    semilla: int = 0
+) -> Dict[str, float]:
+    """
+    Ejecuta el benchmark sobre una parada en la estación "E0".
+
+    Antes de cada medición el tren lleva `pasajeros` a bordo (parte de
+    ellos con destino E0) y en la estación esperan otros `pasajeros`. La
+    capacidad del tren alcanza para subir a la mitad de los que esperan.
+
+    Args:
+        pasajeros: Pasajeros a bordo y pasajeros esperando en la parada
+        destinos: Cantidad de destinos distintos
+        repeticiones: Mediciones de cada esquema (se toma la mejor)
+        semilla: Semilla de los destinos
+
+    Returns:
+        Diccionario con los tiempos por parada (en segundos) y la
+        verificación de que ambos esquemas suben y bajan a los mismos pasajeros
+    """
+    nombres = [f"E{i}" for i in range(destinos + 1)]
+    ubicacion = nombres[0]
+    mejor_lista = mejor_grupos = float("inf")
+    coinciden = True
+
+    for repeticion in range(repeticiones):
+        rng = random.Random(semilla + repeticion)
+        a_bordo = _generar(pasajeros, "X", nombres, rng)
+        esperando = _generar(pasajeros, ubicacion, nombres[1:], rng)
+        bajan_esperados = sum(p.destino == ubicacion for p in a_bordo)
+        capacidad = pasajeros - bajan_esperados + pasajeros // 2
+
+        lista = list(a_bordo)
+        inicio = time.perf_counter()
+        bajan_lista = _parada_lista(lista, list(esperando), ubicacion, capacidad)
+        mejor_lista = min(mejor_lista, time.perf_counter() - inicio)
+
+        grupos = PasajerosABordo(a_bordo)
+        estacion = Estacion(ubicacion, 0, 0)
+        estacion.agregar_pasajeros(esperando)
+        inicio = time.perf_counter()
+        bajan_grupos = _parada_grupos(grupos, estacion, ubicacion, capacidad)
+        mejor_grupos = min(mejor_grupos, time.perf_counter() - inicio)
+
+        coinciden = coinciden and (
+            bajan_lista == bajan_grupos == bajan_esperados and
+            sorted(p.id for p in lista) == sorted(p.id for p in grupos)
+        )
+
+    return {
+        "lista_s": mejor_lista,
+        "grupos_s": mejor_grupos,
+        "coinciden": coinciden
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del abordaje y desembarque en una parada.")
+    parser.add_argument("--pasajeros", type=int, default=20_000)
+    parser.add_argument("--destinos", type=int, default=8)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    r = ejecutar_benchmark(args.pasajeros, args.destinos, args.repeticiones)
+    print(f"Pasajeros a bordo y esperando: {args.pasajeros} | destinos: {args.destinos}")
+    print(f"  lista (remove + pop(0)):      {r['lista_s'] * 1e3:9.1f} ms por parada")
+    print(f"  grupos por destino (bloques): {r['grupos_s'] * 1e3:9.1f} ms por parada")
+    print(f"  mismos pasajeros a bordo: {'sí' if r['coinciden'] else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark de los códecs de compresión de los guardados.
+Genera un estado con muchos pasajeros en espera y, para cada códec (sin
+comprimir, gzip, bz2, lzma) con JSON indentado y compacto, mide el tamaño
+del archivo, el tiempo de escritura y el de lectura con cargar_datos.
+
+Uso:
+    python -m benchmarks.compresion --pasajeros 1000000
+"""
+
+import argparse
+import contextlib
+import datetime as dt
+import io
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from logic.compresion import CODECS
+from logic.Guardado import cargar_datos, escribir_guardado
+from models.clases import Estacion, Pasajero, a_segundos
+
+
+INICIO_DIA = dt.datetime(2015, 3, 1, 7, 0)
+SEGUNDOS_DIA = 46800   # de 07:00 a 20:00
+
+
+def generar_estado(pasajeros: int, estaciones: int = 8, semilla: int = 0) -> Dict[str, Estacion]:
+    """
+    Estaciones con `pasajeros` en espera repartidos al azar, llegando en
+    orden a lo largo del día.
+    """
+    rng = random.Random(semilla)
+    nombres = [f"Estacion {i}" for i in range(estaciones)]
+    resultado = {nombre: Estacion(nombre, 0, 0) for nombre in nombres}
+    base = a_segundos(INICIO_DIA)
+
+    por_estacion: Dict[str, List[Pasajero]] = {nombre: [] for nombre in nombres}
+    for i in range(pasajeros):
+        origen, destino = rng.sample(nombres, 2)
+        por_estacion[origen].append(Pasajero(origen, destino, base + i * SEGUNDOS_DIA // pasajeros))
+    for nombre, lista in por_estacion.items():
+        resultado[nombre].agregar_pasajeros(lista)
+    return resultado
+
+
+def medir(
+    directorio: str,
+    estaciones: Dict[str, Estacion],
+    compresion: Optional[str],
+    compacto: bool
+) -> Dict[str, float]:
+    """Escribe y lee un guardado con el códec indicado."""
+    nombre = "guardado.json" + (CODECS[compresion][1] if compresion else "")
+    ruta = os.path.join(directorio, nombre)
+
+    inicio = time.perf_counter()
+    escribir_guardado(ruta, {}, estaciones, [], compresion=compresion, compacto=compacto)
+    escritura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = cargar_datos(ruta, progreso=lambda leidos, total: None)
+    lectura = time.perf_counter() - inicio
+
+    leidos = sum(len(e.get("pasajeros_esperando", [])) for e in data["estaciones"].values())
+    tamano = os.path.getsize(ruta)
+    os.remove(ruta)
+    return {
+        "tamano_bytes": tamano,
+        "escritura_s": escritura,
+        "lectura_s": lectura,
+        "pasajeros_leidos": leidos
+    }
+
+
+def ejecutar_benchmark(
+    pasajeros: int = 1_000_000,
+    codecs: Optional[List[Optional[str]]] = None,
+    semilla: int = 0
+) -> List[Dict]:
+    """
+    Ejecuta el benchmark para cada códec, con JSON indentado y compacto.
+
+    Args:
+        pasajeros: Pasajeros en espera del estado generado
+        codecs: Códecs a medir (None en la lista es sin comprimir); por
+            defecto todos
+        semilla: Semilla del estado generado
+
+    Returns:
+        Lista de resultados con códec, modo, tamaño y tiempos
+    """
+    codecs = [None, *CODECS] if codecs is None else codecs
+    estaciones = generar_estado(pasajeros, semilla=semilla)
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for compresion in codecs:
+            for compacto in (False, True):
+                r = medir(directorio, estaciones, compresion, compacto)
+                r.update(codec=compresion or "ninguno", compacto=compacto)
+                resultados.append(r)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los códecs de compresión de los guardados.")
+    parser.add_argument("--pasajeros", type=int, default=1_000_000)
+    parser.add_argument(
+        "--codecs", nargs="+", choices=["ninguno", *CODECS],
+        help="Códecs a medir (por defecto todos)"
+    )
+    args = parser.parse_args()
+
+    codecs = None
+    if args.codecs:
+        codecs = [None if c == "ninguno" else c for c in args.codecs]
+
+    resultados = ejecutar_benchmark(args.pasajeros, codecs)
+    print(f"Pasajeros en espera: {args.pasajeros}")
+    print(f"  {'códec':<8} {'JSON':<10} {'tamaño':>10} {'escritura':>11} {'lectura':>11}")
+    for r in resultados:
+        print(
+            f"  {r['codec']:<8} {'compacto' if r['compacto'] else 'indentado':<10} "
+            f"{r['tamano_bytes'] / 2**20:8.1f} MB "
+            f"{r['escritura_s']:9.2f} s {r['lectura_s']:9.2f} s"
+            + ("" if r["pasajeros_leidos"] == args.pasajeros else "  (lectura incompleta)")
+        )
+
+
+if __name__ == '__main__':
+    main()
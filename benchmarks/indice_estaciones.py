@@ -0,0 +1,143 @@
+"""
+Benchmark del índice espacial de estaciones.
+Compara las consultas de IndiceEstaciones (estación más cercana, radio y
+rectángulo) contra recorrer todas las estaciones, y verifica que ambos
+métodos den el mismo resultado.
+
+Uso:
+    python -m benchmarks.indice_estaciones --cantidad 100000
+"""
+
+import argparse
+import math
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from models.clases import Estacion
+from models.indice_estaciones import IndiceEstaciones
+
+
+def _generar_estaciones(cantidad: int, lado: float, semilla: int) -> Dict[str, Estacion]:
+    """Estaciones con coordenadas uniformes en un cuadrado de lado dado."""
+    rng = random.Random(semilla)
+    return {
+        f"E{i}": Estacion(f"E{i}", rng.uniform(0, lado), rng.uniform(0, lado))
+        for i in range(cantidad)
+    }
+
+
+def _mas_cercana_lineal(estaciones: Dict[str, Estacion], x: float, y: float) -> Optional[str]:
+    return min(
+        estaciones,
+        key=lambda n: math.hypot(estaciones[n].coordenada_x - x, estaciones[n].coordenada_y - y),
+        default=None
+    )
+
+
+def _en_radio_lineal(estaciones: Dict[str, Estacion], x: float, y: float, radio: float) -> List[str]:
+    return [
+        n for n, e in estaciones.items()
+        if math.hypot(e.coordenada_x - x, e.coordenada_y - y) <= radio
+    ]
+
+
+def _cronometrar(funcion, consultas: List[Tuple[float, float]]) -> Tuple[float, list]:
+    inicio = time.perf_counter()
+    resultados = [funcion(x, y) for x, y in consultas]
+    return (time.perf_counter() - inicio) / len(consultas), resultados
+
+
+def ejecutar_benchmark(
+    cantidad: int = 100_000,
+    consultas: int = 1_000,
+    radio: float = 50.0,
+    semilla: int = 0
+) -> Dict[str, float]:
+    """
+    Ejecuta el benchmark.
+
+    Args:
+        cantidad: Cantidad de estaciones
+        consultas: Cantidad de puntos de consulta (la búsqueda lineal usa menos)
+        radio: Radio de las consultas por radio y rectángulo
+        semilla: Semilla de las coordenadas
+
+    Returns:
+        Diccionario con los tiempos (en segundos por consulta) y la
+        verificación contra la búsqueda lineal
+    """
+    # Densidad de unas 4 estaciones por celda de 100×100
+    lado = math.sqrt(cantidad / 4) * 100
+    estaciones = _generar_estaciones(cantidad, lado, semilla)
+
+    rng = random.Random(semilla + 1)
+    puntos = [(rng.uniform(0, lado), rng.uniform(0, lado)) for _ in range(consultas)]
+    puntos_lineal = puntos[:max(1, consultas // 20)]
+
+    inicio = time.perf_counter()
+    indice = IndiceEstaciones.desde_estaciones(estaciones)
+    construccion = time.perf_counter() - inicio
+
+    cercana_s, cercanas = _cronometrar(indice.mas_cercana, puntos)
+    radio_s, en_radio = _cronometrar(lambda x, y: indice.en_radio(x, y, radio), puntos)
+    rectangulo_s, _ = _cronometrar(
+        lambda x, y: indice.en_rectangulo(x - radio, y - radio, x + radio, y + radio), puntos
+    )
+
+    cercana_lineal_s, cercanas_lineal = _cronometrar(
+        lambda x, y: _mas_cercana_lineal(estaciones, x, y), puntos_lineal
+    )
+    radio_lineal_s, en_radio_lineal = _cronometrar(
+        lambda x, y: _en_radio_lineal(estaciones, x, y, radio), puntos_lineal
+    )
+
+    coinciden = (
+        cercanas[:len(puntos_lineal)] == cercanas_lineal and
+        all(sorted(a) == sorted(b) for a, b in zip(en_radio, en_radio_lineal))
+    )
+
+    # Sincronización: quitar y volver a añadir un 1% de las estaciones
+    muestra = list(estaciones.values())[::100]
+    inicio = time.perf_counter()
+    for estacion in muestra:
+        indice.quitar(estacion.nombre)
+        indice.agregar(estacion)
+    sincronizacion = (time.perf_counter() - inicio) / len(muestra)
+
+    return {
+        "construccion_s": construccion,
+        "mas_cercana_s": cercana_s,
+        "mas_cercana_lineal_s": cercana_lineal_s,
+        "en_radio_s": radio_s,
+        "en_radio_lineal_s": radio_lineal_s,
+        "en_rectangulo_s": rectangulo_s,
+        "quitar_agregar_s": sincronizacion,
+        "coinciden": coinciden
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del índice espacial de estaciones.")
+    parser.add_argument("--cantidad", type=int, default=100_000)
+    parser.add_argument("--consultas", type=int, default=1_000)
+    parser.add_argument("--radio", type=float, default=50.0)
+    args = parser.parse_args()
+
+    r = ejecutar_benchmark(args.cantidad, args.consultas, args.radio)
+    print(f"Estaciones: {args.cantidad} | construcción del índice: {r['construccion_s']:.3f} s")
+    print(
+        f"  más cercana   índice: {r['mas_cercana_s'] * 1e6:9.1f} µs | "
+        f"lineal: {r['mas_cercana_lineal_s'] * 1e6:11.1f} µs"
+    )
+    print(
+        f"  en radio      índice: {r['en_radio_s'] * 1e6:9.1f} µs | "
+        f"lineal: {r['en_radio_lineal_s'] * 1e6:11.1f} µs"
+    )
+    print(f"  en rectángulo índice: {r['en_rectangulo_s'] * 1e6:9.1f} µs")
+    print(f"  quitar + agregar:     {r['quitar_agregar_s'] * 1e6:9.1f} µs")
+    print(f"  resultados iguales a la búsqueda lineal: {'sí' if r['coinciden'] else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
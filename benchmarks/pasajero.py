@@ -0,0 +1,125 @@
+"""
+Benchmark de memoria y velocidad de construcción de Pasajero.
+Compara la clase actual (con __slots__ y tiempos enteros) contra la
+versión anterior basada en __dict__ y datetime.
+
+Uso:
+    python -m benchmarks.pasajero --cantidad 200000
+"""
+
+import argparse
+import datetime as dt
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict, Optional
+
+from models.clases import Pasajero, a_segundos
+
+
+class PasajeroDiccionario:
+    """Versión anterior de Pasajero: atributos en __dict__ y tiempos datetime."""
+
+    id_counter: int = 1000
+
+    def __init__(self, origen: str, destino: str, tiempo_llegada: dt.datetime):
+        Pasajero._validar_parametros(origen, destino)
+
+        self.id = PasajeroDiccionario.id_counter
+        PasajeroDiccionario.id_counter += 1
+
+        self.origen = origen
+        self.destino = destino
+        self.tiempo_llegada = tiempo_llegada
+        self.tiempo_partida: Optional[dt.datetime] = None
+
+    def registrar_partida(self, tiempo: Optional[dt.datetime] = None):
+        self.tiempo_partida = tiempo or dt.datetime.now()
+
+    def tiempo_espera(self) -> dt.timedelta:
+        if self.tiempo_partida:
+            return self.tiempo_partida - self.tiempo_llegada
+        return dt.timedelta(seconds=0)
+
+    def tiempo_espera_minutos(self) -> float:
+        return self.tiempo_espera().total_seconds() / 60
+
+
+def _construir(clase: Callable, cantidad: int, en_segundos: bool = False) -> list:
+    """Construye pasajeros con una llegada distinta cada uno, como en la simulación."""
+    inicio_dia = dt.datetime(2015, 3, 1, 7, 0)
+    if en_segundos:
+        base = a_segundos(inicio_dia)
+        return [clase("Rancagua", "Talca", base + i % 46800) for i in range(cantidad)]
+    return [
+        clase("Rancagua", "Talca", inicio_dia + dt.timedelta(seconds=i % 46800))
+        for i in range(cantidad)
+    ]
+
+
+def _medir(clase: Callable, cantidad: int, en_segundos: bool = False) -> Dict[str, float]:
+    """Mide construcción, memoria retenida y cálculo de espera para una clase."""
+    # Tiempo y memoria se miden por separado: tracemalloc distorsiona los tiempos
+    gc.collect()
+    inicio = time.perf_counter()
+    pasajeros = _construir(clase, cantidad, en_segundos)
+    construccion = time.perf_counter() - inicio
+    del pasajeros
+
+    gc.collect()
+    tracemalloc.start()
+    pasajeros = _construir(clase, cantidad, en_segundos)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    partida = dt.datetime(2015, 3, 1, 20, 0)
+    for pasajero in pasajeros:
+        pasajero.registrar_partida(partida)
+
+    inicio = time.perf_counter()
+    total = sum(p.tiempo_espera_minutos() for p in pasajeros)
+    espera = time.perf_counter() - inicio
+
+    del pasajeros
+    return {
+        "construccion_s": construccion,
+        "bytes_por_pasajero": memoria / cantidad,
+        "espera_s": espera,
+        "espera_total_min": total
+    }
+
+
+def ejecutar_benchmark(cantidad: int = 200_000) -> Dict[str, Dict[str, float]]:
+    """
+    Ejecuta el benchmark para ambas clases.
+
+    Args:
+        cantidad: Cantidad de pasajeros a construir por clase
+
+    Returns:
+        Diccionario {nombre_clase: métricas}
+    """
+    return {
+        "PasajeroDiccionario": _medir(PasajeroDiccionario, cantidad),
+        "Pasajero": _medir(Pasajero, cantidad),
+        "Pasajero (segundos)": _medir(Pasajero, cantidad, en_segundos=True)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la clase Pasajero.")
+    parser.add_argument("--cantidad", type=int, default=200_000)
+    args = parser.parse_args()
+
+    resultados = ejecutar_benchmark(args.cantidad)
+    print(f"Pasajeros por clase: {args.cantidad}")
+    for nombre, metricas in resultados.items():
+        print(
+            f"  {nombre:<20} construcción: {metricas['construccion_s']:.3f} s | "
+            f"memoria: {metricas['bytes_por_pasajero']:.0f} B/pax | "
+            f"espera: {metricas['espera_s']:.3f} s"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -11,11 +11,13 @@ if TYPE_CHECKING:
     from Ventana import SimuladorTrenes
 
 from models.clases import Estacion
+from logic.enrutamiento import notificar_cambio_red
 
 
 # Constantes de configuración
 COORD_MIN = 0
 COORD_MAX = 500
+DISTANCIA_MIN_ESTACIONES = 10
 
 
 def gestionar_estaciones(simulador: 'SimuladorTrenes'):
@@ -162,10 +164,22 @@ def añadir_estacion(
         )
         return
     
+    # Validar que no se superponga con otra estación en el mapa
+    cercana = simulador.indice_estaciones.mas_cercana(x, y, DISTANCIA_MIN_ESTACIONES)
+    if cercana is not None:
+        messagebox.showerror(
+            "Error",
+            f"La estación '{cercana}' está a menos de {DISTANCIA_MIN_ESTACIONES} "
+            f"unidades de ({x}, {y})."
+        )
+        return
+    
     # Crear y añadir la estación
     try:
         nueva_estacion = Estacion(nombre, x, y)
         simulador.estaciones[nombre] = nueva_estacion
+        simulador.indice_estaciones.agregar(nueva_estacion)
+        notificar_cambio_red(simulador)
         
         # Actualizar interfaz
         simulador.dibujar_mapa()
@@ -212,14 +226,11 @@ def quitar_estacion(simulador: 'SimuladorTrenes', station_listbox: tk.Listbox):
     try:
         # Eliminar la estación
         del simulador.estaciones[nombre_estacion]
+        simulador.indice_estaciones.quitar(nombre_estacion)
         
-        # Eliminar todas las rutas que incluyan esta estación
-        rutas_originales = len(simulador.rutas)
-        simulador.rutas = [
-            ruta for ruta in simulador.rutas
-            if ruta.origen != nombre_estacion and ruta.destino != nombre_estacion
-        ]
-        rutas_eliminadas = rutas_originales - len(simulador.rutas)
+        # Eliminar todas las rutas que incluyan esta estación (O(grado))
+        rutas_eliminadas = simulador.rutas.quitar_estacion(nombre_estacion)
+        notificar_cambio_red(simulador)
         
         # Actualizar interfaz
         actualizar_estaciones(simulador, station_listbox)
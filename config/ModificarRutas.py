@@ -11,6 +11,7 @@ if TYPE_CHECKING:
     from Ventana import SimuladorTrenes
 
 from models.clases import Ruta
+from logic.enrutamiento import notificar_cambio_red
 
 
 # Constantes de configuración
@@ -219,6 +220,7 @@ def añadir_ruta(
             distancia_km=distancia
         )
         simulador.rutas.append(nueva_ruta)
+        notificar_cambio_red(simulador)
         
         # Actualizar interfaz
         actualizar_rutas(simulador, ruta_listbox)
@@ -282,25 +284,12 @@ def quitar_ruta(simulador: 'SimuladorTrenes', ruta_listbox: tk.Listbox):
         return
     
     try:
-        # Buscar y eliminar la ruta
-        ruta_eliminada = False
+        # Buscar y eliminar la ruta (en cualquier dirección) usando el índice por par
+        ruta_eliminada = simulador.rutas.quitar(origen, destino, distancia)
         
-        for i, ruta in enumerate(simulador.rutas):
-            if (ruta.origen == origen and 
-                ruta.destino == destino and 
-                ruta.distancia_km == distancia):
-                del simulador.rutas[i]
-                ruta_eliminada = True
-                break
-            # Verificar también en dirección inversa
-            elif (ruta.origen == destino and 
-                  ruta.destino == origen and 
-                  ruta.distancia_km == distancia):
-                del simulador.rutas[i]
-                ruta_eliminada = True
-                break
-        
-        if ruta_eliminada:
+        if ruta_eliminada is not None:
+            notificar_cambio_red(simulador)
+            
             # Actualizar interfaz
             actualizar_rutas(simulador, ruta_listbox)
             simulador.dibujar_mapa()
@@ -352,16 +341,4 @@ def _ruta_existe(
     Returns:
         True si la ruta existe, False en caso contrario
     """
-    for ruta in simulador.rutas:
-        # Verificar ruta directa
-        if (ruta.origen == origen and 
-            ruta.destino == destino and 
-            ruta.distancia_km == distancia):
-            return True
-        # Verificar ruta inversa
-        if (ruta.origen == destino and 
-            ruta.destino == origen and 
-            ruta.distancia_km == distancia):
-            return True
-    
-    return False
\ No newline at end of file
+    return simulador.rutas.existe(origen, destino, distancia)
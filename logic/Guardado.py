@@ -1,21 +1,79 @@
 """
 Sistema de guardado y carga de datos del simulador de trenes.
 Maneja la serialización/deserialización de objetos a formato JSON.
+
+Los archivos con extensión BINARY_EXTENSION usan un formato binario para
+estados con muchos pasajeros: un encabezado JSON con trenes, estaciones y
+rutas, seguido de los pasajeros en espera como columnas de enteros que se
+leen de una sola vez.
+
+Ambos formatos empiezan con un resumen ("info": versión, fecha y
+cantidades) que se lee sin recorrer el resto del archivo, y el catálogo
+CATALOG_FILENAME en SAVE_DIR guarda el resumen de todos los guardados.
+
+Las escrituras son atómicas (archivo temporal, fsync y os.replace) y el
+guardado principal conserva NUM_BACKUPS generaciones anteriores, rotadas
+con enlaces y renombres en vez de copias.
+
+Los guardados JSON y binarios pueden comprimirse con gzip, bz2 o lzma
+(ver logic.compresion); al cargar, el códec se detecta por los primeros
+bytes del archivo.
 """
 
+import io
 import json
 import os
+import struct
+import sys
 import datetime as dt
-from typing import Dict, List, Any, Optional
+from array import array
+from typing import IO, Callable, Dict, List, Any, Optional
 from pathlib import Path
 
+from models.clases import Tren, Estacion, Ruta, Pasajero, a_segundos
+from models.registro_rutas import RegistroRutas
+from logic.lector_json import LectorJSON, leer_guardado, Progreso, TAMANO_LOTE
+from logic.compresion import (
+    CODECS, ERRORES_DESCOMPRESION, abrir_lectura, compresion_de_nombre,
+    envolver_escritura, quitar_extension_compresion, validar_compresion
+)
+
 
 # Constantes de configuración
 SAVE_DIR = "save_data"
 DATA_FILENAME = "simulador_datos.json"
 BACKUP_FILENAME = "simulador_datos_backup.json"
+CATALOG_FILENAME = "catalogo.idx"
 DATA_FILE_PATH = os.path.join(SAVE_DIR, DATA_FILENAME)
 BACKUP_FILE_PATH = os.path.join(SAVE_DIR, BACKUP_FILENAME)
+CATALOG_FILE_PATH = os.path.join(SAVE_DIR, CATALOG_FILENAME)
+
+DATA_VERSION = "1.0"
+JSON_INDENT = 4   # sangría de los guardados JSON legibles (compacto=False)
+TAMANO_LECTURA_INFO = 4096   # bytes por lectura al buscar el resumen de un archivo
+
+NUM_BACKUPS = 3   # generaciones anteriores del guardado principal
+EXTENSION_TEMPORAL = ".tmp"
+
+UMBRAL_PROGRESO = 16 * 1024 * 1024   # archivos desde este tamaño informan el avance de la carga
+
+# Formato binario
+BINARY_EXTENSION = ".bin"
+BINARY_MAGIC = b"TRENBIN1"
+BINARY_VERSION = "1.0"
+SIN_PARTIDA = -(2 ** 63)   # valor de la columna de partida cuando el pasajero no ha partido
+
+# Columnas de pasajeros: (nombre, código de tipo de array). Solo códigos de
+# ancho fijo en todas las plataformas ('l' mide 8 bytes en Linux y 4 en Windows)
+COLUMNAS_PASAJEROS = (
+    ("id", "q"),
+    ("destino", "i"),
+    ("llegada", "q"),
+    ("partida", "q")
+)
+
+# Al leer, el tipo de cada columna se elige por el ancho guardado en el encabezado
+TIPOS_POR_TAMANO = {2: "h", 4: "i", 8: "q"}
 
 
 def _asegurar_directorio_guardado():
@@ -33,6 +91,82 @@ def _asegurar_directorio_guardado():
         return False
 
 
+def ruta_backup(generacion: int = 1) -> str:
+    """
+    Ruta de una generación de backup del guardado principal.
+    La generación 1 (la más reciente) es BACKUP_FILE_PATH.
+    """
+    if generacion == 1:
+        return BACKUP_FILE_PATH
+    base, extension = os.path.splitext(BACKUP_FILE_PATH)
+    return f"{base}.{generacion}{extension}"
+
+
+def _sincronizar_directorio(directorio: str):
+    """fsync del directorio para que el renombre sobreviva a un corte (solo POSIX)."""
+    if os.name != 'posix':
+        return
+    try:
+        fd = os.open(directorio or ".", os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _escribir_atomico(
+    ruta_archivo: str,
+    escribir: Callable[[IO], None],
+    binario: bool = False,
+    compresion: Optional[str] = None
+):
+    """
+    Escribe un archivo completo o no lo modifica.
+    El contenido va a un temporal en el mismo directorio, se sincroniza con
+    fsync y reemplaza al original con os.replace, que es atómico.
+    
+    Args:
+        ruta_archivo: Archivo de destino
+        escribir: Función que recibe el archivo temporal abierto y escribe el contenido
+        binario: True para entregar el temporal en modo binario (si no, texto UTF-8)
+        compresion: Códec de logic.compresion (None escribe sin comprimir)
+        
+    Raises:
+        IOError: Si falla la escritura (el archivo original queda intacto)
+    """
+    temporal = ruta_archivo + EXTENSION_TEMPORAL
+    try:
+        with open(temporal, 'wb') as f:
+            destino = envolver_escritura(f, compresion) if compresion else f
+            if binario:
+                escribir(destino)
+            else:
+                texto = io.TextIOWrapper(destino, encoding='utf-8')
+                escribir(texto)
+                texto.flush()
+                texto.detach()
+            if destino is not f:
+                # Cerrar el envoltorio escribe el final del flujo comprimido
+                destino.close()
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta_archivo)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    _sincronizar_directorio(os.path.dirname(ruta_archivo))
+
+
+def _escritor_json(data: Any, compacto: bool = False) -> Callable[[IO], None]:
+    """Función para _escribir_atomico que vuelca `data` con sangría o compacto."""
+    if compacto:
+        return lambda f: json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    return lambda f: json.dump(data, f, indent=JSON_INDENT, ensure_ascii=False)
+
+
 def serializar_trenes(trenes_objetos: Dict) -> Dict[str, Dict[str, Any]]:
     """
     Convierte un diccionario de objetos Tren a formato JSON-compatible.
@@ -151,32 +285,717 @@ def serializar_rutas(rutas_objetos: List) -> List[tuple]:
     return rutas_serializadas
 
 
-def _crear_backup(archivo_origen: str, archivo_backup: str) -> bool:
+def deserializar_trenes(trenes_dict: Dict[str, Dict[str, Any]]) -> Dict[str, Tren]:
+    """
+    Convierte los datos serializados de trenes a objetos Tren.
+    
+    Args:
+        trenes_dict: Diccionario {nombre: specs} leído del archivo
+        
+    Returns:
+        Diccionario {nombre: objeto_Tren}
+    """
+    return {
+        nombre: Tren(
+            nombre=nombre,
+            capacidad=specs['capacidad'],
+            combustible=specs['combustible'],
+            velocidad_max=specs['velocidad_max']
+        )
+        for nombre, specs in trenes_dict.items()
+    }
+
+
+def deserializar_pasajero(pasajero_dict: Dict[str, Any]) -> Pasajero:
+    """
+    Convierte un diccionario a objeto Pasajero.
+    
+    Args:
+        pasajero_dict: Datos del pasajero leídos del archivo
+        
+    Returns:
+        Objeto Pasajero con su ID original
+    """
+    tiempo_llegada = dt.datetime.fromisoformat(pasajero_dict["tiempo_llegada"])
+    tiempo_partida = (
+        dt.datetime.fromisoformat(pasajero_dict["tiempo_partida"])
+        if pasajero_dict["tiempo_partida"] else None
+    )
+    
+    pasajero = Pasajero(
+        origen=pasajero_dict["origen"],
+        destino=pasajero_dict["destino"],
+        tiempo_llegada=tiempo_llegada
+    )
+    pasajero.id = pasajero_dict["id"]
+    pasajero.tiempo_partida = tiempo_partida
+    
+    # Actualizar contador estático si es necesario
+    if pasajero.id >= Pasajero.id_counter:
+        Pasajero.id_counter = pasajero.id + 1
+        
+    return pasajero
+
+
+def deserializar_estaciones(estaciones_dict: Dict[str, Dict[str, Any]]) -> Dict[str, Estacion]:
+    """
+    Convierte los datos serializados de estaciones a objetos Estacion.
+    Reconstruye también los pasajeros en espera.
+    
+    Args:
+        estaciones_dict: Diccionario {nombre: specs} leído del archivo
+        
+    Returns:
+        Diccionario {nombre: objeto_Estacion}
+    """
+    objetos_estacion = {}
+    
+    for nombre, specs in estaciones_dict.items():
+        estacion = Estacion(
+            nombre=nombre,
+            coordenada_x=specs['coord_x'],
+            coordenada_y=specs['coord_y']
+        )
+        
+        # Reconstruir pasajeros si existen
+        if specs.get("pasajeros_esperando"):
+            for p_dict in specs["pasajeros_esperando"]:
+                estacion.agregar_pasajero(deserializar_pasajero(p_dict))
+        
+        # Formato binario: columnas de enteros en vez de diccionarios
+        if specs.get("pasajeros_columnas"):
+            estacion.agregar_pasajeros(_deserializar_columnas(nombre, specs["pasajeros_columnas"]))
+        
+        objetos_estacion[nombre] = estacion
+        
+    return objetos_estacion
+
+
+def deserializar_rutas(rutas_lista: List) -> RegistroRutas:
+    """
+    Convierte la lista de tuplas (origen, destino, distancia) a objetos Ruta.
+    
+    Args:
+        rutas_lista: Lista leída del archivo
+        
+    Returns:
+        RegistroRutas con los objetos Ruta
+    """
+    return RegistroRutas(
+        Ruta(origen=origen, destino=destino, distancia_km=distancia)
+        for origen, destino, distancia in rutas_lista
+    )
+
+
+# ========== FORMATO BINARIO ==========
+
+def es_archivo_binario(ruta_archivo: str) -> bool:
+    """Indica si la ruta corresponde al formato binario (según su extensión, comprimido o no)."""
+    return quitar_extension_compresion(ruta_archivo).endswith(BINARY_EXTENSION)
+
+
+def _tiempos_pasajero(pasajero) -> tuple:
+    """Llegada y partida en segundos desde EPOCA (partida SIN_PARTIDA si no ha partido)."""
+    if isinstance(pasajero, Pasajero):
+        llegada, partida = pasajero.segundos_llegada, pasajero.segundos_partida
+    else:
+        # Vistas de TablaPasajeros u otros objetos con la interfaz de Pasajero
+        llegada = a_segundos(pasajero.tiempo_llegada)
+        partida = pasajero.tiempo_partida and a_segundos(pasajero.tiempo_partida)
+    return llegada, SIN_PARTIDA if partida is None else partida
+
+
+def serializar_binario(
+    trenes: Dict,
+    estaciones: Dict,
+    rutas: List,
+    info: Optional[Dict[str, Any]] = None
+) -> bytes:
+    """
+    Convierte los objetos del simulador al formato binario.
+    
+    Estructura: BINARY_MAGIC, largo del encabezado (uint32 little endian),
+    encabezado JSON en UTF-8 y luego cada columna de COLUMNAS_PASAJEROS
+    como bytes crudos. Los pasajeros van agrupados por estación en el
+    orden del encabezado y, dentro de cada estación, en orden de llegada.
+    
+    Args:
+        trenes: Diccionario de objetos Tren
+        estaciones: Diccionario de objetos Estacion
+        rutas: Lista de objetos Ruta
+        info: Resumen para el encabezado (None lo calcula)
+        
+    Returns:
+        Contenido del archivo
+    """
+    columnas = {nombre: array(tipo) for nombre, tipo in COLUMNAS_PASAJEROS}
+    nombres: Dict[str, int] = {}
+    estaciones_data = {}
+    
+    for nombre, estacion in estaciones.items():
+        try:
+            cantidad = 0
+            for p in estacion.pasajeros_esperando:
+                llegada, partida = _tiempos_pasajero(p)
+                columnas["id"].append(p.id)
+                columnas["destino"].append(nombres.setdefault(p.destino, len(nombres)))
+                columnas["llegada"].append(llegada)
+                columnas["partida"].append(partida)
+                cantidad += 1
+            
+            estaciones_data[nombre] = {
+                "coord_x": estacion.coordenada_x,
+                "coord_y": estacion.coordenada_y,
+                "pasajeros": cantidad
+            }
+        except AttributeError as e:
+            print(f"Advertencia: Error al serializar estación '{nombre}': {e}")
+            continue
+    
+    info = info or construir_info(trenes, estaciones, rutas, formato="binario")
+    encabezado = {
+        "info": info,
+        "version": info["version"],
+        "timestamp": info["timestamp"],
+        "trenes": serializar_trenes(trenes),
+        "estaciones": estaciones_data,
+        "rutas": serializar_rutas(rutas),
+        "destinos": list(nombres),
+        "orden_bytes": sys.byteorder,
+        "columnas": [
+            [nombre, tipo, columnas[nombre].itemsize] for nombre, tipo in COLUMNAS_PASAJEROS
+        ]
+    }
+    encabezado_bytes = json.dumps(encabezado, ensure_ascii=False).encode('utf-8')
+    
+    partes = [BINARY_MAGIC, struct.pack('<I', len(encabezado_bytes)), encabezado_bytes]
+    partes.extend(columnas[nombre].tobytes() for nombre, _ in COLUMNAS_PASAJEROS)
+    return b"".join(partes)
+
+
+def deserializar_binario(contenido: bytes) -> Dict[str, Any]:
     """
-    Crea una copia de seguridad del archivo de datos.
+    Lee el contenido de un archivo binario.
+    
+    Args:
+        contenido: Bytes del archivo completo
+        
+    Returns:
+        Diccionario con las claves 'trenes', 'estaciones', 'rutas' (como
+        cargar_datos); cada estación trae sus pasajeros en la clave
+        'pasajeros_columnas'
+        
+    Raises:
+        ValueError: Si el contenido no tiene el formato esperado
+    """
+    if not contenido.startswith(BINARY_MAGIC):
+        raise ValueError("El archivo no tiene el formato binario del simulador")
+    
+    inicio = len(BINARY_MAGIC)
+    (largo,) = struct.unpack_from('<I', contenido, inicio)
+    inicio += 4
+    encabezado = json.loads(contenido[inicio:inicio + largo].decode('utf-8'))
+    inicio += largo
+    
+    total = sum(e["pasajeros"] for e in encabezado["estaciones"].values())
+    vista = memoryview(contenido)
+    columnas = {}
+    for nombre, _, tamano in encabezado["columnas"]:
+        tipo = TIPOS_POR_TAMANO.get(tamano)
+        if tipo is None or array(tipo).itemsize != tamano:
+            raise ValueError(f"La columna '{nombre}' usa enteros de {tamano} bytes, no soportado aquí")
+        columna = array(tipo)
+        fin = inicio + total * tamano
+        if fin > len(contenido):
+            raise ValueError("El archivo binario está incompleto")
+        columna.frombytes(vista[inicio:fin])
+        if encabezado["orden_bytes"] != sys.byteorder:
+            columna.byteswap()
+        columnas[nombre] = columna
+        inicio = fin
+    
+    destinos = encabezado["destinos"]
+    estaciones = {}
+    desde = 0
+    for nombre, specs in encabezado["estaciones"].items():
+        hasta = desde + specs["pasajeros"]
+        estaciones[nombre] = {
+            "coord_x": specs["coord_x"],
+            "coord_y": specs["coord_y"],
+            "pasajeros_columnas": {
+                "id": columnas["id"][desde:hasta],
+                "destino": [destinos[i] for i in columnas["destino"][desde:hasta]],
+                "llegada": columnas["llegada"][desde:hasta],
+                "partida": columnas["partida"][desde:hasta]
+            }
+        }
+        desde = hasta
+    
+    return {
+        "version": encabezado.get("version"),
+        "timestamp": encabezado.get("timestamp"),
+        "trenes": encabezado.get("trenes", {}),
+        "estaciones": estaciones,
+        "rutas": encabezado.get("rutas", [])
+    }
+
+
+def _deserializar_columnas(origen: str, columnas: Dict[str, Any]) -> List[Pasajero]:
+    """Crea los pasajeros de una estación a partir de sus columnas."""
+    pasajeros = []
+    for id_pasajero, destino, llegada, partida in zip(
+        columnas["id"], columnas["destino"], columnas["llegada"], columnas["partida"]
+    ):
+        pasajero = Pasajero(origen=origen, destino=destino, tiempo_llegada=llegada)
+        pasajero.id = id_pasajero
+        if partida != SIN_PARTIDA:
+            pasajero.segundos_partida = partida
+        pasajeros.append(pasajero)
+    
+    # Actualizar contador estático si es necesario
+    if columnas["id"]:
+        Pasajero.id_counter = max(Pasajero.id_counter, max(columnas["id"]) + 1)
+    return pasajeros
+
+
+# ========== CARGA INCREMENTAL ==========
+
+def _informe_progreso(ruta_archivo: str) -> Optional[Progreso]:
+    """Función de progreso que imprime cada 10% (None para archivos pequeños)."""
+    if os.path.getsize(ruta_archivo) < UMBRAL_PROGRESO:
+        return None
+    
+    ultimo = [-1]
+    
+    def informar(leidos: int, total: int):
+        decena = min(10, leidos * 10 // total) if total else 0
+        if decena > ultimo[0]:
+            ultimo[0] = decena
+            print(f"  - Cargando '{ruta_archivo}': {decena * 10}%")
+    
+    return informar
+
+
+def _leer_json(ruta_archivo: str, progreso: Optional[Progreso] = None) -> Dict[str, Any]:
+    """
+    Lee un guardado JSON de forma incremental. El resultado es el mismo de
+    json.load, pero sin tener el texto completo del archivo en memoria.
+    
+    Raises:
+        json.JSONDecodeError: Si el archivo no es JSON válido
+    """
+    data: Dict[str, Any] = {}
+    for tipo, clave, valor in leer_guardado(ruta_archivo, progreso=progreso or _informe_progreso(ruta_archivo)):
+        if tipo == "campo":
+            data[clave] = valor
+        elif tipo == "pasajeros":
+            estacion = data["estaciones"].setdefault(clave, {})
+            estacion.setdefault("pasajeros_esperando", []).extend(valor)
+        else:
+            data["estaciones"].setdefault(clave, {}).update(valor)
+    return data
+
+
+def cargar_objetos(
+    ruta_archivo: Optional[str] = None,
+    tamano_lote: int = TAMANO_LOTE,
+    progreso: Optional[Progreso] = None
+) -> Dict[str, Any]:
+    """
+    Carga un guardado construyendo directamente los objetos del modelo.
+    Los pasajeros en espera se leen y se entregan a su estación por lotes,
+    así nunca están en memoria todos los diccionarios del archivo a la vez.
+    Si el archivo tiene bitácora, sus cambios se aplican sobre los objetos.
+    
+    Los archivos binarios (y los JSON que no se pudieron leer) se cargan
+    con cargar_datos y luego se deserializan.
+    
+    Args:
+        ruta_archivo: Archivo a cargar (None usa el guardado principal)
+        tamano_lote: Pasajeros deserializados por lote
+        progreso: Función llamada con (bytes leídos, bytes totales)
+        
+    Returns:
+        Diccionario con 'trenes' ({nombre: Tren}), 'estaciones'
+        ({nombre: Estacion}) y 'rutas' (RegistroRutas); si el archivo es la
+        base de una bitácora incluye además 'id_bitacora'
+    """
+    ruta = ruta_archivo or DATA_FILE_PATH
+    if os.path.exists(ruta) and not es_archivo_binario(ruta):
+        try:
+            return _cargar_objetos_json(ruta, tamano_lote, progreso or _informe_progreso(ruta))
+        except json.JSONDecodeError as e:
+            print(f"Error al decodificar JSON: {e}")
+        except ERRORES_DESCOMPRESION as e:
+            print(f"Error al leer '{ruta}': {e}")
+        except (KeyError, ValueError) as e:
+            print(f"Error de formato en '{ruta}': {e}")
+    
+    data = cargar_datos(ruta_archivo, progreso)
+    resultado = {
+        "trenes": deserializar_trenes(data["trenes"]),
+        "estaciones": deserializar_estaciones(data["estaciones"]),
+        "rutas": deserializar_rutas(data["rutas"])
+    }
+    if data.get("id_bitacora"):
+        resultado["id_bitacora"] = data["id_bitacora"]
+    return resultado
+
+
+def _cargar_objetos_json(ruta_archivo: str, tamano_lote: int, progreso: Optional[Progreso]) -> Dict[str, Any]:
+    """Lee un guardado JSON creando estaciones y pasajeros a medida que aparecen."""
+    campos: Dict[str, Any] = {}
+    estaciones: Dict[str, Estacion] = {}
+    
+    def estacion_de(nombre: str) -> Estacion:
+        # Las coordenadas llegan al terminar de leer la estación
+        if nombre not in estaciones:
+            estaciones[nombre] = Estacion(nombre=nombre, coordenada_x=0, coordenada_y=0)
+        return estaciones[nombre]
+    
+    for tipo, clave, valor in leer_guardado(ruta_archivo, tamano_lote, progreso):
+        if tipo == "campo":
+            campos[clave] = valor
+        elif tipo == "pasajeros":
+            estacion_de(clave).agregar_pasajeros([deserializar_pasajero(p) for p in valor])
+        else:
+            estacion = estacion_de(clave)
+            Estacion._validar_parametros(clave, valor['coord_x'], valor['coord_y'])
+            estacion.coordenada_x = valor['coord_x']
+            estacion.coordenada_y = valor['coord_y']
+    
+    resultado = {
+        "trenes": deserializar_trenes(campos.get("trenes", {})),
+        "estaciones": estaciones,
+        "rutas": deserializar_rutas(campos.get("rutas", []))
+    }
+    if campos.get("id_bitacora"):
+        resultado["id_bitacora"] = campos["id_bitacora"]
+    
+    # Aplicar los cambios guardados después de la última compactación
+    from logic.bitacora_guardado import aplicar_bitacora_objetos
+    registros = aplicar_bitacora_objetos(resultado, ruta_archivo)
+    
+    print(f"✓ Datos cargados exitosamente desde '{ruta_archivo}'")
+    if "timestamp" in campos:
+        print(f"  - Última modificación: {campos['timestamp']}")
+    if registros:
+        print(f"  - Registros de bitácora aplicados: {registros}")
+    print(f"  - Trenes: {len(resultado['trenes'])}")
+    print(f"  - Estaciones: {len(estaciones)}")
+    print(f"  - Rutas: {len(resultado['rutas'])}")
+    print(f"  - Pasajeros en espera: {sum(e.total_esperando for e in estaciones.values())}")
+    return resultado
+
+
+# ========== RESUMEN Y CATÁLOGO ==========
+
+def construir_info(
+    trenes: Dict,
+    estaciones: Dict,
+    rutas: List,
+    formato: str = "json",
+    timestamp: Optional[str] = None,
+    compresion: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Resumen de un guardado: versión, fecha y cantidades.
+    Se calcula desde los objetos sin serializar los pasajeros.
+    
+    Args:
+        formato: "json" o "binario"
+        timestamp: Fecha del guardado en ISO 8601 (None usa la actual)
+        compresion: Códec del archivo (None si no está comprimido)
+    """
+    return {
+        "version": BINARY_VERSION if formato == "binario" else DATA_VERSION,
+        "timestamp": timestamp or dt.datetime.now().isoformat(),
+        "formato": formato,
+        "compresion": compresion,
+        "num_trenes": len(trenes),
+        "num_estaciones": len(estaciones),
+        "num_rutas": len(rutas),
+        "num_pasajeros": sum(getattr(e, "total_esperando", 0) for e in estaciones.values())
+    }
+
+
+def _leer_info_binario(ruta_archivo: str) -> Dict[str, Any]:
+    """Lee solo el encabezado de un archivo binario."""
+    with open(ruta_archivo, 'rb') as crudo, abrir_lectura(crudo) as f:
+        inicio = f.read(len(BINARY_MAGIC) + 4)
+        if not inicio.startswith(BINARY_MAGIC) or len(inicio) < len(BINARY_MAGIC) + 4:
+            raise ValueError("El archivo no tiene el formato binario del simulador")
+        (largo,) = struct.unpack_from('<I', inicio, len(BINARY_MAGIC))
+        encabezado = json.loads(f.read(largo).decode('utf-8'))
+    
+    if "info" in encabezado:
+        return encabezado["info"]
+    return {
+        "version": encabezado.get("version", "desconocida"),
+        "timestamp": encabezado.get("timestamp", "desconocido"),
+        "formato": "binario",
+        "num_trenes": len(encabezado.get("trenes", {})),
+        "num_estaciones": len(encabezado.get("estaciones", {})),
+        "num_rutas": len(encabezado.get("rutas", [])),
+        "num_pasajeros": sum(e["pasajeros"] for e in encabezado.get("estaciones", {}).values())
+    }
+
+
+def _contar_info_json(ruta_archivo: str) -> Dict[str, Any]:
+    """Resumen de un archivo JSON sin "info" (formato anterior): se recorre completo."""
+    data: Dict[str, Any] = {}
+    estaciones = set()
+    num_pasajeros = 0
+    for tipo, clave, valor in leer_guardado(ruta_archivo):
+        if tipo == "campo":
+            data[clave] = valor
+        elif tipo == "pasajeros":
+            num_pasajeros += len(valor)
+        else:
+            estaciones.add(clave)
+    
+    return {
+        "version": data.get("version", "desconocida"),
+        "timestamp": data.get("timestamp", "desconocido"),
+        "formato": "json",
+        "num_trenes": len(data.get("trenes", {})),
+        "num_estaciones": len(estaciones) or len(data.get("estaciones") or {}),
+        "num_rutas": len(data.get("rutas", [])),
+        "num_pasajeros": num_pasajeros
+    }
+
+
+def leer_info(ruta_archivo: str) -> Dict[str, Any]:
+    """
+    Lee el resumen de un guardado sin cargar el resto del archivo.
+    
+    En JSON el resumen es la primera clave ("info"), así basta una lectura
+    pequeña. Los archivos sin resumen se recorren completos.
+    
+    Args:
+        ruta_archivo: Archivo a inspeccionar
+        
+    Returns:
+        Diccionario con version, timestamp, formato y las cantidades
+        
+    Raises:
+        ValueError: Si el archivo no tiene un formato reconocido
+        IOError: Si no se puede leer el archivo
+    """
+    if es_archivo_binario(ruta_archivo):
+        return _leer_info_binario(ruta_archivo)
+    
+    with open(ruta_archivo, 'rb') as crudo, abrir_lectura(crudo) as f:
+        lector = LectorJSON(f, tamano_bloque=TAMANO_LECTURA_INFO)
+        for clave in lector.claves():
+            if clave == "info":
+                return lector.valor()
+            break
+    return _contar_info_json(ruta_archivo)
+
+
+def _leer_catalogo() -> Dict[str, Dict[str, Any]]:
+    """Catálogo {nombre_archivo: resumen}; vacío si no existe o está dañado."""
+    try:
+        with open(CATALOG_FILE_PATH, 'r', encoding='utf-8') as f:
+            catalogo = json.load(f)
+        return catalogo if isinstance(catalogo, dict) else {}
+    except (IOError, ValueError):
+        return {}
+
+
+def _escribir_catalogo(catalogo: Dict[str, Dict[str, Any]]):
+    try:
+        if _asegurar_directorio_guardado():
+            _escribir_atomico(CATALOG_FILE_PATH, _escritor_json(catalogo))
+    except IOError as e:
+        print(f"Advertencia: No se pudo actualizar el catálogo: {e}")
+
+
+def _entrada_catalogo(ruta_archivo: str, info: Dict[str, Any]) -> Dict[str, Any]:
+    """Resumen más el tamaño y la fecha de modificación con que se validó."""
+    estado = os.stat(ruta_archivo)
+    return {**info, "tamaño_archivo": estado.st_size, "modificado_ns": estado.st_mtime_ns}
+
+
+def _entrada_vigente(ruta_archivo: str, entrada: Optional[Dict[str, Any]]) -> bool:
+    """True si el archivo no cambió desde que se registró la entrada."""
+    if not entrada:
+        return False
+    estado = os.stat(ruta_archivo)
+    return (
+        entrada.get("tamaño_archivo") == estado.st_size and
+        entrada.get("modificado_ns") == estado.st_mtime_ns
+    )
+
+
+def actualizar_catalogo(nombre_archivo: str, info: Optional[Dict[str, Any]] = None):
+    """
+    Registra o actualiza un guardado en el catálogo.
+    
+    Args:
+        nombre_archivo: Nombre del archivo dentro de SAVE_DIR
+        info: Resumen ya calculado (None lo lee del archivo)
+    """
+    ruta_archivo = os.path.join(SAVE_DIR, nombre_archivo)
+    try:
+        entrada = _entrada_catalogo(ruta_archivo, info or leer_info(ruta_archivo))
+    except (ValueError, *ERRORES_DESCOMPRESION) as e:
+        print(f"Advertencia: No se pudo leer el resumen de '{nombre_archivo}': {e}")
+        return
+    
+    catalogo = _leer_catalogo()
+    catalogo[nombre_archivo] = entrada
+    _escribir_catalogo(catalogo)
+
+
+def _quitar_del_catalogo(nombre_archivo: str):
+    catalogo = _leer_catalogo()
+    if catalogo.pop(nombre_archivo, None) is not None:
+        _escribir_catalogo(catalogo)
+
+
+def listar_guardados_con_info() -> List[Dict[str, Any]]:
+    """
+    Lista los guardados disponibles con su resumen, para una pantalla de carga.
+    Usa el catálogo; solo se leen los archivos nuevos o modificados desde
+    que se registraron, y el catálogo se corrige si hizo falta.
+    
+    Returns:
+        Lista de diccionarios con 'nombre' más las claves de leer_info,
+        'tamaño_archivo' y 'modificado_ns'
+    """
+    catalogo = _leer_catalogo()
+    cambios = False
+    resultado = []
+    
+    nombres = listar_guardados_disponibles()
+    for nombre in nombres:
+        ruta_archivo = os.path.join(SAVE_DIR, nombre)
+        try:
+            entrada = catalogo.get(nombre)
+            if not _entrada_vigente(ruta_archivo, entrada):
+                entrada = _entrada_catalogo(ruta_archivo, leer_info(ruta_archivo))
+                catalogo[nombre] = entrada
+                cambios = True
+        except (ValueError, *ERRORES_DESCOMPRESION) as e:
+            print(f"Advertencia: No se pudo leer el resumen de '{nombre}': {e}")
+            continue
+        resultado.append({"nombre": nombre, **entrada})
+    
+    for nombre in set(catalogo) - set(nombres):
+        del catalogo[nombre]
+        cambios = True
+    
+    if cambios:
+        _escribir_catalogo(catalogo)
+    return resultado
+
+
+def _crear_backup(archivo_origen: str, num_backups: int = NUM_BACKUPS) -> bool:
+    """
+    Rota las generaciones de backup y convierte el archivo actual en la más reciente.
+    
+    Las generaciones se desplazan con os.replace (la más antigua se
+    descarta) y el archivo actual se enlaza como generación 1, así no se
+    copian bytes. Si el sistema de archivos no admite enlaces duros, el
+    archivo se renombra: hasta el próximo os.replace solo existen los
+    backups, y cargar_datos los usa.
     
     Args:
         archivo_origen: Ruta del archivo a respaldar
-        archivo_backup: Ruta donde guardar el backup
+        num_backups: Generaciones a conservar
         
     Returns:
         True si el backup fue exitoso
     """
+    if num_backups <= 0 or not os.path.exists(archivo_origen):
+        return False
+    
     try:
-        if os.path.exists(archivo_origen):
-            import shutil
-            shutil.copy2(archivo_origen, archivo_backup)
-            return True
+        for generacion in range(num_backups - 1, 0, -1):
+            if os.path.exists(ruta_backup(generacion)):
+                os.replace(ruta_backup(generacion), ruta_backup(generacion + 1))
+        
+        reciente = ruta_backup(1)
+        if os.path.exists(reciente):
+            os.remove(reciente)
+        try:
+            os.link(archivo_origen, reciente)
+        except OSError:
+            os.replace(archivo_origen, reciente)
+        return True
     except Exception as e:
         print(f"Advertencia: No se pudo crear backup: {e}")
     return False
 
 
+def escribir_guardado(
+    ruta_archivo: str,
+    trenes: Dict,
+    estaciones: Dict,
+    rutas: List,
+    compresion: Optional[str] = None,
+    compacto: bool = False,
+    metadatos: Optional[Dict[str, Any]] = None,
+    antes_de_escribir: Optional[Callable[[], Any]] = None
+) -> Dict[str, Any]:
+    """
+    Serializa el estado y lo escribe de forma atómica en `ruta_archivo`.
+    El formato (JSON o binario) se elige por la extensión de la ruta.
+    
+    Args:
+        ruta_archivo: Archivo de destino
+        trenes: Diccionario de objetos Tren
+        estaciones: Diccionario de objetos Estacion
+        rutas: Lista de objetos Ruta
+        compresion: "gzip", "bz2", "lzma" o None
+        compacto: JSON sin sangría ni espacios (no aplica al formato binario)
+        metadatos: Claves adicionales para el encabezado JSON
+        antes_de_escribir: Se llama después de serializar y antes de escribir
+        
+    Returns:
+        Resumen del guardado escrito (ver construir_info)
+        
+    Raises:
+        ValueError: Si el códec no es válido
+        IOError: Si falla la escritura
+    """
+    validar_compresion(compresion)
+    
+    if es_archivo_binario(ruta_archivo):
+        info = construir_info(trenes, estaciones, rutas, formato="binario", compresion=compresion)
+        contenido = serializar_binario(trenes, estaciones, rutas, info)
+        escribir = lambda f: f.write(contenido)
+    else:
+        # El resumen va primero para leerlo sin cargar el resto
+        info = construir_info(trenes, estaciones, rutas, compresion=compresion)
+        data = {
+            "info": info,
+            "version": info["version"],
+            "timestamp": info["timestamp"],
+            "trenes": serializar_trenes(trenes),
+            "estaciones": serializar_estaciones(estaciones),
+            "rutas": serializar_rutas(rutas)
+        }
+        if metadatos:
+            data.update(metadatos)
+        escribir = _escritor_json(data, compacto)
+    
+    if antes_de_escribir is not None:
+        antes_de_escribir()
+    _escribir_atomico(ruta_archivo, escribir, es_archivo_binario(ruta_archivo), compresion)
+    return info
+
+
 def guardar_datos(
     trenes: Dict,
     estaciones: Dict,
     rutas: List,
-    crear_backup: bool = True
+    crear_backup: bool = True,
+    metadatos: Optional[Dict[str, Any]] = None,
+    compresion: Optional[str] = None,
+    compacto: bool = False
 ) -> bool:
     """
     Guarda todos los datos del simulador en formato JSON.
@@ -185,7 +1004,11 @@ def guardar_datos(
         trenes: Diccionario de objetos Tren
         estaciones: Diccionario de objetos Estacion
         rutas: Lista de objetos Ruta
-        crear_backup: Si es True, crea un backup antes de guardar
+        crear_backup: Si es True, rota los backups antes de guardar
+        metadatos: Claves adicionales para el encabezado del archivo
+        compresion: "gzip", "bz2", "lzma" o None; el archivo conserva su
+            nombre y cargar_datos detecta el códec
+        compacto: Si es True, escribe el JSON sin sangría
         
     Returns:
         True si el guardado fue exitoso, False en caso contrario
@@ -195,27 +1018,16 @@ def guardar_datos(
         print(f"Error: No se pudo crear el directorio '{SAVE_DIR}'")
         return False
     
-    # Crear backup si se solicita
-    if crear_backup:
-        _crear_backup(DATA_FILE_PATH, BACKUP_FILE_PATH)
-    
-    # Serializar los datos
-    try:
-        data = {
-            "version": "1.0",
-            "timestamp": dt.datetime.now().isoformat(),
-            "trenes": serializar_trenes(trenes),
-            "estaciones": serializar_estaciones(estaciones),
-            "rutas": serializar_rutas(rutas)
-        }
-    except Exception as e:
-        print(f"Error al serializar los datos: {e}")
-        return False
+    # Los backups se rotan después de serializar, así un error no los descarta
+    rotar = (lambda: _crear_backup(DATA_FILE_PATH)) if crear_backup else None
     
-    # Guardar en archivo
     try:
-        with open(DATA_FILE_PATH, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        info = escribir_guardado(
+            DATA_FILE_PATH, trenes, estaciones, rutas,
+            compresion=compresion, compacto=compacto, metadatos=metadatos,
+            antes_de_escribir=rotar
+        )
+        actualizar_catalogo(DATA_FILENAME, info)
         
         print(f"✓ Datos guardados exitosamente en '{DATA_FILE_PATH}'")
         print(f"  - Trenes: {len(trenes)}")
@@ -223,6 +1035,9 @@ def guardar_datos(
         print(f"  - Rutas: {len(rutas)}")
         return True
         
+    except ValueError as e:
+        print(f"Error al guardar los datos: {e}")
+        return False
     except IOError as e:
         print(f"Error de E/S al guardar los datos: {e}")
         return False
@@ -231,13 +1046,19 @@ def guardar_datos(
         return False
 
 
-def cargar_datos() -> Dict[str, Any]:
+def cargar_datos(ruta_archivo: Optional[str] = None, progreso: Optional[Progreso] = None) -> Dict[str, Any]:
     """
     Carga los datos del simulador desde el archivo JSON.
     Si el archivo no existe o hay error, retorna datos vacíos.
     
+    Args:
+        ruta_archivo: Archivo a cargar (None usa el guardado principal)
+        progreso: Función llamada con (bytes leídos, bytes totales); por
+            defecto los archivos grandes imprimen su avance
+        
     Returns:
-        Diccionario con las claves 'trenes', 'estaciones', 'rutas'
+        Diccionario con las claves 'trenes', 'estaciones', 'rutas'; si el
+        archivo es la base de una bitácora incluye además 'id_bitacora'
     """
     datos_vacios = {
         "trenes": {},
@@ -245,32 +1066,49 @@ def cargar_datos() -> Dict[str, Any]:
         "rutas": []
     }
     
+    ruta_archivo = ruta_archivo or DATA_FILE_PATH
+    
     # Verificar si existe el archivo
-    if not os.path.exists(DATA_FILE_PATH):
-        print(f"Archivo de datos no encontrado en '{DATA_FILE_PATH}'")
+    if not os.path.exists(ruta_archivo):
+        if ruta_archivo == DATA_FILE_PATH and os.path.exists(ruta_backup(1)):
+            # Un guardado se interrumpió entre la rotación y el reemplazo
+            print(f"Archivo de datos no encontrado en '{ruta_archivo}'")
+            return _cargar_desde_backup()
+        print(f"Archivo de datos no encontrado en '{ruta_archivo}'")
         print("Cargando valores por defecto...")
         return datos_vacios
     
     # Intentar cargar el archivo
     try:
-        with open(DATA_FILE_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if es_archivo_binario(ruta_archivo):
+            with open(ruta_archivo, 'rb') as crudo, abrir_lectura(crudo) as f:
+                data = deserializar_binario(f.read())
+        else:
+            data = _leer_json(ruta_archivo, progreso)
         
         # Validar estructura básica
         if not isinstance(data, dict):
             print("Error: El archivo de datos no tiene el formato correcto")
             return datos_vacios
         
+        # Aplicar los cambios guardados después de la última compactación
+        from logic.bitacora_guardado import aplicar_bitacora
+        registros = aplicar_bitacora(data, ruta_archivo)
+        
         # Extraer datos con valores por defecto
         resultado = {
             "trenes": data.get("trenes", {}),
             "estaciones": data.get("estaciones", {}),
             "rutas": data.get("rutas", [])
         }
+        if data.get("id_bitacora"):
+            resultado["id_bitacora"] = data["id_bitacora"]
         
-        print(f"✓ Datos cargados exitosamente desde '{DATA_FILE_PATH}'")
+        print(f"✓ Datos cargados exitosamente desde '{ruta_archivo}'")
         if "timestamp" in data:
             print(f"  - Última modificación: {data['timestamp']}")
+        if registros:
+            print(f"  - Registros de bitácora aplicados: {registros}")
         print(f"  - Trenes: {len(resultado['trenes'])}")
         print(f"  - Estaciones: {len(resultado['estaciones'])}")
         print(f"  - Rutas: {len(resultado['rutas'])}")
@@ -282,8 +1120,14 @@ def cargar_datos() -> Dict[str, Any]:
         print("Intentando cargar desde backup...")
         return _cargar_desde_backup()
         
-    except IOError as e:
-        print(f"Error de E/S al cargar los datos: {e}")
+    except ERRORES_DESCOMPRESION as e:
+        # Archivo comprimido dañado o cortado, o error de E/S al leerlo
+        print(f"Error al leer '{ruta_archivo}': {e}")
+        print("Intentando cargar desde backup...")
+        return _cargar_desde_backup()
+        
+    except ValueError as e:
+        print(f"Error de formato en '{ruta_archivo}': {e}")
         return datos_vacios
         
     except Exception as e:
@@ -291,12 +1135,15 @@ def cargar_datos() -> Dict[str, Any]:
         return datos_vacios
 
 
-def _cargar_desde_backup() -> Dict[str, Any]:
+def _cargar_desde_backup(num_backups: int = NUM_BACKUPS) -> Dict[str, Any]:
     """
-    Intenta cargar datos desde el archivo de backup.
+    Intenta cargar datos desde los backups, del más reciente al más antiguo.
+    
+    Args:
+        num_backups: Generaciones a revisar
     
     Returns:
-        Diccionario con datos o datos vacíos si falla
+        Diccionario con datos del primer backup legible o datos vacíos si fallan todos
     """
     datos_vacios = {
         "trenes": {},
@@ -304,31 +1151,38 @@ def _cargar_desde_backup() -> Dict[str, Any]:
         "rutas": []
     }
     
-    if not os.path.exists(BACKUP_FILE_PATH):
-        print("No se encontró archivo de backup")
-        return datos_vacios
-    
-    try:
-        with open(BACKUP_FILE_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    encontrado = False
+    for generacion in range(1, num_backups + 1):
+        ruta = ruta_backup(generacion)
+        if not os.path.exists(ruta):
+            continue
+        encontrado = True
         
-        print(f"✓ Datos cargados desde backup: '{BACKUP_FILE_PATH}'")
+        try:
+            data = _leer_json(ruta)
+        except Exception as e:
+            print(f"Error al cargar backup '{ruta}': {e}")
+            continue
         
+        print(f"✓ Datos cargados desde backup: '{ruta}'")
         return {
             "trenes": data.get("trenes", {}),
             "estaciones": data.get("estaciones", {}),
             "rutas": data.get("rutas", [])
         }
-    except Exception as e:
-        print(f"Error al cargar backup: {e}")
-        return datos_vacios
+    
+    if not encontrado:
+        print("No se encontró archivo de backup")
+    return datos_vacios
 
 
 def exportar_datos(
     trenes: Dict,
     estaciones: Dict,
     rutas: List,
-    nombre_archivo: str
+    nombre_archivo: str,
+    compresion: Optional[str] = None,
+    compacto: bool = False
 ) -> bool:
     """
     Exporta los datos a un archivo específico (para exportación manual).
@@ -337,14 +1191,23 @@ def exportar_datos(
         trenes: Diccionario de objetos Tren
         estaciones: Diccionario de objetos Estacion
         rutas: Lista de objetos Ruta
-        nombre_archivo: Nombre del archivo (con o sin .json)
+        nombre_archivo: Nombre del archivo (con o sin .json); con extensión
+            BINARY_EXTENSION se usa el formato binario, y una extensión de
+            compresión (.gz, .bz2, .xz) elige el códec
+        compresion: "gzip", "bz2", "lzma" o None; si el nombre no tiene la
+            extensión del códec, se agrega
+        compacto: Si es True, escribe el JSON sin sangría
         
     Returns:
         True si la exportación fue exitosa
     """
+    compresion = compresion_de_nombre(nombre_archivo) or compresion
+    base = quitar_extension_compresion(nombre_archivo)
+    
     # Asegurar extensión .json
-    if not nombre_archivo.endswith('.json'):
-        nombre_archivo += '.json'
+    if not base.endswith('.json') and not es_archivo_binario(base):
+        base += '.json'
+    nombre_archivo = base + (CODECS[compresion][1] if compresion in CODECS else "")
     
     ruta_exportacion = os.path.join(SAVE_DIR, nombre_archivo)
     
@@ -352,16 +1215,11 @@ def exportar_datos(
         if not _asegurar_directorio_guardado():
             return False
         
-        data = {
-            "version": "1.0",
-            "timestamp": dt.datetime.now().isoformat(),
-            "trenes": serializar_trenes(trenes),
-            "estaciones": serializar_estaciones(estaciones),
-            "rutas": serializar_rutas(rutas)
-        }
-        
-        with open(ruta_exportacion, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        info = escribir_guardado(
+            ruta_exportacion, trenes, estaciones, rutas,
+            compresion=compresion, compacto=compacto
+        )
+        actualizar_catalogo(nombre_archivo, info)
         
         print(f"✓ Datos exportados a '{ruta_exportacion}'")
         return True
@@ -376,7 +1234,8 @@ def listar_guardados_disponibles() -> List[str]:
     Lista todos los archivos de guardado disponibles.
     
     Returns:
-        Lista de nombres de archivos .json encontrados
+        Lista de nombres de archivos .json y binarios encontrados,
+        comprimidos o no
     """
     if not os.path.exists(SAVE_DIR):
         return []
@@ -384,7 +1243,7 @@ def listar_guardados_disponibles() -> List[str]:
     try:
         archivos = [
             f for f in os.listdir(SAVE_DIR)
-            if f.endswith('.json')
+            if quitar_extension_compresion(f).endswith('.json') or es_archivo_binario(f)
         ]
         return sorted(archivos)
     except Exception as e:
@@ -407,6 +1266,11 @@ def eliminar_guardado(nombre_archivo: str) -> bool:
     try:
         if os.path.exists(ruta_archivo):
             os.remove(ruta_archivo)
+            # La bitácora no sirve sin su archivo base
+            from logic.bitacora_guardado import ruta_bitacora
+            if os.path.exists(ruta_bitacora(ruta_archivo)):
+                os.remove(ruta_bitacora(ruta_archivo))
+            _quitar_del_catalogo(nombre_archivo)
             print(f"✓ Archivo '{nombre_archivo}' eliminado")
             return True
         else:
@@ -417,28 +1281,32 @@ def eliminar_guardado(nombre_archivo: str) -> bool:
         return False
 
 
-def obtener_info_guardado() -> Optional[Dict[str, Any]]:
+def obtener_info_guardado(nombre_archivo: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
-    Obtiene información sobre el guardado actual sin cargar todos los datos.
+    Obtiene información sobre un guardado sin cargar todos los datos.
+    Usa el catálogo si el archivo no cambió; si no, lee solo su resumen.
+    
+    Args:
+        nombre_archivo: Archivo dentro de SAVE_DIR (None usa el guardado principal)
     
     Returns:
         Diccionario con metadatos o None si no existe
     """
-    if not os.path.exists(DATA_FILE_PATH):
+    nombre_archivo = nombre_archivo or DATA_FILENAME
+    ruta_archivo = os.path.join(SAVE_DIR, nombre_archivo)
+    if not os.path.exists(ruta_archivo):
         return None
     
     try:
-        with open(DATA_FILE_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        entrada = _leer_catalogo().get(nombre_archivo)
+        if _entrada_vigente(ruta_archivo, entrada):
+            return entrada
         
-        return {
-            "version": data.get("version", "desconocida"),
-            "timestamp": data.get("timestamp", "desconocido"),
-            "num_trenes": len(data.get("trenes", {})),
-            "num_estaciones": len(data.get("estaciones", {})),
-            "num_rutas": len(data.get("rutas", [])),
-            "tamaño_archivo": os.path.getsize(DATA_FILE_PATH)
-        }
+        entrada = _entrada_catalogo(ruta_archivo, leer_info(ruta_archivo))
+        catalogo = _leer_catalogo()
+        catalogo[nombre_archivo] = entrada
+        _escribir_catalogo(catalogo)
+        return entrada
     except Exception as e:
         print(f"Error al obtener info del guardado: {e}")
-        return None
\ No newline at end of file
+        return None
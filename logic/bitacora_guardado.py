@@ -0,0 +1,505 @@
+"""
+Guardado incremental con bitácora.
+En vez de reescribir todo el JSON en cada guardado, se mantiene un archivo
+base (el mismo formato de guardar_datos) y una bitácora de solo anexado con
+los cambios posteriores: trenes, estaciones y rutas editados, y lotes de
+pasajeros que llegaron o salieron de cada cola. Cada guardado cuesta tiempo
+proporcional a lo que cambió; cuando la bitácora crece demasiado se compacta
+reescribiendo el archivo base.
+
+Formato de la bitácora: un objeto JSON por línea. La primera línea
+identifica al archivo base; cada guardado termina con un registro "fin" y
+al cargar se ignoran los registros de un guardado incompleto.
+"""
+
+import heapq
+import json
+import os
+import uuid
+import datetime as dt
+from collections import Counter, deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from logic.Guardado import (
+    DATA_FILE_PATH, DATA_FILENAME, actualizar_catalogo, cargar_objetos, construir_info,
+    guardar_datos, serializar_trenes, serializar_estaciones, serializar_rutas,
+    serializar_pasajero, deserializar_trenes, deserializar_estaciones, deserializar_pasajero
+)
+from models.clases import Ruta
+
+
+# Constantes de configuración
+EXTENSION_BITACORA = ".bitacora"
+MAX_REGISTROS = 5000            # registros de la bitácora antes de compactar
+PROPORCION_COMPACTAR = 0.5      # compacta si la bitácora supera esta fracción del archivo base
+
+# Tipos de registro
+INICIO = "inicio"
+FIN = "fin"
+TREN = "tren"
+TREN_QUITADO = "tren_quitado"
+ESTACION = "estacion"
+ESTACION_MOVIDA = "estacion_movida"
+ESTACION_QUITADA = "estacion_quitada"
+RUTAS = "rutas"
+PASAJEROS = "pasajeros"
+
+
+def ruta_bitacora(ruta_archivo: str) -> str:
+    """Ruta de la bitácora asociada a un archivo de guardado."""
+    return ruta_archivo + EXTENSION_BITACORA
+
+
+def _guardados_completos(ruta: str, id_base: str) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+    """
+    Recorre los guardados completos de una bitácora hasta la primera línea
+    ilegible o sin salto de línea final.
+
+    Yields:
+        (registros del guardado sin inicio ni fin, posición en bytes después
+        de su registro fin); el primero es ([], posición después del registro
+        de inicio). No entrega nada si la bitácora pertenece a otro archivo base
+    """
+    pendientes: List[Dict[str, Any]] = []
+    posicion = 0
+    with open(ruta, 'rb') as f:
+        for numero, linea in enumerate(f):
+            posicion += len(linea)
+            if not linea.endswith(b"\n"):
+                # Línea cortada por un guardado interrumpido
+                return
+            try:
+                registro = json.loads(linea)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return
+            if not isinstance(registro, dict):
+                return
+            if numero == 0:
+                if registro.get("tipo") != INICIO or registro.get("id") != id_base:
+                    return
+                yield [], posicion
+            elif registro.get("tipo") == FIN:
+                yield pendientes, posicion
+                pendientes = []
+            else:
+                pendientes.append(registro)
+
+
+def _leer_registros(ruta: str, id_base: str) -> List[Dict[str, Any]]:
+    """
+    Lee los registros de guardados completos de una bitácora.
+
+    Returns:
+        Lista de registros (sin los de inicio y fin); vacía si la bitácora
+        no existe o pertenece a otro archivo base
+    """
+    if not os.path.exists(ruta):
+        return []
+
+    registros: List[Dict[str, Any]] = []
+    for guardado, _ in _guardados_completos(ruta, id_base):
+        registros.extend(guardado)
+    return registros
+
+
+def reparar_bitacora(ruta: str, id_base: str) -> Optional[int]:
+    """
+    Corta la bitácora después del último guardado completo.
+
+    Un guardado interrumpido puede dejar una línea a medias o registros sin
+    su "fin". Si se anexaran guardados detrás, la carga se detendría en la
+    línea cortada o mezclaría esos registros con los del guardado siguiente.
+
+    Returns:
+        Líneas que quedan en la bitácora, o None si no existe o pertenece a
+        otro archivo base (el próximo guardado debe ser completo)
+
+    Raises:
+        IOError: Si no se pudo leer o cortar la bitácora
+    """
+    if not os.path.exists(ruta):
+        return None
+
+    lineas = 0
+    fin: Optional[int] = None
+    for guardado, posicion in _guardados_completos(ruta, id_base):
+        lineas += len(guardado) + 1
+        fin = posicion
+    if fin is None:
+        return None
+
+    if os.path.getsize(ruta) > fin:
+        print(f"Advertencia: Se descartó un guardado incompleto al final de '{ruta}'")
+        with open(ruta, 'r+b') as f:
+            f.truncate(fin)
+            f.flush()
+            os.fsync(f.fileno())
+    return lineas
+
+
+def aplicar_bitacora(data: Dict[str, Any], ruta_archivo: Optional[str] = None) -> int:
+    """
+    Aplica sobre los datos leídos del archivo base los cambios de su bitácora.
+
+    Args:
+        data: Diccionario leído del archivo base (se modifica)
+        ruta_archivo: Archivo base (None usa el guardado principal)
+
+    Returns:
+        Cantidad de registros aplicados
+    """
+    id_base = data.get("id_bitacora")
+    if not id_base:
+        return 0
+
+    try:
+        registros = _leer_registros(ruta_bitacora(ruta_archivo or DATA_FILE_PATH), id_base)
+    except (IOError, UnicodeDecodeError) as e:
+        print(f"Advertencia: No se pudo leer la bitácora: {e}")
+        return 0
+
+    trenes = data.setdefault("trenes", {})
+    estaciones = data.setdefault("estaciones", {})
+    rutas = Counter(tuple(r) for r in data.get("rutas", []))
+    orden_rutas = [tuple(r) for r in data.get("rutas", [])]
+
+    # Colas por destino de las estaciones con cambios de pasajeros: (posición, pasajero)
+    colas: Dict[str, Dict[str, deque]] = {}
+    siguiente: Dict[str, int] = {}
+
+    def colas_de(nombre: str) -> Dict[str, deque]:
+        if nombre not in colas:
+            por_destino: Dict[str, deque] = {}
+            esperando = estaciones[nombre].get("pasajeros_esperando", [])
+            for posicion, p in enumerate(esperando):
+                por_destino.setdefault(p["destino"], deque()).append((posicion, p))
+            colas[nombre] = por_destino
+            siguiente[nombre] = len(esperando)
+        return colas[nombre]
+
+    for registro in registros:
+        tipo = registro["tipo"]
+        nombre = registro.get("nombre")
+        if tipo == TREN:
+            trenes[nombre] = registro["datos"]
+        elif tipo == TREN_QUITADO:
+            trenes.pop(nombre, None)
+        elif tipo == ESTACION:
+            estaciones[nombre] = registro["datos"]
+            colas.pop(nombre, None)
+        elif tipo == ESTACION_MOVIDA:
+            estaciones[nombre]["coord_x"] = registro["coord_x"]
+            estaciones[nombre]["coord_y"] = registro["coord_y"]
+        elif tipo == ESTACION_QUITADA:
+            estaciones.pop(nombre, None)
+            colas.pop(nombre, None)
+        elif tipo == RUTAS:
+            for ruta in registro["quitadas"]:
+                ruta = tuple(ruta)
+                if rutas[ruta] > 0:
+                    rutas[ruta] -= 1
+                    orden_rutas.remove(ruta)
+            for ruta in registro["agregadas"]:
+                rutas[tuple(ruta)] += 1
+                orden_rutas.append(tuple(ruta))
+        elif tipo == PASAJEROS:
+            estacion = registro["estacion"]
+            por_destino = colas_de(estacion)
+            for destino, cantidad in registro["salen"].items():
+                cola = por_destino.get(destino, ())
+                for _ in range(min(cantidad, len(cola))):
+                    cola.popleft()
+            for p in registro["llegan"]:
+                por_destino.setdefault(p["destino"], deque()).append((siguiente[estacion], p))
+                siguiente[estacion] += 1
+
+    # Las colas modificadas vuelven a una sola lista en orden de llegada
+    for nombre, por_destino in colas.items():
+        estaciones[nombre]["pasajeros_esperando"] = [
+            p for _, p in heapq.merge(*por_destino.values(), key=lambda entrada: entrada[0])
+        ]
+    data["rutas"] = [list(r) for r in orden_rutas]
+    return len(registros)
+
+
+def aplicar_bitacora_objetos(objetos: Dict[str, Any], ruta_archivo: Optional[str] = None) -> int:
+    """
+    Igual que aplicar_bitacora, pero sobre los objetos creados por
+    cargar_objetos: los pasajeros de la bitácora se deserializan uno a uno
+    y las estaciones sin cambios no se tocan.
+
+    Args:
+        objetos: Resultado de cargar_objetos (se modifica)
+        ruta_archivo: Archivo base (None usa el guardado principal)
+
+    Returns:
+        Cantidad de registros aplicados
+    """
+    id_base = objetos.get("id_bitacora")
+    if not id_base:
+        return 0
+
+    try:
+        registros = _leer_registros(ruta_bitacora(ruta_archivo or DATA_FILE_PATH), id_base)
+    except (IOError, UnicodeDecodeError) as e:
+        print(f"Advertencia: No se pudo leer la bitácora: {e}")
+        return 0
+
+    trenes = objetos["trenes"]
+    estaciones = objetos["estaciones"]
+    rutas = objetos["rutas"]
+    for registro in registros:
+        tipo = registro["tipo"]
+        nombre = registro.get("nombre")
+        if tipo == TREN:
+            trenes.update(deserializar_trenes({nombre: registro["datos"]}))
+        elif tipo == TREN_QUITADO:
+            trenes.pop(nombre, None)
+        elif tipo == ESTACION:
+            estaciones.update(deserializar_estaciones({nombre: registro["datos"]}))
+        elif tipo == ESTACION_MOVIDA:
+            estaciones[nombre].coordenada_x = registro["coord_x"]
+            estaciones[nombre].coordenada_y = registro["coord_y"]
+        elif tipo == ESTACION_QUITADA:
+            estaciones.pop(nombre, None)
+        elif tipo == RUTAS:
+            for origen, destino, distancia in registro["quitadas"]:
+                rutas.quitar(origen, destino, distancia)
+            for origen, destino, distancia in registro["agregadas"]:
+                rutas.append(Ruta(origen=origen, destino=destino, distancia_km=distancia))
+        elif tipo == PASAJEROS:
+            estacion = estaciones[registro["estacion"]]
+            for destino, cantidad in registro["salen"].items():
+                estacion.quitar_primeros(destino, cantidad)
+            estacion.agregar_pasajeros([deserializar_pasajero(p) for p in registro["llegan"]])
+    return len(registros)
+
+
+class BitacoraGuardado:
+    """
+    Guarda el estado del simulador escribiendo solo los cambios.
+
+    Recuerda lo que ya está en disco (datos de trenes, posición y movimientos
+    de las colas de cada estación, rutas) y en cada guardado anexa a la
+    bitácora lo que cambió desde el anterior.
+
+    Attributes:
+        ruta_archivo: Archivo base del guardado
+        max_registros: Registros de la bitácora antes de compactar
+        proporcion_compactar: Tamaño máximo de la bitácora respecto del archivo base
+    """
+
+    def __init__(
+        self,
+        max_registros: int = MAX_REGISTROS,
+        proporcion_compactar: float = PROPORCION_COMPACTAR
+    ):
+        # guardar_datos siempre escribe el guardado principal
+        self.ruta_archivo = DATA_FILE_PATH
+        self.max_registros = max_registros
+        self.proporcion_compactar = proporcion_compactar
+
+        self._id: Optional[str] = None
+        self.id_cargado: Optional[str] = None
+        self._registros = 0
+        self._trenes: Dict[str, Dict[str, Any]] = {}
+        self._estaciones: Dict[str, Tuple[Any, Any, Any, Dict[str, Tuple[int, int]]]] = {}
+        self._rutas: Counter = Counter()
+
+    @property
+    def ruta_bitacora(self) -> str:
+        return ruta_bitacora(self.ruta_archivo)
+
+    # ========== ESTADO EN DISCO ==========
+
+    def marcar_guardado(self, trenes: Dict, estaciones: Dict, rutas: List, id_base: Optional[str] = None):
+        """
+        Registra que los objetos dados coinciden con lo que está en disco.
+        Se llama después de compactar o de cargar el guardado.
+
+        Args:
+            id_base: Identificador del archivo base (None invalida la bitácora:
+                el próximo guardado será completo)
+        """
+        self._id = id_base
+        self._trenes = serializar_trenes(trenes)
+        self._estaciones = {
+            nombre: (estacion, estacion.coordenada_x, estacion.coordenada_y, estacion.movimientos())
+            for nombre, estacion in estaciones.items()
+        }
+        self._rutas = Counter(serializar_rutas(rutas))
+
+    def cargar(self) -> Dict[str, Any]:
+        """
+        Carga el guardado principal aplicando su bitácora.
+        Los objetos se construyen mientras se lee el archivo (cargar_objetos);
+        después se debe llamar a marcar_guardado con id_base=self.id_cargado
+        para que el siguiente guardado sea incremental.
+
+        Returns:
+            Diccionario con 'trenes' ({nombre: Tren}), 'estaciones'
+            ({nombre: Estacion}) y 'rutas' (RegistroRutas)
+        """
+        data = cargar_objetos(self.ruta_archivo)
+        # Sin id (archivo sin bitácora o cargado desde un backup) el próximo guardado es completo
+        self.id_cargado = data.pop("id_bitacora", None)
+        self._registros = 0
+        if self.id_cargado:
+            try:
+                lineas = reparar_bitacora(self.ruta_bitacora, self.id_cargado)
+            except IOError as e:
+                print(f"Advertencia: No se pudo reparar la bitácora: {e}")
+                lineas = None
+            if lineas is None:
+                # Bitácora ausente, de otro archivo base o dañada: el próximo guardado es completo
+                self.id_cargado = None
+            else:
+                self._registros = lineas
+        return data
+
+    # ========== GUARDADO ==========
+
+    def guardar(self, trenes: Dict, estaciones: Dict, rutas: List) -> bool:
+        """
+        Guarda el estado anexando a la bitácora solo los cambios.
+        Compacta si no hay un archivo base conocido o la bitácora creció demasiado.
+
+        Returns:
+            True si el guardado fue exitoso
+        """
+        if self._id is None or self._debe_compactar():
+            return self.compactar(trenes, estaciones, rutas)
+
+        try:
+            registros = self._calcular_registros(trenes, estaciones, rutas)
+        except Exception as e:
+            print(f"Error al calcular los cambios a guardar: {e}")
+            return False
+
+        if registros:
+            registros.append({"tipo": FIN, "timestamp": dt.datetime.now().isoformat()})
+            try:
+                with open(self.ruta_bitacora, 'a', encoding='utf-8') as f:
+                    f.write("".join(
+                        json.dumps(r, ensure_ascii=False, separators=(',', ':')) + "\n"
+                        for r in registros
+                    ))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except IOError as e:
+                print(f"Error de E/S al escribir la bitácora: {e}")
+                # No se sabe qué quedó escrito: el próximo guardado será completo
+                self._id = None
+                return False
+            self._registros += len(registros)
+            # El archivo base no cambia: el catálogo se actualiza con el estado actual
+            actualizar_catalogo(DATA_FILENAME, construir_info(trenes, estaciones, rutas))
+
+        self.marcar_guardado(trenes, estaciones, rutas, self._id)
+        print(f"✓ Cambios guardados en '{self.ruta_bitacora}' ({max(len(registros) - 1, 0)} registros)")
+        return True
+
+    def compactar(self, trenes: Dict, estaciones: Dict, rutas: List) -> bool:
+        """
+        Reescribe el archivo base completo y reinicia la bitácora.
+
+        Returns:
+            True si el guardado fue exitoso
+        """
+        id_base = uuid.uuid4().hex
+        if not guardar_datos(trenes, estaciones, rutas, metadatos={"id_bitacora": id_base}):
+            self._id = None
+            return False
+
+        try:
+            with open(self.ruta_bitacora, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({"tipo": INICIO, "id": id_base}) + "\n")
+        except IOError as e:
+            print(f"Advertencia: No se pudo reiniciar la bitácora: {e}")
+            self._id = None
+            return True
+
+        self._registros = 1
+        self.marcar_guardado(trenes, estaciones, rutas, id_base)
+        return True
+
+    def _debe_compactar(self) -> bool:
+        if self._registros >= self.max_registros:
+            return True
+        try:
+            tamano_base = os.path.getsize(self.ruta_archivo)
+            tamano_bitacora = os.path.getsize(self.ruta_bitacora)
+        except OSError:
+            return True
+        return tamano_bitacora > tamano_base * self.proporcion_compactar
+
+    def _calcular_registros(self, trenes: Dict, estaciones: Dict, rutas: List) -> List[Dict[str, Any]]:
+        """Registros que llevan el estado en disco al estado actual."""
+        registros: List[Dict[str, Any]] = []
+
+        actuales = serializar_trenes(trenes)
+        for nombre, datos in actuales.items():
+            if self._trenes.get(nombre) != datos:
+                registros.append({"tipo": TREN, "nombre": nombre, "datos": datos})
+        for nombre in self._trenes.keys() - actuales.keys():
+            registros.append({"tipo": TREN_QUITADO, "nombre": nombre})
+
+        for nombre in self._estaciones.keys() - estaciones.keys():
+            registros.append({"tipo": ESTACION_QUITADA, "nombre": nombre})
+        for nombre, estacion in estaciones.items():
+            anterior = self._estaciones.get(nombre)
+            if anterior is None or anterior[0] is not estacion:
+                # Estación nueva o reemplazada: se guarda completa
+                datos = serializar_estaciones({nombre: estacion})[nombre]
+                registros.append({"tipo": ESTACION, "nombre": nombre, "datos": datos})
+                continue
+
+            _, x, y, movimientos = anterior
+            if (x, y) != (estacion.coordenada_x, estacion.coordenada_y):
+                registros.append({
+                    "tipo": ESTACION_MOVIDA, "nombre": nombre,
+                    "coord_x": estacion.coordenada_x, "coord_y": estacion.coordenada_y
+                })
+            registros.extend(self._registros_pasajeros(estacion, movimientos))
+
+        actuales_rutas = Counter(serializar_rutas(rutas))
+        if actuales_rutas != self._rutas:
+            registros.append({
+                "tipo": RUTAS,
+                "agregadas": list((actuales_rutas - self._rutas).elements()),
+                "quitadas": list((self._rutas - actuales_rutas).elements())
+            })
+        return registros
+
+    @staticmethod
+    def _registros_pasajeros(estacion, anteriores: Dict[str, Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """
+        Registro de los pasajeros que salieron y llegaron a la estación.
+
+        Las colas son FIFO por destino: las salidas siempre son las más
+        antiguas y las llegadas se añaden al final. Con las salidas
+        acumuladas y el largo de cada cola basta para saber cuántas entradas
+        quitar del principio de cada cola y cuáles anexar al final.
+        """
+        salen: Dict[str, int] = {}
+        nuevos: Dict[str, int] = {}
+        for destino, (salidas, espera) in estacion.movimientos().items():
+            salidas_antes, espera_antes = anteriores.get(destino, (0, 0))
+            if (salidas, espera) == (salidas_antes, espera_antes):
+                continue
+
+            if salidas > salidas_antes and espera_antes:
+                salen[destino] = min(salidas - salidas_antes, espera_antes)
+            # Las llegadas que ya salieron no se registran
+            llegan = min((salidas + espera) - (salidas_antes + espera_antes), espera)
+            if llegan > 0:
+                nuevos[destino] = llegan
+
+        if not salen and not nuevos:
+            return []
+        return [{
+            "tipo": PASAJEROS,
+            "estacion": estacion.nombre,
+            "salen": salen,
+            "llegan": [d for d in map(serializar_pasajero, estacion.ultimos_esperando(nuevos)) if d]
+        }]
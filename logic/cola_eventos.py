@@ -0,0 +1,93 @@
+"""
+Cola de eventos para la simulación por eventos discretos.
+En vez de avanzar el reloj segundo a segundo, la simulación salta
+directamente al siguiente evento programado.
+"""
+
+import heapq
+import itertools
+import datetime as dt
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+
+# Tipos de evento reconocidos por el motor
+LLEGADA_PASAJERO = "llegada_pasajero"
+SALIDA_TREN = "salida_tren"
+LLEGADA_TREN = "llegada_tren"
+EVENTO = "evento"
+
+TIPOS_EVENTO = (LLEGADA_PASAJERO, SALIDA_TREN, LLEGADA_TREN, EVENTO)
+
+
+@dataclass(order=True)
+class EventoProgramado:
+    """
+    Evento con marca de tiempo dentro de la cola de simulación.
+
+    Attributes:
+        tiempo: Momento en que ocurre el evento
+        secuencia: Orden de inserción (desempata eventos simultáneos)
+        tipo: Uno de TIPOS_EVENTO
+        datos: Información asociada (pasajero, tren, Evento, etc.)
+        flujo: Flujo del que proviene el evento (None si se programó directo)
+    """
+    tiempo: dt.datetime
+    secuencia: int
+    tipo: str = field(compare=False)
+    datos: Any = field(default=None, compare=False)
+    flujo: Any = field(default=None, compare=False, repr=False)
+
+
+class ColaEventos:
+    """
+    Cola de prioridad (heap) de eventos ordenados por tiempo.
+
+    Insertar y extraer cuestan O(log n), por lo que el costo de simular
+    depende del número de eventos y no de los segundos simulados.
+    Los eventos simultáneos se procesan en orden de inserción.
+    """
+
+    def __init__(self):
+        self._heap: List[EventoProgramado] = []
+        self._contador = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def programar(self, tiempo: dt.datetime, tipo: str, datos: Any = None) -> EventoProgramado:
+        """
+        Añade un evento a la cola.
+
+        Args:
+            tiempo: Momento en que ocurre el evento
+            tipo: Tipo de evento (ver TIPOS_EVENTO)
+            datos: Información asociada al evento
+
+        Returns:
+            El EventoProgramado creado
+
+        Raises:
+            ValueError: Si el tipo de evento no es reconocido
+        """
+        if tipo not in TIPOS_EVENTO:
+            raise ValueError(f"Tipo de evento no reconocido: '{tipo}'")
+
+        evento = EventoProgramado(tiempo, next(self._contador), tipo, datos)
+        heapq.heappush(self._heap, evento)
+        return evento
+
+    def siguiente(self) -> EventoProgramado:
+        """Extrae el próximo evento. Lanza IndexError si la cola está vacía."""
+        return heapq.heappop(self._heap)
+
+    def ver_siguiente(self) -> Optional[EventoProgramado]:
+        """Retorna el próximo evento sin extraerlo (None si la cola está vacía)."""
+        return self._heap[0] if self._heap else None
+
+    def limpiar(self):
+        """Elimina todos los eventos pendientes."""
+        self._heap.clear()
@@ -0,0 +1,107 @@
+"""
+Compresión de archivos de guardado con la biblioteca estándar.
+Los guardados grandes repiten nombres de estaciones y fechas, así que se
+comprimen bien. Al leer, el códec se detecta por los primeros bytes del
+archivo (no por la extensión), por lo que cargar un guardado comprimido no
+requiere indicar nada.
+"""
+
+import bz2
+import gzip
+import lzma
+import zlib
+from typing import BinaryIO, Optional
+
+
+# Códecs disponibles: nombre -> (firma al inicio del archivo, extensión)
+CODECS = {
+    "gzip": (b"\x1f\x8b", ".gz"),
+    "bz2": (b"BZh", ".bz2"),
+    "lzma": (b"\xfd7zXZ\x00", ".xz")
+}
+NIVEL_GZIP = 6      # el nivel 9 por defecto de gzip tarda más y casi no reduce el tamaño
+PRESET_LZMA = 6
+
+# Errores de un archivo comprimido dañado o cortado: gzip y bz2 informan
+# datos inválidos con OSError y un flujo incompleto con EOFError
+ERRORES_DESCOMPRESION = (EOFError, OSError, lzma.LZMAError, zlib.error)
+
+_LARGO_FIRMA = max(len(firma) for firma, _ in CODECS.values())
+
+
+def validar_compresion(compresion: Optional[str]):
+    """
+    Raises:
+        ValueError: Si el códec no es None ni uno de CODECS
+    """
+    if compresion is not None and compresion not in CODECS:
+        raise ValueError(
+            f"Compresión desconocida '{compresion}' (opciones: {', '.join(CODECS)})"
+        )
+
+
+def compresion_de_nombre(nombre_archivo: str) -> Optional[str]:
+    """Códec indicado por la extensión del archivo (None si no tiene una de CODECS)."""
+    for compresion, (_, extension) in CODECS.items():
+        if nombre_archivo.endswith(extension):
+            return compresion
+    return None
+
+
+def quitar_extension_compresion(nombre_archivo: str) -> str:
+    """Nombre sin la extensión de compresión ("x.json.gz" -> "x.json")."""
+    compresion = compresion_de_nombre(nombre_archivo)
+    if compresion is None:
+        return nombre_archivo
+    return nombre_archivo[:-len(CODECS[compresion][1])]
+
+
+def detectar_compresion(archivo: BinaryIO) -> Optional[str]:
+    """
+    Detecta el códec por la firma al inicio del archivo.
+    El archivo debe admitir seek; queda en la posición inicial.
+
+    Returns:
+        Nombre del códec o None si el archivo no está comprimido
+    """
+    inicio = archivo.read(_LARGO_FIRMA)
+    archivo.seek(0)
+    for compresion, (firma, _) in CODECS.items():
+        if inicio.startswith(firma):
+            return compresion
+    return None
+
+
+def abrir_lectura(archivo: BinaryIO) -> BinaryIO:
+    """
+    Envuelve un archivo abierto en modo binario para leerlo descomprimido.
+    Si no está comprimido se retorna el mismo archivo.
+    """
+    compresion = detectar_compresion(archivo)
+    if compresion == "gzip":
+        return gzip.GzipFile(fileobj=archivo, mode='rb')
+    if compresion == "bz2":
+        return bz2.BZ2File(archivo, 'rb')
+    if compresion == "lzma":
+        return lzma.LZMAFile(archivo, 'rb')
+    return archivo
+
+
+def envolver_escritura(archivo: BinaryIO, compresion: str) -> BinaryIO:
+    """
+    Envuelve un archivo abierto en modo binario para escribir comprimido.
+    Al cerrar el envoltorio se escribe el final del flujo comprimido; el
+    archivo original queda abierto.
+
+    Raises:
+        ValueError: Si el códec no es uno de CODECS
+    """
+    validar_compresion(compresion)
+    if compresion == "gzip":
+        # Sin nombre ni fecha en el encabezado: el mismo contenido produce el mismo archivo
+        return gzip.GzipFile(
+            filename='', fileobj=archivo, mode='wb', compresslevel=NIVEL_GZIP, mtime=0
+        )
+    if compresion == "bz2":
+        return bz2.BZ2File(archivo, 'wb')
+    return lzma.LZMAFile(archivo, 'wb', preset=PRESET_LZMA)
@@ -0,0 +1,207 @@
+"""
+Motor de rutas más cortas sobre la red de Ruta del simulador.
+Construye la adyacencia a partir de simulador.rutas, ejecuta Dijkstra por
+distancia o por tiempo de viaje y memoriza los resultados por origen.
+
+La caché se invalida sola cuando cambia la red: los módulos de
+configuración llaman a notificar_cambio_red y, además, se detecta si las
+listas de rutas o estaciones fueron reemplazadas o cambiaron de tamaño.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Ventana import SimuladorTrenes
+    from models.clases import Tren
+
+
+# Criterios de costo disponibles
+CRITERIO_DISTANCIA = "distancia"
+CRITERIO_TIEMPO = "tiempo"
+
+# Minutos detenido en cada estación intermedia (solo para el criterio tiempo)
+TIEMPO_DETENCION_MIN = 5
+
+
+def notificar_cambio_red(simulador: 'SimuladorTrenes'):
+    """
+    Marca que cambiaron las rutas o estaciones del simulador.
+    Toda caché que dependa de la red se reconstruye en la próxima consulta.
+
+    Args:
+        simulador: Instancia del SimuladorTrenes (o cualquier objeto con
+            atributos rutas y estaciones)
+    """
+    simulador.version_red = getattr(simulador, "version_red", 0) + 1
+
+
+def firma_red(simulador: 'SimuladorTrenes') -> tuple:
+    """
+    Firma O(1) del estado de la red, usada para invalidar cachés.
+    Combina la versión notificada con la identidad y el tamaño de las listas.
+    """
+    return (
+        getattr(simulador, "version_red", 0),
+        id(simulador.rutas), len(simulador.rutas),
+        id(simulador.estaciones), len(simulador.estaciones)
+    )
+
+
+class Enrutador:
+    """
+    Calcula caminos más cortos entre estaciones con caché por origen.
+
+    Las rutas se consideran bidireccionales, igual que en los módulos de
+    configuración. Cada consulta desde un origen nuevo ejecuta Dijkstra una
+    vez (O((V + E) log V)); las consultas siguientes desde ese origen solo
+    reconstruyen el camino.
+
+    Attributes:
+        simulador: Objeto con los atributos rutas y estaciones
+    """
+
+    def __init__(self, simulador: 'SimuladorTrenes'):
+        self.simulador = simulador
+        self._firma: Optional[tuple] = None
+        self._adyacencia: Dict[str, List[Tuple[str, float]]] = {}
+        self._cache: Dict[tuple, Tuple[Dict[str, float], Dict[str, str]]] = {}
+        self._alcanzables: Dict[str, Tuple[str, ...]] = {}
+
+    def invalidar(self):
+        """Descarta la adyacencia y todos los caminos memorizados."""
+        self._firma = None
+        self._adyacencia = {}
+        self._cache.clear()
+        self._alcanzables.clear()
+
+    def _asegurar_vigente(self):
+        """Reconstruye la adyacencia si la red cambió desde la última consulta."""
+        firma = firma_red(self.simulador)
+        if firma == self._firma:
+            return
+
+        self.invalidar()
+        adyacencia = {nombre: [] for nombre in self.simulador.estaciones}
+        for ruta in self.simulador.rutas:
+            if ruta.origen in adyacencia and ruta.destino in adyacencia:
+                adyacencia[ruta.origen].append((ruta.destino, ruta.distancia_km))
+                adyacencia[ruta.destino].append((ruta.origen, ruta.distancia_km))
+
+        self._adyacencia = adyacencia
+        self._firma = firma
+
+    def vecinos(self, estacion: str) -> List[Tuple[str, float]]:
+        """Retorna [(vecino, distancia_km), ...] de una estación."""
+        self._asegurar_vigente()
+        return list(self._adyacencia.get(estacion, []))
+
+    def _costo_arista(self, criterio: str, velocidad: Optional[float]) -> Tuple[float, float]:
+        """Retorna (factor por km, costo fijo por tramo) según el criterio."""
+        if criterio == CRITERIO_DISTANCIA:
+            return 1.0, 0.0
+        if criterio == CRITERIO_TIEMPO:
+            if not velocidad or velocidad <= 0:
+                raise ValueError("El criterio tiempo requiere una velocidad mayor a 0")
+            # Minutos de viaje más la detención en la estación de llegada
+            return 60.0 / velocidad, TIEMPO_DETENCION_MIN
+        raise ValueError(f"Criterio no reconocido: '{criterio}'")
+
+    def _dijkstra(self, origen: str, criterio: str, velocidad: Optional[float]):
+        """Ejecuta Dijkstra desde un origen, usando la caché si existe."""
+        self._asegurar_vigente()
+        clave = (origen, criterio, velocidad if criterio == CRITERIO_TIEMPO else None)
+        resultado = self._cache.get(clave)
+        if resultado is not None:
+            return resultado
+
+        factor, fijo = self._costo_arista(criterio, velocidad)
+        costos: Dict[str, float] = {origen: 0.0}
+        previos: Dict[str, str] = {}
+        visitados = set()
+        heap = [(0.0, origen)]
+
+        while heap:
+            costo, actual = heapq.heappop(heap)
+            if actual in visitados:
+                continue
+            visitados.add(actual)
+
+            for vecino, distancia in self._adyacencia.get(actual, ()):
+                nuevo = costo + distancia * factor + fijo
+                if nuevo < costos.get(vecino, float('inf')):
+                    costos[vecino] = nuevo
+                    previos[vecino] = actual
+                    heapq.heappush(heap, (nuevo, vecino))
+
+        # La detención en el destino final no forma parte del viaje
+        if fijo:
+            costos = {nombre: c - fijo if nombre != origen else 0.0 for nombre, c in costos.items()}
+
+        resultado = (costos, previos)
+        self._cache[clave] = resultado
+        return resultado
+
+    def camino_mas_corto(
+        self,
+        origen: str,
+        destino: str,
+        criterio: str = CRITERIO_DISTANCIA,
+        tren: Optional['Tren'] = None
+    ) -> Optional[Tuple[List[str], float]]:
+        """
+        Calcula el camino más corto entre dos estaciones.
+
+        Args:
+            origen: Estación de origen
+            destino: Estación de destino
+            criterio: CRITERIO_DISTANCIA (km) o CRITERIO_TIEMPO (minutos)
+            tren: Tren cuya velocidad_max se usa con el criterio tiempo
+
+        Returns:
+            Tupla (lista de estaciones, costo total) o None si no hay camino
+        """
+        velocidad = tren.velocidad_max if tren is not None else None
+        costos, previos = self._dijkstra(origen, criterio, velocidad)
+
+        if destino not in costos:
+            return None
+
+        camino = [destino]
+        while camino[-1] != origen:
+            camino.append(previos[camino[-1]])
+        camino.reverse()
+
+        return camino, costos[destino]
+
+    def distancia(self, origen: str, destino: str) -> Optional[float]:
+        """Distancia en km del camino más corto, None si no hay camino."""
+        costos, _ = self._dijkstra(origen, CRITERIO_DISTANCIA, None)
+        return costos.get(destino)
+
+    def siguiente_estacion(self, origen: str, destino: str, criterio: str = CRITERIO_DISTANCIA,
+                           tren: Optional['Tren'] = None) -> Optional[str]:
+        """Primera estación del camino más corto hacia el destino (None si no hay)."""
+        resultado = self.camino_mas_corto(origen, destino, criterio, tren)
+        if resultado is None or len(resultado[0]) < 2:
+            return None
+        return resultado[0][1]
+
+    def destinos_alcanzables(self, origen: str) -> Tuple[str, ...]:
+        """Estaciones a las que hay camino desde el origen (sin él), en el orden de estaciones."""
+        alcanzables = self._alcanzables.get(origen)
+        if alcanzables is None or self._firma != firma_red(self.simulador):
+            costos, _ = self._dijkstra(origen, CRITERIO_DISTANCIA, None)
+            alcanzables = tuple(
+                nombre for nombre in self.simulador.estaciones if nombre != origen and nombre in costos
+            )
+            self._alcanzables[origen] = alcanzables
+        return alcanzables
+
+    def estadisticas_cache(self) -> Dict[str, Any]:
+        """Información de la caché (útil para depuración)."""
+        return {
+            "origenes_en_cache": len(self._cache),
+            "estaciones": len(self._adyacencia),
+            "vigente": self._firma == firma_red(self.simulador)
+        }
@@ -1,37 +1,138 @@
 from datetime import datetime, timedelta, time
 from models.clases import *
+from logic.cola_eventos import ColaEventos, EventoProgramado, EVENTO, LLEGADA_PASAJERO
+from operator import attrgetter
 import random;
 
+HORA_APERTURA = time(7, 0, 0)
+HORA_CIERRE = time(20, 0, 0)
+_FIN_FLUJO = object()
+
 class EstadoSimulacion:
     def __init__(self, fecha_inicio_str= "2015-01-01 07:00:00", semilla=random.randint(0, 10000)):
         #inicio en donde si no hay una fecha dada, se inicia en 1 de enero de 2015 a las 7:00 am
         #y poder generar una semilla para poder en un futuro obtener los mismos resultados
         self.fecha_inicio = datetime.strptime(fecha_inicio_str, "%Y-%m-%d %H:%M:%S")
-        self.fecha_actual = self.fecha_inicio 
+        self.fecha_actual = self.fecha_inicio
         # Revisar si es correcto la fecha obtenida
+        self.semilla = semilla
         random.seed(semilla)
 
         self.historial_eventos = []
         self.historial_elecciones = []
 
+        # Motor de eventos discretos: el reloj salta de evento en evento
+        self.cola_eventos = ColaEventos()
+        self.manejadores = {}
+        # Eventos disparados que esperan una eleccion (ver resolver_evento_pendiente)
+        self.eventos_pendientes = []
+        self.eventos_procesados = 0
+        self.registrar_manejador(EVENTO, self._manejar_evento)
+
         #self.trenes =
         #self.estaciones =
 
     def tiempo_actual(self):
         # Actualiza la hora y fecha actual en formato legible.
-        hora = self.tiempo_actual.strftime("%H:%M:%S")
-        fecha = self.tiempo_actual.strftime("%d/%m/%Y")
+        hora = self.fecha_actual.strftime("%H:%M:%S")
+        fecha = self.fecha_actual.strftime("%d/%m/%Y")
         return hora, fecha
-    
+
     def avance_de_tiempo(self, segundos=1):
         #avance de tiempo en 1 segundo y si pasa de las 8 pm, actualizar la fecha al dia siguiente
-        self.tiempo_actual += timedelta(seconds=segundos)
-        
-        if self.tiempo_actual.hour >= 20:
-            nueva_fecha = self.tiempo_actual.date() + timedelta(days=1)
-            self.tiempo_actual = datetime.combine(nueva_fecha, time(7, 0, 0))
-        
-        return self.tiempo_actual
+        self.fecha_actual = self._ajustar_a_horario(self.fecha_actual + timedelta(seconds=segundos))
+        return self.fecha_actual
+
+    @staticmethod
+    def _ajustar_a_horario(momento):
+        # Si el momento cae fuera del horario de servicio, se mueve a la siguiente apertura
+        if momento.time() >= HORA_CIERRE:
+            nueva_fecha = momento.date() + timedelta(days=1)
+            return datetime.combine(nueva_fecha, HORA_APERTURA)
+        if momento.time() < HORA_APERTURA:
+            return datetime.combine(momento.date(), HORA_APERTURA)
+        return momento
+
+    # ========== MOTOR DE EVENTOS DISCRETOS ==========
+
+    def registrar_manejador(self, tipo, manejador):
+        # manejador(estado, evento_programado) se llama cada vez que se procesa un evento del tipo
+        self.manejadores[tipo] = manejador
+
+    def programar_evento(self, tiempo, tipo, datos=None):
+        # Los eventos fuera del horario de servicio se postergan hasta la siguiente apertura
+        tiempo = self._ajustar_a_horario(max(tiempo, self.fecha_actual))
+        return self.cola_eventos.programar(tiempo, tipo, datos)
+
+    def programar_en(self, segundos, tipo, datos=None):
+        # Programa un evento relativo al reloj actual
+        return self.programar_evento(self.fecha_actual + timedelta(seconds=segundos), tipo, datos)
+
+    def programar_flujo(self, flujo, tipo=LLEGADA_PASAJERO, obtener_tiempo=attrgetter("fecha")):
+        # Programa los elementos de un iterador ordenado por tiempo (ej: Generador.iterar_clientes)
+        # de a uno: el siguiente se extrae recien al procesar el anterior, asi la cola no crece
+        self._programar_siguiente_del_flujo((iter(flujo), tipo, obtener_tiempo))
+
+    def _programar_siguiente_del_flujo(self, flujo):
+        iterador, tipo, obtener_tiempo = flujo
+        elemento = next(iterador, _FIN_FLUJO)
+        if elemento is _FIN_FLUJO:
+            return
+        evento = self.programar_evento(obtener_tiempo(elemento), tipo, elemento)
+        evento.flujo = flujo
+
+    def procesar_siguiente_evento(self):
+        # Salta el reloj al siguiente evento y lo procesa. Retorna el evento o None si no hay
+        if not self.cola_eventos:
+            return None
+
+        evento = self.cola_eventos.siguiente()
+        self.fecha_actual = evento.tiempo
+
+        manejador = self.manejadores.get(evento.tipo)
+        if manejador:
+            manejador(self, evento)
+
+        if evento.flujo is not None:
+            self._programar_siguiente_del_flujo(evento.flujo)
+
+        self.eventos_procesados += 1
+        return evento
+
+    def ejecutar_hasta(self, fecha_fin):
+        # Procesa todos los eventos anteriores o iguales a fecha_fin.
+        # El costo depende de la cantidad de eventos, no de los segundos simulados.
+        procesados = 0
+        while self.cola_eventos and self.cola_eventos.ver_siguiente().tiempo <= fecha_fin:
+            self.procesar_siguiente_evento()
+            procesados += 1
+
+        if fecha_fin > self.fecha_actual:
+            self.fecha_actual = self._ajustar_a_horario(fecha_fin)
+        return procesados
+
+    def ejecutar_dias(self, dias=1):
+        # Simula la cantidad de dias de servicio indicada a partir del reloj actual
+        fecha_fin = datetime.combine(self.fecha_actual.date() + timedelta(days=dias - 1), HORA_CIERRE)
+        return self.ejecutar_hasta(fecha_fin)
+
+    def _manejar_evento(self, estado, evento_programado: EventoProgramado):
+        # Los datos pueden ser un Evento ya creado o una funcion que lo crea (ej: crear_evento_niebla)
+        evento = evento_programado.datos
+        if callable(evento):
+            evento = evento(self)
+        if evento is not None:
+            self.eventos_pendientes.append(evento)
+
+    def resolver_evento_pendiente(self, numero_opcion=1):
+        # Aplica una opcion al evento pendiente mas antiguo; ejecutar_efecto lo registra
+        # en historial_eventos e historial_elecciones. Retorna el resultado del efecto o None
+        if not self.eventos_pendientes:
+            return None
+
+        evento = self.eventos_pendientes.pop(0)
+        opcion_elegida = evento.opcion1 if numero_opcion == 1 else evento.opcion2
+        return opcion_elegida.ejecutar_efecto(self, evento.nombre)
 
     def generador_eventos(self):
         # Generador de eventos aleatorios en la simulacion
@@ -40,4 +141,4 @@ class EstadoSimulacion:
             #nombre de eventos con sus caracteristicas(self)
         ]
         evento = random.choice(eventos)
-        return evento
\ No newline at end of file
+        return evento
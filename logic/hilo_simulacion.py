@@ -0,0 +1,185 @@
+"""
+Ejecución de la simulación en un hilo aparte.
+El hilo avanza el motor tan rápido como puede y publica solo los cambios
+de estado (deltas) en una cola acotada. La interfaz vacía la cola con un
+temporizador after() y combina los deltas pendientes en uno solo, de modo
+que mainloop() nunca se bloquea.
+
+No importa tkinter: el lado de la interfaz solo necesita llamar a
+obtener_delta() periódicamente desde el hilo principal.
+"""
+
+import datetime as dt
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from logic.estado_simulacion import HORA_CIERRE
+from logic.simulacion_sin_interfaz import SimulacionSinInterfaz
+
+
+# Constantes de configuración
+PASO_SEGUNDOS = 300        # segundos simulados por paso del hilo
+CAPACIDAD_COLA = 8         # deltas que caben en la cola antes de combinarse en el hilo
+FPS_MAXIMO = 30            # refrescos por segundo de la interfaz como máximo
+
+
+def combinar_deltas(anterior: Optional[Dict[str, Any]], nuevo: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combina dos deltas consecutivos en uno que lleva del estado previo a
+    `anterior` directamente al estado posterior a `nuevo`.
+
+    Args:
+        anterior: Delta más antiguo (None si no hay)
+        nuevo: Delta más reciente
+
+    Returns:
+        Delta combinado
+    """
+    if anterior is None:
+        return nuevo
+
+    combinado = dict(nuevo)
+    combinado["estaciones"] = {**anterior["estaciones"], **nuevo["estaciones"]}
+    combinado["trenes"] = {**anterior["trenes"], **nuevo["trenes"]}
+    combinado["terminada"] = anterior["terminada"] or nuevo["terminada"]
+    return combinado
+
+
+class HiloSimulacion(threading.Thread):
+    """
+    Hilo que ejecuta una SimulacionSinInterfaz por pasos.
+
+    El hilo es dueño exclusivo de la simulación: la interfaz no debe leer
+    sus objetos mientras corre, solo los deltas de la cola. Si la cola está
+    llena, el hilo no espera: acumula el delta y lo combina con el
+    siguiente, así la memoria queda acotada y el motor no se frena.
+
+    Cada delta es un diccionario con:
+        fecha: Reloj de la simulación (ISO 8601)
+        metricas: Resultado de SimulacionSinInterfaz.metricas()
+        estaciones: {nombre: pasajeros esperando} de las que cambiaron
+        trenes: {nombre: (ubicación, pasajeros a bordo, tramo)} de los que
+            cambiaron, con tramo = (origen, destino, salida, llegada) en segundos
+        terminada: True en el último delta
+    """
+
+    def __init__(
+        self,
+        simulacion: SimulacionSinInterfaz,
+        dias: int = 1,
+        paso_segundos: float = PASO_SEGUNDOS,
+        capacidad_cola: int = CAPACIDAD_COLA,
+        segundos_por_segundo: Optional[float] = None
+    ):
+        super().__init__(name="HiloSimulacion", daemon=True)
+        if dias < 1:
+            raise ValueError("La cantidad de días debe ser mayor a 0")
+
+        self.simulacion = simulacion
+        self.paso_segundos = paso_segundos
+        # Segundos simulados por segundo real (None: tan rápido como se pueda)
+        self.segundos_por_segundo = segundos_por_segundo
+        self.cola: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=capacidad_cola)
+
+        inicio = simulacion.estado.fecha_actual
+        self.fecha_fin = dt.datetime.combine(inicio.date() + dt.timedelta(days=dias - 1), HORA_CIERRE)
+
+        self._detener = threading.Event()
+        self._en_marcha = threading.Event()
+        self._en_marcha.set()
+        self._ultimo: Dict[str, Dict[str, Any]] = {"estaciones": {}, "trenes": {}}
+        self._pendiente: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+    # ========== CONTROL (desde cualquier hilo) ==========
+
+    def detener(self):
+        """Pide al hilo que termine después del paso en curso."""
+        self._detener.set()
+        self._en_marcha.set()
+
+    def pausar(self):
+        self._en_marcha.clear()
+
+    def reanudar(self):
+        self._en_marcha.set()
+
+    @property
+    def pausado(self) -> bool:
+        return not self._en_marcha.is_set()
+
+    # ========== HILO DE SIMULACIÓN ==========
+
+    def run(self):
+        try:
+            while not self._detener.is_set() and self.simulacion.estado.fecha_actual < self.fecha_fin:
+                self._en_marcha.wait()
+                if self._detener.is_set():
+                    break
+                inicio = time.monotonic()
+                self.simulacion.avanzar(self.paso_segundos)
+                self._publicar(self._calcular_delta(terminada=False))
+                if self.segundos_por_segundo:
+                    # Ritmo fijo (ej: para animar): se espera lo que falte del paso
+                    restante = self.paso_segundos / self.segundos_por_segundo - (time.monotonic() - inicio)
+                    if restante > 0:
+                        self._detener.wait(restante)
+        except Exception as e:  # El error se informa a la interfaz en el último delta
+            self.error = e
+        finally:
+            # El último delta lleva el estado completo, así no depende de los descartados
+            self._ultimo = {"estaciones": {}, "trenes": {}}
+            self._pendiente = None
+            self._publicar(self._calcular_delta(terminada=True), final=True)
+
+    def _calcular_delta(self, terminada: bool) -> Dict[str, Any]:
+        """Compara la instantánea actual con la última publicada."""
+        instantanea = self.simulacion.instantanea()
+        delta = {
+            "fecha": instantanea["fecha"],
+            "metricas": instantanea["metricas"],
+            "estaciones": {
+                nombre: valor for nombre, valor in instantanea["estaciones"].items()
+                if self._ultimo["estaciones"].get(nombre) != valor
+            },
+            "trenes": {
+                nombre: valor for nombre, valor in instantanea["trenes"].items()
+                if self._ultimo["trenes"].get(nombre) != valor
+            },
+            "terminada": terminada
+        }
+        self._ultimo = instantanea
+        return delta
+
+    def _publicar(self, delta: Dict[str, Any], final: bool = False):
+        """Encola el delta sin bloquear; si la cola está llena lo acumula."""
+        self._pendiente = combinar_deltas(self._pendiente, delta)
+        while True:
+            try:
+                self.cola.put_nowait(self._pendiente)
+                self._pendiente = None
+                return
+            except queue.Full:
+                if not final:
+                    return
+                # El último delta siempre debe llegar: se hace espacio descartando el más antiguo
+                try:
+                    self.cola.get_nowait()
+                except queue.Empty:
+                    pass
+
+    # ========== LADO DE LA INTERFAZ ==========
+
+    def obtener_delta(self) -> Optional[Dict[str, Any]]:
+        """
+        Vacía la cola y retorna todos los deltas combinados en uno.
+        Se llama desde el hilo de la interfaz; retorna None si no hay cambios.
+        """
+        combinado = None
+        while True:
+            try:
+                combinado = combinar_deltas(combinado, self.cola.get_nowait())
+            except queue.Empty:
+                return combinado
@@ -0,0 +1,238 @@
+"""
+Lectura incremental de archivos de guardado JSON.
+json.load necesita el texto completo en memoria antes de empezar a construir
+objetos. Este lector avanza por el archivo en bloques, recorre la estructura
+de objetos y arreglos con un tokenizador propio y decodifica cada valor
+pequeño (un tren, un pasajero) con json.JSONDecoder.raw_decode. Así los
+pasajeros en espera pueden entregarse por lotes a medida que se leen.
+
+Los archivos comprimidos (gzip, bz2, lzma) se descomprimen al vuelo.
+
+Solo usa la biblioteca estándar.
+"""
+
+import codecs
+import json
+import os
+import re
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+from logic.compresion import abrir_lectura
+
+
+# Constantes de configuración
+TAMANO_BLOQUE = 1 << 20     # bytes leídos del archivo en cada bloque
+TAMANO_LOTE = 10_000        # pasajeros entregados por lote
+
+_ESPACIOS = re.compile(r'[ \t\n\r]*')
+# Resto del buffer que aún puede ser parte de un número cortado
+_COLA_NUMERO = re.compile(r'[0-9+\-.eE]*\Z')
+
+Progreso = Callable[[int, int], None]
+
+
+class LectorJSON:
+    """
+    Tokenizador incremental sobre un archivo JSON abierto en modo binario.
+
+    Los métodos claves() y elementos() recorren un objeto o un arreglo sin
+    decodificarlo completo; después de cada clave o elemento quien llama
+    debe consumir el valor con valor(), claves() o elementos().
+
+    Attributes:
+        bytes_leidos: Bytes leídos del archivo hasta ahora
+        total_bytes: Tamaño del archivo (0 si no se conoce)
+    """
+
+    def __init__(
+        self,
+        archivo: BinaryIO,
+        total_bytes: int = 0,
+        progreso: Optional[Progreso] = None,
+        tamano_bloque: int = TAMANO_BLOQUE
+    ):
+        self._archivo = archivo
+        self._decodificador_utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decodificador = json.JSONDecoder()
+        self._progreso = progreso
+        self._tamano_bloque = tamano_bloque
+        self._buffer = ""
+        self._pos = 0
+        self._fin_archivo = False
+        self.bytes_leidos = 0
+        self.total_bytes = total_bytes
+
+    # ========== BUFFER ==========
+
+    def _leer_bloque(self, minimo: int = 0) -> bool:
+        """Agrega un bloque al buffer descartando lo ya consumido. False si no había más."""
+        if self._fin_archivo:
+            return False
+
+        datos = self._archivo.read(max(self._tamano_bloque, minimo))
+        self.bytes_leidos += len(datos)
+        texto = self._decodificador_utf8.decode(datos, final=not datos)
+        if not datos:
+            self._fin_archivo = True
+
+        self._buffer = self._buffer[self._pos:] + texto
+        self._pos = 0
+        if self._progreso is not None:
+            self._progreso(self.bytes_leidos, self.total_bytes)
+        return bool(datos) or bool(texto)
+
+    def _error(self, mensaje: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(mensaje, self._buffer, self._pos)
+
+    def caracter(self) -> str:
+        """Siguiente carácter significativo sin consumirlo ('' al final del archivo)."""
+        while True:
+            self._pos = _ESPACIOS.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._leer_bloque():
+                return ""
+
+    def _consumir(self, esperado: str):
+        if self.caracter() != esperado:
+            raise self._error(f"Se esperaba '{esperado}'")
+        self._pos += 1
+
+    # ========== VALORES ==========
+
+    def valor(self) -> Any:
+        """Decodifica el siguiente valor completo (objeto, arreglo, texto, número...)."""
+        if not self.caracter():
+            raise self._error("Fin de archivo inesperado")
+
+        while True:
+            try:
+                resultado, fin = self._decodificador.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # El valor puede estar cortado al final del buffer
+                if not self._leer_bloque(len(self._buffer)):
+                    raise
+                continue
+
+            # Un número cortado por el fin del buffer ("-0." o "12") se decodifica
+            # como uno más corto: si lo que sigue aún puede ser parte del número,
+            # se lee más antes de aceptarlo. La expresión se detiene en el primer
+            # carácter que no es de número, sin copiar el resto del buffer
+            if (
+                not self._fin_archivo
+                and isinstance(resultado, (int, float)) and not isinstance(resultado, bool)
+                and _COLA_NUMERO.match(self._buffer, fin)
+            ):
+                self._leer_bloque(len(self._buffer))
+                continue
+
+            self._pos = fin
+            return resultado
+
+    def claves(self) -> Iterator[str]:
+        """Recorre las claves de un objeto; el valor de cada una queda por consumir."""
+        self._consumir('{')
+        if self.caracter() == '}':
+            self._pos += 1
+            return
+
+        while True:
+            clave = self.valor()
+            if not isinstance(clave, str):
+                raise self._error("Las claves de un objeto deben ser texto")
+            self._consumir(':')
+            yield clave
+
+            siguiente = self.caracter()
+            self._pos += 1
+            if siguiente == '}':
+                return
+            if siguiente != ',':
+                self._pos -= 1
+                raise self._error("Se esperaba ',' o '}'")
+
+    def elementos(self) -> Iterator[int]:
+        """Recorre un arreglo; cada elemento queda por consumir. Entrega su índice."""
+        self._consumir('[')
+        if self.caracter() == ']':
+            self._pos += 1
+            return
+
+        indice = 0
+        while True:
+            yield indice
+            indice += 1
+
+            siguiente = self.caracter()
+            self._pos += 1
+            if siguiente == ']':
+                return
+            if siguiente != ',':
+                self._pos -= 1
+                raise self._error("Se esperaba ',' o ']'")
+
+    def verificar_fin(self):
+        """Comprueba que no quede contenido después del valor principal."""
+        if self.caracter():
+            raise self._error("Contenido adicional después del objeto principal")
+
+
+def leer_guardado(
+    ruta_archivo: str,
+    tamano_lote: int = TAMANO_LOTE,
+    progreso: Optional[Progreso] = None
+) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Recorre un archivo de guardado JSON entregando eventos a medida que lee.
+
+    Eventos (tipo, clave, valor):
+        ("campo", clave, valor): Clave del objeto principal. Para
+            "estaciones" el valor es {} y las estaciones llegan después
+        ("pasajeros", estacion, lote): Lista de hasta tamano_lote
+            diccionarios de pasajeros en espera de la estación (al menos
+            un lote por estación con la clave, aunque sea vacío)
+        ("estacion", estacion, specs): Resto de los datos de la estación
+            (sin pasajeros), al terminar de leerla
+
+    Args:
+        ruta_archivo: Archivo a leer
+        tamano_lote: Pasajeros por lote
+        progreso: Función llamada con (bytes leídos, bytes totales); en
+            archivos comprimidos cuenta los bytes comprimidos
+
+    Raises:
+        json.JSONDecodeError: Si el archivo no es JSON válido
+    """
+    with open(ruta_archivo, 'rb') as crudo, abrir_lectura(crudo) as f:
+        if progreso is not None and f is not crudo:
+            progreso_datos = progreso
+            progreso = lambda leidos, total: progreso_datos(crudo.tell(), total)
+        lector = LectorJSON(f, os.path.getsize(ruta_archivo), progreso)
+
+        for clave in lector.claves():
+            if clave != "estaciones" or lector.caracter() != '{':
+                yield "campo", clave, lector.valor()
+                continue
+
+            yield "campo", clave, {}
+            for nombre in lector.claves():
+                specs = {}
+                for campo in lector.claves():
+                    if campo != "pasajeros_esperando" or lector.caracter() != '[':
+                        specs[campo] = lector.valor()
+                        continue
+
+                    lote: List[Any] = []
+                    entregados = 0
+                    for _ in lector.elementos():
+                        lote.append(lector.valor())
+                        if len(lote) >= tamano_lote:
+                            yield "pasajeros", nombre, lote
+                            entregados += len(lote)
+                            lote = []
+                    if lote or not entregados:
+                        # Un arreglo vacío también se informa con un lote vacío
+                        yield "pasajeros", nombre, lote
+                yield "estacion", nombre, specs
+
+        lector.verificar_fin()
@@ -0,0 +1,291 @@
+"""
+Matrices precalculadas de distancias y tiempos de viaje entre todas las estaciones.
+La matriz de distancias (km por el camino más corto) se calcula con
+Floyd–Warshall vectorizado y la de tiempos de cada tren se deriva de ella
+con su velocidad_max, igual que Tren.calcular_tiempo_ruta (en horas).
+
+Las consultas por id de estación son O(1). Las matrices se invalidan por
+partes: un cambio de velocidad solo recalcula la matriz de ese tren, una
+ruta nueva o más corta se incorpora en O(V²) y solo quitar rutas o
+estaciones obliga a recalcular todo.
+
+NumPy es una dependencia opcional: solo se necesita si se usa este módulo.
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple, Any, TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy es opcional
+    np = None
+
+from logic.Guardado import DATA_FILE_PATH, _escribir_atomico
+from logic.enrutamiento import firma_red
+
+if TYPE_CHECKING:
+    from Ventana import SimuladorTrenes
+    from models.clases import Tren
+
+
+SUFIJO_MATRICES = ".matrices.npz"
+
+
+def ruta_archivo_matrices(ruta_archivo: Optional[str] = None) -> str:
+    """Retorna la ruta del archivo de matrices junto al archivo de guardado."""
+    base, _ = os.path.splitext(ruta_archivo or DATA_FILE_PATH)
+    return base + SUFIJO_MATRICES
+
+
+def _floyd_warshall(distancias):
+    """Cierra la matriz de adyacencia en distancias mínimas (in situ)."""
+    for k in range(len(distancias)):
+        np.minimum(distancias, distancias[:, k, None] + distancias[None, k, :], out=distancias)
+    return distancias
+
+
+class MatricesViaje:
+    """
+    Matrices all-pairs de distancia y tiempo de viaje por tipo de tren.
+
+    Las estaciones se numeran según el orden de simulador.estaciones y los
+    pares sin camino quedan en infinito.
+
+    Attributes:
+        simulador: Objeto con los atributos trenes, estaciones y rutas
+        nombres: Nombre de cada estación por id
+        indice: {nombre: id} de cada estación
+        distancias: Matriz V×V de km por el camino más corto
+    """
+
+    def __init__(self, simulador: 'SimuladorTrenes'):
+        if np is None:
+            raise ImportError("MatricesViaje requiere NumPy (pip install numpy)")
+
+        self.simulador = simulador
+        self.nombres: List[str] = []
+        self.indice: Dict[str, int] = {}
+        self.distancias = np.zeros((0, 0))
+        self._aristas: Dict[frozenset, float] = {}
+        self._firma: Optional[tuple] = None
+        self._tiempos: Dict[str, Tuple[float, Any]] = {}
+        self._firma_guardada: Optional[tuple] = None
+        self.recalculos_completos = 0
+
+    # ========== INVALIDACIÓN ==========
+
+    def _aristas_actuales(self) -> Dict[frozenset, float]:
+        """Distancia mínima de cada par de estaciones unidas por una ruta."""
+        aristas: Dict[frozenset, float] = {}
+        for ruta in self.simulador.rutas:
+            if ruta.origen not in self.indice or ruta.destino not in self.indice:
+                continue
+            par = frozenset((ruta.origen, ruta.destino))
+            if ruta.distancia_km < aristas.get(par, float('inf')):
+                aristas[par] = ruta.distancia_km
+        return aristas
+
+    def _recalcular(self):
+        """Reconstruye la matriz de distancias desde cero (O(V³))."""
+        self.nombres = list(self.simulador.estaciones)
+        self.indice = {nombre: i for i, nombre in enumerate(self.nombres)}
+        self._aristas = self._aristas_actuales()
+
+        distancias = np.full((len(self.nombres), len(self.nombres)), np.inf)
+        np.fill_diagonal(distancias, 0.0)
+        for par, km in self._aristas.items():
+            a, b = (self.indice[nombre] for nombre in par)
+            distancias[a, b] = distancias[b, a] = km
+
+        self.distancias = _floyd_warshall(distancias)
+        self._tiempos.clear()
+        self.recalculos_completos += 1
+
+    def _incorporar_arista(self, a: int, b: int, km: float):
+        """Actualiza las distancias con una ruta nueva o más corta en O(V²)."""
+        d = self.distancias
+        np.minimum(d, d[:, a, None] + km + d[None, b, :], out=d)
+        np.minimum(d, d[:, b, None] + km + d[None, a, :], out=d)
+
+    def _asegurar_vigente(self):
+        """Sincroniza la matriz de distancias con la red si esta cambió."""
+        firma = firma_red(self.simulador)
+        if firma == self._firma:
+            return
+        self._firma = firma
+
+        if list(self.simulador.estaciones) != self.nombres:
+            self._recalcular()
+            return
+
+        aristas = self._aristas_actuales()
+        if any(aristas.get(par, float('inf')) > km for par, km in self._aristas.items()):
+            # Se quitó o alargó una ruta: los caminos existentes pueden dejar de valer
+            self._recalcular()
+            return
+
+        cambiadas = [(par, km) for par, km in aristas.items() if km < self._aristas.get(par, float('inf'))]
+        for par, km in cambiadas:
+            a, b = (self.indice[nombre] for nombre in par)
+            self._incorporar_arista(a, b, km)
+        self._aristas = aristas
+        if cambiadas:
+            self._tiempos.clear()
+
+    def invalidar(self):
+        """Fuerza a recalcular todo en la próxima consulta."""
+        self._firma = None
+        self._firma_guardada = None
+        self.nombres = []
+
+    # ========== CONSULTAS ==========
+
+    def id_estacion(self, nombre: str) -> int:
+        """Id de una estación en las matrices. Lanza KeyError si no existe."""
+        self._asegurar_vigente()
+        return self.indice[nombre]
+
+    def matriz_tiempos(self, tren: 'Tren'):
+        """
+        Matriz V×V de horas de viaje para un tren.
+
+        Args:
+            tren: Tren cuya velocidad_max define los tiempos
+
+        Returns:
+            Arreglo de NumPy (inf donde no hay camino)
+        """
+        self._asegurar_vigente()
+        guardada = self._tiempos.get(tren.nombre)
+        if guardada is not None and guardada[0] == tren.velocidad_max:
+            return guardada[1]
+
+        tiempos = self.distancias / tren.velocidad_max
+        self._tiempos[tren.nombre] = (tren.velocidad_max, tiempos)
+        return tiempos
+
+    def distancia(self, origen: int, destino: int) -> float:
+        """Km del camino más corto entre dos ids de estación."""
+        self._asegurar_vigente()
+        return float(self.distancias[origen, destino])
+
+    def tiempo(self, tren: 'Tren', origen: int, destino: int) -> float:
+        """Horas de viaje del tren entre dos ids de estación."""
+        return float(self.matriz_tiempos(tren)[origen, destino])
+
+    def tiempo_minutos(self, tren: 'Tren', origen: int, destino: int) -> float:
+        """Minutos de viaje del tren entre dos ids de estación."""
+        return self.tiempo(tren, origen, destino) * 60
+
+    def tiempo_entre(self, tren: 'Tren', origen: str, destino: str) -> float:
+        """Horas de viaje del tren entre dos estaciones por nombre."""
+        return self.tiempo(tren, self.id_estacion(origen), self.id_estacion(destino))
+
+    def calcular_todas(self) -> Dict[str, Any]:
+        """Calcula la matriz de tiempos de cada tren de simulador.trenes."""
+        return {nombre: self.matriz_tiempos(tren) for nombre, tren in self.simulador.trenes.items()}
+
+    # ========== PERSISTENCIA ==========
+
+    def _huella_red(self) -> Any:
+        """Arreglo que identifica la red para validar un archivo guardado."""
+        aristas = sorted(
+            (min(par), max(par), km) for par, km in self._aristas.items()
+        )
+        return np.array([repr(self.nombres), repr(aristas)])
+
+    def _firma_persistencia(self, destino: str) -> tuple:
+        """Identifica lo que se escribiría: red, velocidades de los trenes y archivo."""
+        velocidades = tuple(
+            (nombre, tren.velocidad_max) for nombre, tren in self.simulador.trenes.items()
+        )
+        return firma_red(self.simulador), velocidades, os.path.abspath(destino)
+
+    def guardar(self, ruta_archivo: Optional[str] = None) -> bool:
+        """
+        Guarda las matrices junto al archivo de guardado.
+        Si la red y las velocidades no cambiaron desde la última vez que se
+        guardaron o cargaron, el archivo existente sigue vigente y no se escribe.
+
+        Args:
+            ruta_archivo: Archivo de guardado de la red (None usa el principal)
+
+        Returns:
+            True si se guardó correctamente o no hacía falta
+        """
+        destino = ruta_archivo_matrices(ruta_archivo)
+        firma = self._firma_persistencia(destino)
+        if firma == self._firma_guardada and os.path.exists(destino):
+            return True
+
+        self.calcular_todas()
+        columnas = {
+            "huella": self._huella_red(),
+            "distancias": self.distancias,
+            "trenes": np.array(list(self._tiempos), dtype=str),
+            "velocidades": np.array([v for v, _ in self._tiempos.values()], dtype=float)
+        }
+        for i, (_, tiempos) in enumerate(self._tiempos.values()):
+            columnas[f"tiempos_{i}"] = tiempos
+
+        try:
+            _escribir_atomico(destino, lambda f: np.savez(f, **columnas), binario=True)
+            self._firma_guardada = firma
+            return True
+        except IOError as e:
+            print(f"Error de E/S al guardar las matrices: {e}")
+            return False
+
+    def cargar(self, ruta_archivo: Optional[str] = None) -> bool:
+        """
+        Carga matrices guardadas si corresponden a la red actual.
+
+        Args:
+            ruta_archivo: Archivo de guardado de la red (None usa el principal)
+
+        Returns:
+            True si se usaron las matrices del archivo, False si hay que recalcular
+        """
+        origen = ruta_archivo_matrices(ruta_archivo)
+        if not os.path.exists(origen):
+            return False
+
+        self.nombres = list(self.simulador.estaciones)
+        self.indice = {nombre: i for i, nombre in enumerate(self.nombres)}
+        self._aristas = self._aristas_actuales()
+
+        try:
+            with np.load(origen) as archivo:
+                if list(archivo["huella"]) != list(self._huella_red()):
+                    self.invalidar()
+                    return False
+                self.distancias = archivo["distancias"]
+                self._tiempos = {
+                    str(nombre): (float(velocidad), archivo[f"tiempos_{i}"])
+                    for i, (nombre, velocidad) in enumerate(
+                        zip(archivo["trenes"], archivo["velocidades"])
+                    )
+                }
+        except (IOError, KeyError, ValueError) as e:
+            print(f"Advertencia: No se pudieron cargar las matrices: {e}")
+            self.invalidar()
+            return False
+
+        self._firma = firma_red(self.simulador)
+        # El archivo solo queda vigente si tiene los mismos trenes y velocidades
+        velocidades = {nombre: velocidad for nombre, (velocidad, _) in self._tiempos.items()}
+        if velocidades == {nombre: tren.velocidad_max for nombre, tren in self.simulador.trenes.items()}:
+            self._firma_guardada = self._firma_persistencia(origen)
+        return True
+
+
+def obtener_matrices(simulador: 'SimuladorTrenes') -> Optional[MatricesViaje]:
+    """
+    Retorna las matrices del simulador, creándolas la primera vez.
+    Retorna None si NumPy no está instalado.
+    """
+    if np is None:
+        return None
+    if getattr(simulador, "matrices_viaje", None) is None:
+        simulador.matrices_viaje = MatricesViaje(simulador)
+    return simulador.matrices_viaje
@@ -0,0 +1,185 @@
+"""
+Modelo de movimiento de los trenes sobre las rutas.
+Cada tren tiene un tramo actual (estación de origen, estación de destino,
+segundo de salida y segundo de llegada). Un tren detenido tiene un tramo
+de una estación a sí misma. Las posiciones de todos los trenes se
+interpolan en una sola pasada vectorizada a partir de los extremos del tramo.
+
+NumPy es opcional: sin NumPy se usa el mismo cálculo tren por tren.
+"""
+
+import datetime as dt
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy es opcional
+    np = None
+
+from models.clases import Estacion, a_segundos
+
+
+CAPACIDAD_INICIAL = 16
+
+Tiempo = Union[dt.datetime, int, float]
+
+
+def _segundos(tiempo: Tiempo) -> float:
+    return a_segundos(tiempo) if isinstance(tiempo, dt.datetime) else tiempo
+
+
+class MovimientoTrenes:
+    """
+    Tramos de los trenes guardados como columnas (una fila por tren).
+
+    Columnas: x e y de origen y destino, segundo de salida y de llegada.
+    Las coordenadas se copian de las estaciones al registrar el tramo.
+
+    Attributes:
+        estaciones: Diccionario {nombre: Estacion} para las coordenadas
+    """
+
+    def __init__(self, estaciones: Dict[str, Estacion]):
+        self.estaciones = estaciones
+        self._filas: Dict[str, int] = {}
+        self._nombres: List[str] = []
+        self._tramos: List[Tuple[str, str, float, float]] = []
+
+        capacidad = CAPACIDAD_INICIAL
+        if np is not None:
+            # Columnas: x_origen, y_origen, x_destino, y_destino, salida, llegada
+            self._columnas = np.zeros((6, capacidad))
+        else:
+            self._columnas = [[0.0] * capacidad for _ in range(6)]
+
+    def __len__(self) -> int:
+        return len(self._nombres)
+
+    def __contains__(self, nombre_tren: str) -> bool:
+        return nombre_tren in self._filas
+
+    # ========== REGISTRO DE TRAMOS ==========
+
+    def _fila(self, nombre_tren: str) -> int:
+        """Fila del tren, agregándola (y ampliando las columnas) si es nuevo."""
+        fila = self._filas.get(nombre_tren)
+        if fila is not None:
+            return fila
+
+        fila = len(self._nombres)
+        capacidad = len(self._columnas[0])
+        if fila >= capacidad:
+            if np is not None:
+                columnas = np.zeros((6, capacidad * 2))
+                columnas[:, :capacidad] = self._columnas
+                self._columnas = columnas
+            else:
+                for columna in self._columnas:
+                    columna.extend([0.0] * capacidad)
+
+        self._filas[nombre_tren] = fila
+        self._nombres.append(nombre_tren)
+        self._tramos.append(None)
+        return fila
+
+    def establecer_tramo(self, nombre_tren: str, origen: str, destino: str, salida: Tiempo, llegada: Tiempo):
+        """
+        Registra el tramo actual de un tren.
+
+        Args:
+            nombre_tren: Tren que se mueve
+            origen: Estación de salida
+            destino: Estación de llegada (igual a origen si está detenido)
+            salida: Momento de salida (datetime o segundos desde EPOCA)
+            llegada: Momento de llegada (datetime o segundos desde EPOCA)
+
+        Raises:
+            KeyError: Si alguna estación no existe
+        """
+        est_origen = self.estaciones[origen]
+        est_destino = self.estaciones[destino]
+        salida, llegada = _segundos(salida), _segundos(llegada)
+
+        fila = self._fila(nombre_tren)
+        valores = (
+            est_origen.coordenada_x, est_origen.coordenada_y,
+            est_destino.coordenada_x, est_destino.coordenada_y,
+            salida, llegada
+        )
+        for columna, valor in zip(self._columnas, valores):
+            columna[fila] = valor
+        self._tramos[fila] = (origen, destino, salida, llegada)
+
+    def partir(self, nombre_tren: str, origen: str, destino: str, salida: Tiempo, llegada: Tiempo):
+        """Registra que el tren sale de origen hacia destino."""
+        self.establecer_tramo(nombre_tren, origen, destino, salida, llegada)
+
+    def detener(self, nombre_tren: str, estacion: str, desde: Tiempo = 0):
+        """Registra que el tren está detenido en una estación."""
+        self.establecer_tramo(nombre_tren, estacion, estacion, desde, desde)
+
+    def quitar(self, nombre_tren: str):
+        """Deja de seguir a un tren (la última fila ocupa su lugar)."""
+        fila = self._filas.pop(nombre_tren, None)
+        if fila is None:
+            return
+
+        ultima = len(self._nombres) - 1
+        if fila != ultima:
+            movido = self._nombres[ultima]
+            for columna in self._columnas:
+                columna[fila] = columna[ultima]
+            self._nombres[fila] = movido
+            self._tramos[fila] = self._tramos[ultima]
+            self._filas[movido] = fila
+        self._nombres.pop()
+        self._tramos.pop()
+
+    # ========== CONSULTAS ==========
+
+    def tramo(self, nombre_tren: str) -> Optional[Tuple[str, str, float, float]]:
+        """Tupla (origen, destino, salida, llegada) del tren, None si no se sigue."""
+        fila = self._filas.get(nombre_tren)
+        return None if fila is None else self._tramos[fila]
+
+    def progreso(self, nombre_tren: str, tiempo: Tiempo) -> float:
+        """Fracción recorrida del tramo actual (0 a 1)."""
+        _, _, salida, llegada = self._tramos[self._filas[nombre_tren]]
+        if llegada <= salida:
+            return 1.0
+        return min(1.0, max(0.0, (_segundos(tiempo) - salida) / (llegada - salida)))
+
+    def posiciones(self, tiempo: Tiempo) -> Dict[str, Tuple[float, float]]:
+        """
+        Posición de todos los trenes en un momento, interpolando sobre su tramo.
+
+        Args:
+            tiempo: Momento a calcular (datetime o segundos desde EPOCA)
+
+        Returns:
+            Diccionario {nombre_tren: (x, y)}
+        """
+        n = len(self._nombres)
+        if n == 0:
+            return {}
+        t = _segundos(tiempo)
+
+        if np is not None:
+            x0, y0, x1, y1, salida, llegada = self._columnas[:, :n]
+            duracion = llegada - salida
+            avance = np.divide(t - salida, duracion, out=np.ones(n), where=duracion > 0)
+            np.clip(avance, 0.0, 1.0, out=avance)
+            xs = x0 + avance * (x1 - x0)
+            ys = y0 + avance * (y1 - y0)
+            return dict(zip(self._nombres, zip(xs.tolist(), ys.tolist())))
+
+        x0, y0, x1, y1, salida, llegada = self._columnas
+        resultado = {}
+        for fila, nombre in enumerate(self._nombres):
+            duracion = llegada[fila] - salida[fila]
+            avance = 1.0 if duracion <= 0 else min(1.0, max(0.0, (t - salida[fila]) / duracion))
+            resultado[nombre] = (
+                x0[fila] + avance * (x1[fila] - x0[fila]),
+                y0[fila] + avance * (y1[fila] - y0[fila])
+            )
+        return resultado
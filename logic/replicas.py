@@ -0,0 +1,219 @@
+"""
+Ejecución de réplicas de la simulación con múltiples semillas.
+Reparte los pares (escenario, semilla) entre procesos, cada proceso carga
+la red una sola vez y las métricas se combinan en intervalos de confianza.
+El resultado es idéntico al de ejecutar las mismas semillas en serie.
+
+Uso:
+    python -m logic.replicas --semillas 30 --dias 2 --procesos 4
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Iterable
+
+from models.clases import Pasajero
+from logic.Guardado import cargar_datos
+from logic.simulacion_sin_interfaz import SimulacionSinInterfaz
+
+
+# Valores críticos t de Student bilaterales al 95% por grados de libertad
+_T_95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+]
+
+# Métricas que identifican la corrida y no se promedian
+_METRICAS_EXCLUIDAS = ("semilla", "dias")
+
+# Datos de red cargados en cada proceso: {ruta_archivo: data}
+_DATOS_RED: Dict[Optional[str], Dict[str, Any]] = {}
+
+
+def _valor_t_95(grados_libertad: int) -> float:
+    """Retorna el valor crítico t al 95% (aproximación normal sobre 120 g.l.)."""
+    if grados_libertad <= len(_T_95):
+        return _T_95[grados_libertad - 1]
+    if grados_libertad <= 60:
+        return 2.000
+    if grados_libertad <= 120:
+        return 1.980
+    return 1.960
+
+
+def _cargar_red(ruta_archivo: Optional[str]) -> Dict[str, Any]:
+    """Carga los datos de red una vez por proceso y los reutiliza."""
+    if ruta_archivo not in _DATOS_RED:
+        _DATOS_RED[ruta_archivo] = cargar_datos(ruta_archivo)
+    return _DATOS_RED[ruta_archivo]
+
+
+def _inicializar_proceso(archivos: List[Optional[str]]):
+    """Inicializador de cada proceso: carga todas las redes necesarias."""
+    for ruta_archivo in archivos:
+        _cargar_red(ruta_archivo)
+
+
+def _ejecutar_corrida(tarea: tuple) -> Dict[str, Any]:
+    """
+    Ejecuta una corrida a partir de (nombre, archivo, dias, parametros, semilla).
+    Los objetos se reconstruyen desde los datos cargados, por lo que cada
+    corrida depende solo de su semilla.
+    """
+    nombre, ruta_archivo, dias, parametros, semilla = tarea
+
+    Pasajero.reset_counter()
+    simulacion = SimulacionSinInterfaz.desde_datos(
+        _cargar_red(ruta_archivo), semilla=semilla, **parametros
+    )
+    return simulacion.ejecutar(dias)
+
+
+def intervalo_confianza(valores: List[float]) -> Dict[str, float]:
+    """
+    Calcula media, desviación estándar e intervalo de confianza al 95%.
+
+    Args:
+        valores: Valores de una métrica en cada réplica
+
+    Returns:
+        Diccionario con n, media, desviacion, semiancho, inferior y superior
+    """
+    n = len(valores)
+    media = math.fsum(valores) / n
+    desviacion = statistics.stdev(valores) if n > 1 else 0.0
+    semiancho = _valor_t_95(n - 1) * desviacion / math.sqrt(n) if n > 1 else 0.0
+
+    return {
+        "n": n,
+        "media": media,
+        "desviacion": desviacion,
+        "semiancho": semiancho,
+        "inferior": media - semiancho,
+        "superior": media + semiancho
+    }
+
+
+def combinar_metricas(corridas: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Combina las métricas numéricas de varias corridas en intervalos de confianza."""
+    if not corridas:
+        return {}
+
+    return {
+        clave: intervalo_confianza([corrida[clave] for corrida in corridas])
+        for clave, valor in corridas[0].items()
+        if clave not in _METRICAS_EXCLUIDAS and isinstance(valor, (int, float))
+    }
+
+
+def ejecutar_replicas(
+    escenarios: List[Dict[str, Any]],
+    semillas: Iterable[int],
+    procesos: Optional[int] = None,
+    paralelo: bool = True
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Ejecuta cada escenario con cada semilla y combina los resultados.
+
+    Args:
+        escenarios: Lista de diccionarios con las claves 'nombre' y, de forma
+            opcional, 'archivo', 'dias' y 'parametros' (argumentos de
+            SimulacionSinInterfaz como probabilidad_llegada)
+        semillas: Semillas a ejecutar en cada escenario
+        procesos: Cantidad de procesos (None usa todos los núcleos)
+        paralelo: Si es False, ejecuta en serie en el proceso actual
+
+    Returns:
+        Diccionario {nombre: {"corridas": [...], "intervalos": {...}}}
+        en el mismo orden de escenarios y semillas recibido
+    """
+    semillas = list(semillas)
+    tareas = [
+        (
+            escenario["nombre"],
+            escenario.get("archivo"),
+            escenario.get("dias", 1),
+            escenario.get("parametros", {}),
+            semilla
+        )
+        for escenario in escenarios
+        for semilla in semillas
+    ]
+    archivos = list(dict.fromkeys(tarea[1] for tarea in tareas))
+
+    if paralelo:
+        procesos = procesos or os.cpu_count() or 1
+        bloque = max(1, len(tareas) // (4 * procesos))
+        with ProcessPoolExecutor(
+            max_workers=procesos,
+            initializer=_inicializar_proceso,
+            initargs=(archivos,)
+        ) as executor:
+            metricas = list(executor.map(_ejecutar_corrida, tareas, chunksize=bloque))
+    else:
+        _inicializar_proceso(archivos)
+        metricas = [_ejecutar_corrida(tarea) for tarea in tareas]
+
+    resultados: Dict[str, Dict[str, Any]] = {}
+    for tarea, metrica in zip(tareas, metricas):
+        resultados.setdefault(tarea[0], {"corridas": []})["corridas"].append(metrica)
+
+    for resultado in resultados.values():
+        resultado["intervalos"] = combinar_metricas(resultado["corridas"])
+
+    return resultados
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        prog="python -m logic.replicas",
+        description="Ejecuta réplicas de la simulación con varias semillas."
+    )
+    parser.add_argument("--archivo", default=None, help="Archivo de guardado a cargar")
+    parser.add_argument("--semillas", type=int, default=30, help="Cantidad de semillas (0..N-1)")
+    parser.add_argument("--dias", type=int, default=1, help="Días de servicio por corrida")
+    parser.add_argument("--procesos", type=int, default=None, help="Cantidad de procesos")
+    parser.add_argument("--serie", action="store_true", help="Ejecutar sin procesos paralelos")
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde escribir el resultado")
+    args = parser.parse_args(argv)
+
+    escenario = {"nombre": args.archivo or "principal", "archivo": args.archivo, "dias": args.dias}
+
+    inicio = time.perf_counter()
+    try:
+        resultados = ejecutar_replicas(
+            [escenario], range(args.semillas), procesos=args.procesos, paralelo=not args.serie
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    duracion = time.perf_counter() - inicio
+
+    print(f"✓ {args.semillas} réplicas completadas en {duracion:.3f} s")
+    for nombre, resultado in resultados.items():
+        print(f"Escenario '{nombre}':")
+        for clave, ic in resultado["intervalos"].items():
+            print(f"  - {clave}: {ic['media']:.3f} ± {ic['semiancho']:.3f}")
+
+    if args.salida:
+        try:
+            with open(args.salida, 'w', encoding='utf-8') as f:
+                json.dump(resultados, f, indent=4, ensure_ascii=False)
+            print(f"✓ Resultados escritos en '{args.salida}'")
+        except IOError as e:
+            print(f"Error de E/S al escribir los resultados: {e}")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
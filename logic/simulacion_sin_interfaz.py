@@ -0,0 +1,482 @@
+"""
+Ejecución de la simulación sin interfaz gráfica.
+Carga un guardado, construye los objetos de models.clases y simula N días
+de servicio con el motor de eventos discretos. Nunca importa tkinter, por
+lo que puede usarse en servidores o en ejecuciones por lotes.
+
+Los pasajeros viajan a cualquier estación alcanzable por el camino más
+corto de la red; si el tren se desvía de su camino bajan y esperan el
+siguiente (transbordo).
+
+Uso:
+    python -m logic.simulacion_sin_interfaz --dias 5 --semilla 42 --salida metricas.json
+    python -m logic.simulacion_sin_interfaz --dias 30 --cohortes
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import datetime as dt
+from typing import Dict, List, Any, Optional
+
+from models.clases import Tren, Estacion, Ruta, Pasajero
+from models.cohortes import CohortesEstacion, CohortesABordo, MINUTOS_POR_COHORTE
+from logic.Guardado import (
+    cargar_objetos, deserializar_trenes, deserializar_estaciones, deserializar_rutas
+)
+from logic.estado_simulacion import EstadoSimulacion
+from logic.cola_eventos import LLEGADA_PASAJERO, SALIDA_TREN, LLEGADA_TREN
+from logic.enrutamiento import Enrutador
+from logic.movimiento_trenes import MovimientoTrenes
+
+
+# Constantes de configuración
+PROBABILIDAD_LLEGADA = 0.05   # llegadas por minuto y estación
+TIEMPO_DETENCION_MIN = 5      # minutos que un tren espera en cada estación
+FECHA_INICIO = "2015-03-01 07:00:00"
+
+
+class SimulacionSinInterfaz:
+    """
+    Simulación completa sin dependencias de la interfaz.
+
+    Expone los mismos atributos que SimuladorTrenes (trenes, estaciones,
+    rutas) para que el resto de los módulos pueda trabajar con ambos.
+
+    Attributes:
+        trenes: Diccionario {nombre: Tren}
+        estaciones: Diccionario {nombre: Estacion}
+        rutas: Lista de objetos Ruta
+        estado: EstadoSimulacion con el reloj y la cola de eventos
+        enrutador: Enrutador con la adyacencia de la red y los caminos más cortos
+        cohortes: {nombre: CohortesEstacion} en el modo de cohortes, None si
+            los pasajeros se simulan como objetos individuales
+        cohortes_a_bordo: {nombre del tren: CohortesABordo} en el modo de
+            cohortes (los Tren recibidos no se modifican)
+    """
+
+    def __init__(
+        self,
+        trenes: Dict[str, Tren],
+        estaciones: Dict[str, Estacion],
+        rutas: List[Ruta],
+        semilla: int = 0,
+        fecha_inicio_str: str = FECHA_INICIO,
+        probabilidad_llegada: float = PROBABILIDAD_LLEGADA,
+        tiempo_detencion_min: int = TIEMPO_DETENCION_MIN,
+        modo_cohortes: bool = False,
+        minutos_por_cohorte: int = MINUTOS_POR_COHORTE
+    ):
+        self.trenes = trenes
+        self.estaciones = estaciones
+        self.rutas = rutas
+        self.enrutador = Enrutador(self)
+        self.movimiento = MovimientoTrenes(estaciones)
+        self.semilla = semilla
+        self.probabilidad_llegada = probabilidad_llegada
+        self.tiempo_detencion_min = tiempo_detencion_min
+
+        # Modo de cohortes: la demanda se guarda como conteos en vez de Pasajero
+        self.cohortes: Optional[Dict[str, CohortesEstacion]] = None
+        self.cohortes_a_bordo: Optional[Dict[str, CohortesABordo]] = None
+        if modo_cohortes:
+            self._iniciar_cohortes(minutos_por_cohorte)
+
+        # Generador propio para que los resultados dependan solo de la semilla
+        self.rdm = random.Random(semilla)
+        self.estado = EstadoSimulacion(fecha_inicio_str, semilla)
+        self.estado.registrar_manejador(LLEGADA_PASAJERO, self._manejar_llegada_pasajero)
+        self.estado.registrar_manejador(SALIDA_TREN, self._manejar_salida_tren)
+        self.estado.registrar_manejador(LLEGADA_TREN, self._manejar_llegada_tren)
+
+        self.dias_simulados = 0
+        self._iniciada = False
+
+        # Métricas acumuladas
+        self.pasajeros_generados = 0
+        self.pasajeros_transportados = 0
+        self.pasajeros_embarcados = 0
+        self.transbordos = 0
+        self.viajes_realizados = 0
+        self.espera_total_min = 0.0
+        self.espera_maxima_min = 0.0
+
+    @classmethod
+    def desde_guardado(cls, ruta_archivo: Optional[str] = None, **kwargs) -> 'SimulacionSinInterfaz':
+        """
+        Crea una simulación a partir de un archivo de guardado.
+
+        Args:
+            ruta_archivo: Archivo a cargar (None usa el guardado principal)
+            **kwargs: Parámetros adicionales para el constructor
+
+        Raises:
+            ValueError: Si el guardado no tiene trenes o estaciones
+        """
+        # Los pasajeros se cargan por lotes, sin pasar por los diccionarios completos
+        objetos = cargar_objetos(ruta_archivo)
+        if not objetos["trenes"] or not objetos["estaciones"]:
+            raise ValueError("El guardado debe tener al menos un tren y una estación")
+
+        return cls(
+            trenes=objetos["trenes"],
+            estaciones=objetos["estaciones"],
+            rutas=objetos["rutas"],
+            **kwargs
+        )
+
+    @classmethod
+    def desde_datos(cls, data: Dict[str, Any], **kwargs) -> 'SimulacionSinInterfaz':
+        """
+        Crea una simulación a partir de los datos ya leídos por cargar_datos.
+        Construye objetos nuevos en cada llamada, por lo que los mismos datos
+        pueden reutilizarse en varias corridas.
+
+        Args:
+            data: Diccionario con las claves 'trenes', 'estaciones', 'rutas'
+            **kwargs: Parámetros adicionales para el constructor
+
+        Raises:
+            ValueError: Si los datos no tienen trenes o estaciones
+        """
+        if not data["trenes"] or not data["estaciones"]:
+            raise ValueError("El guardado debe tener al menos un tren y una estación")
+
+        return cls(
+            trenes=deserializar_trenes(data["trenes"]),
+            estaciones=deserializar_estaciones(data["estaciones"]),
+            rutas=deserializar_rutas(data["rutas"]),
+            **kwargs
+        )
+
+    def _iniciar_cohortes(self, minutos_por_cohorte: int):
+        """Convierte en cohortes a los pasajeros que ya esperan o viajan en el estado cargado."""
+        self.cohortes = {}
+        for nombre, estacion in self.estaciones.items():
+            cohortes = CohortesEstacion(nombre, minutos_por_cohorte)
+            # pasajeros_esperando entrega a los pasajeros en orden de llegada
+            for pasajero in estacion.pasajeros_esperando:
+                cohortes.agregar(pasajero.destino, pasajero.segundos_llegada)
+            self.cohortes[nombre] = cohortes
+
+        self.cohortes_a_bordo = {}
+        for nombre, tren in self.trenes.items():
+            a_bordo = CohortesABordo()
+            for destino, cantidad in tren.pasajeros.destinos().items():
+                a_bordo.abordar(destino, cantidad)
+            self.cohortes_a_bordo[nombre] = a_bordo
+
+    def _a_bordo(self, tren: Tren):
+        """Pasajeros a bordo de un tren (PasajerosABordo o CohortesABordo)."""
+        if self.cohortes_a_bordo is not None:
+            return self.cohortes_a_bordo[tren.nombre]
+        return tren.pasajeros
+
+    def _esperando(self, nombre_estacion: str):
+        """Pasajeros esperando en una estación (Estacion o CohortesEstacion)."""
+        if self.cohortes is not None:
+            return self.cohortes[nombre_estacion]
+        return self.estaciones[nombre_estacion]
+
+    # ========== PROGRAMACIÓN INICIAL ==========
+
+    def _iniciar(self):
+        """Programa la primera llegada de cada estación y la salida de cada tren."""
+        nombres_estaciones = list(self.estaciones.keys())
+
+        for nombre in nombres_estaciones:
+            if self.enrutador.destinos_alcanzables(nombre):
+                self._programar_llegada_pasajero(nombre)
+
+        # Los trenes se reparten entre las estaciones en orden
+        for i, tren in enumerate(self.trenes.values()):
+            tren.ubicacion = nombres_estaciones[i % len(nombres_estaciones)]
+            self.movimiento.detener(tren.nombre, tren.ubicacion, self.estado.fecha_actual)
+            self.estado.programar_en(0, SALIDA_TREN, tren)
+
+        self._iniciada = True
+
+    def _programar_llegada_pasajero(self, nombre_estacion: str):
+        """Programa la próxima llegada de pasajero según un proceso de Poisson."""
+        minutos = self.rdm.expovariate(self.probabilidad_llegada)
+        self.estado.programar_en(minutos * 60, LLEGADA_PASAJERO, nombre_estacion)
+
+    # ========== MANEJADORES DE EVENTOS ==========
+
+    def _manejar_llegada_pasajero(self, estado: EstadoSimulacion, evento):
+        """Crea un pasajero con destino a cualquier estación alcanzable por la red."""
+        origen = evento.datos
+        destino = self.rdm.choice(self.enrutador.destinos_alcanzables(origen))
+
+        if self.cohortes is not None:
+            self.cohortes[origen].agregar(destino, estado.fecha_actual)
+        else:
+            self.estaciones[origen].agregar_pasajero(Pasajero(origen, destino, estado.fecha_actual))
+        self.pasajeros_generados += 1
+
+        self._programar_llegada_pasajero(origen)
+
+    def _manejar_salida_tren(self, estado: EstadoSimulacion, evento):
+        """
+        Elige la próxima estación, baja a quienes deben transbordar, embarca
+        pasajeros y programa la llegada.
+
+        Cada pasajero sigue el camino más corto a su destino: viaja en el
+        tren solo si la próxima estación del tren es la siguiente de su camino.
+        """
+        tren = evento.datos
+        opciones = self.enrutador.vecinos(tren.ubicacion)
+        if not opciones:
+            return
+
+        estacion = self._esperando(tren.ubicacion)
+        a_bordo = self._a_bordo(tren)
+        esperando = estacion.obtener_destinos_demandados()
+        viajando = a_bordo.destinos()
+        saltos = {
+            destino_final: self.enrutador.siguiente_estacion(tren.ubicacion, destino_final)
+            for destino_final in esperando.keys() | viajando.keys()
+        }
+
+        # Se prioriza el vecino hacia el que siguen más pasajeros, esperando o a bordo
+        demanda: Dict[Optional[str], int] = {}
+        for grupo in (esperando, viajando):
+            for destino_final, cantidad in grupo.items():
+                salto = saltos[destino_final]
+                demanda[salto] = demanda.get(salto, 0) + cantidad
+        mayor_demanda = max(demanda.get(nombre, 0) for nombre, _ in opciones)
+        candidatos = [
+            (nombre, distancia) for nombre, distancia in opciones
+            if demanda.get(nombre, 0) == mayor_demanda
+        ]
+        destino, distancia = self.rdm.choice(candidatos)
+
+        # Bajan los pasajeros cuyo camino no sigue hacia el destino del tren
+        for destino_final in viajando:
+            if saltos[destino_final] != destino:
+                self._bajar_de_tren(a_bordo, tren.ubicacion, destino_final, estado.fecha_actual)
+
+        espacio = tren.capacidad - len(a_bordo)
+        for destino_final in esperando:
+            if espacio <= 0:
+                break
+            if saltos[destino_final] == destino:
+                espacio -= self._embarcar(estacion, a_bordo, destino_final, espacio, estado.fecha_actual)
+
+        origen, tren.ubicacion = tren.ubicacion, None
+        minutos_viaje = tren.calcular_tiempo_ruta_minutos(distancia)
+        llegada = estado.programar_en(minutos_viaje * 60, LLEGADA_TREN, (tren, destino))
+        self.movimiento.partir(tren.nombre, origen, destino, estado.fecha_actual, llegada.tiempo)
+
+    def _embarcar(self, estacion, a_bordo, destino_final: str, espacio: int, fecha: dt.datetime) -> int:
+        """Sube al tren a los pasajeros más antiguos de un destino y retorna cuántos subieron."""
+        if self.cohortes is not None:
+            suben, espera_total, espera_maxima = estacion.despachar(destino_final, espacio, fecha)
+            if suben:
+                self.pasajeros_embarcados += suben
+                self.espera_total_min += espera_total
+                self.espera_maxima_min = max(self.espera_maxima_min, espera_maxima)
+            a_bordo.abordar(destino_final, suben)
+            return suben
+
+        abordan = estacion.despachar_pasajeros(destino_final, espacio, fecha)
+        self.pasajeros_embarcados += len(abordan)
+        for pasajero in abordan:
+            espera = pasajero.tiempo_espera_minutos()
+            self.espera_total_min += espera
+            self.espera_maxima_min = max(self.espera_maxima_min, espera)
+        a_bordo.abordar(destino_final, abordan)
+        return len(abordan)
+
+    def _bajar_de_tren(self, a_bordo, nombre_estacion: str, destino_final: str, fecha: dt.datetime):
+        """
+        Baja en una estación a los pasajeros de un destino: llegaron si es su
+        destino, si no esperan ahí el próximo tren de su camino.
+        """
+        bajan = a_bordo.bajar(destino_final)
+        cantidad = bajan if self.cohortes is not None else len(bajan)
+        if destino_final == nombre_estacion:
+            self.pasajeros_transportados += cantidad
+        elif self.cohortes is not None:
+            self.cohortes[nombre_estacion].agregar(destino_final, fecha, cantidad)
+            self.transbordos += cantidad
+        else:
+            self.estaciones[nombre_estacion].recibir_transbordo(bajan, fecha)
+            self.transbordos += cantidad
+
+    def _manejar_llegada_tren(self, estado: EstadoSimulacion, evento):
+        """Desembarca a los pasajeros que llegaron a destino y programa la salida."""
+        tren, destino = evento.datos
+        tren.ubicacion = destino
+        self.movimiento.detener(tren.nombre, destino, estado.fecha_actual)
+
+        self._bajar_de_tren(self._a_bordo(tren), destino, destino, estado.fecha_actual)
+        self.viajes_realizados += 1
+
+        estado.programar_en(self.tiempo_detencion_min * 60, SALIDA_TREN, tren)
+
+    # ========== EJECUCIÓN ==========
+
+    def ejecutar(self, dias: int = 1) -> Dict[str, Any]:
+        """
+        Simula la cantidad de días de servicio indicada.
+
+        Args:
+            dias: Días de servicio a simular
+
+        Returns:
+            Diccionario con las métricas acumuladas
+        """
+        if dias < 1:
+            raise ValueError("La cantidad de días debe ser mayor a 0")
+
+        if not self._iniciada:
+            self._iniciar()
+
+        self.estado.ejecutar_dias(dias)
+        self.dias_simulados += dias
+        return self.metricas()
+
+    def avanzar(self, segundos: float) -> int:
+        """
+        Avanza el reloj la cantidad de segundos simulados indicada.
+        Permite ejecutar la simulación por pasos (ej: desde un hilo aparte).
+
+        Args:
+            segundos: Segundos simulados a avanzar
+
+        Returns:
+            Cantidad de eventos procesados en el paso
+        """
+        if not self._iniciada:
+            self._iniciar()
+
+        return self.estado.ejecutar_hasta(self.estado.fecha_actual + dt.timedelta(seconds=segundos))
+
+    def instantanea(self) -> Dict[str, Any]:
+        """
+        Estado actual en tipos simples (sin referencias a los objetos del
+        modelo), apto para enviarse a otro hilo.
+        """
+        return {
+            "fecha": self.estado.fecha_actual.isoformat(),
+            "metricas": self.metricas(),
+            "estaciones": {
+                nombre: self._esperando(nombre).total_esperando
+                for nombre in self.estaciones
+            },
+            "trenes": {
+                nombre: (getattr(tren, "ubicacion", None), len(self._a_bordo(tren)), self.movimiento.tramo(nombre))
+                for nombre, tren in self.trenes.items()
+            }
+        }
+
+    def metricas(self) -> Dict[str, Any]:
+        """Retorna el resumen de métricas de la simulación."""
+        esperando = sum(self._esperando(nombre).total_esperando for nombre in self.estaciones)
+        a_bordo = sum(len(self._a_bordo(t)) for t in self.trenes.values())
+
+        return {
+            "semilla": self.semilla,
+            "dias": self.dias_simulados,
+            "fecha_final": self.estado.fecha_actual.isoformat(),
+            "eventos_procesados": self.estado.eventos_procesados,
+            "pasajeros_generados": self.pasajeros_generados,
+            "pasajeros_transportados": self.pasajeros_transportados,
+            "pasajeros_esperando": esperando,
+            "pasajeros_a_bordo": a_bordo,
+            "pasajeros_embarcados": self.pasajeros_embarcados,
+            "transbordos": self.transbordos,
+            "viajes_realizados": self.viajes_realizados,
+            "espera_promedio_min": (
+                self.espera_total_min / self.pasajeros_embarcados
+                if self.pasajeros_embarcados else 0.0
+            ),
+            "espera_maxima_min": self.espera_maxima_min
+        }
+
+
+def ejecutar_simulacion(
+    dias: int = 1,
+    semilla: int = 0,
+    ruta_archivo: Optional[str] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Carga un guardado, simula los días indicados y retorna las métricas.
+
+    Args:
+        dias: Días de servicio a simular
+        semilla: Semilla de la simulación
+        ruta_archivo: Archivo de guardado (None usa el guardado principal)
+        **kwargs: Parámetros adicionales de SimulacionSinInterfaz
+
+    Returns:
+        Diccionario con las métricas de la simulación
+    """
+    Pasajero.reset_counter()
+    simulacion = SimulacionSinInterfaz.desde_guardado(ruta_archivo, semilla=semilla, **kwargs)
+    return simulacion.ejecutar(dias)
+
+
+def _crear_parser() -> argparse.ArgumentParser:
+    """Crea el parser de argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        prog="python -m logic.simulacion_sin_interfaz",
+        description="Ejecuta la simulación de trenes sin interfaz gráfica."
+    )
+    parser.add_argument("--archivo", default=None,
+                        help="Archivo de guardado a cargar (por defecto el guardado principal)")
+    parser.add_argument("--dias", type=int, default=1, help="Días de servicio a simular")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de la simulación")
+    parser.add_argument("--fecha-inicio", default=FECHA_INICIO,
+                        help="Fecha de inicio en formato 'AAAA-MM-DD HH:MM:SS'")
+    parser.add_argument("--probabilidad", type=float, default=PROBABILIDAD_LLEGADA,
+                        help="Llegadas de pasajeros por minuto y estación")
+    parser.add_argument("--cohortes", action="store_true",
+                        help="Guarda la demanda como conteos por (origen, destino, minuto) "
+                             "en vez de un objeto por pasajero")
+    parser.add_argument("--salida", default=None,
+                        help="Archivo JSON donde escribir las métricas")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    args = _crear_parser().parse_args(argv)
+
+    inicio = time.perf_counter()
+    try:
+        metricas = ejecutar_simulacion(
+            dias=args.dias,
+            semilla=args.semilla,
+            ruta_archivo=args.archivo,
+            fecha_inicio_str=args.fecha_inicio,
+            probabilidad_llegada=args.probabilidad,
+            modo_cohortes=args.cohortes
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    duracion = time.perf_counter() - inicio
+
+    print(f"✓ Simulación completada en {duracion:.3f} s")
+    for clave, valor in metricas.items():
+        print(f"  - {clave}: {valor}")
+
+    if args.salida:
+        try:
+            with open(args.salida, 'w', encoding='utf-8') as f:
+                json.dump(metricas, f, indent=4, ensure_ascii=False)
+            print(f"✓ Métricas escritas en '{args.salida}'")
+        except IOError as e:
+            print(f"Error de E/S al escribir las métricas: {e}")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,9 +4,149 @@ Define las entidades principales: Tren, Estación, Ruta y Pasajero.
 """
 
 import datetime as dt
-from typing import List, Optional, Dict, Any
+import heapq
+import itertools
+from array import array
+from collections import deque
+from typing import List, Optional, Dict, Any, Deque, Tuple, Union, TYPE_CHECKING
 from dataclasses import dataclass, field
 
+if TYPE_CHECKING:
+    from models.tabla_pasajeros import TablaPasajeros
+
+
+class PasajerosABordo:
+    """
+    Pasajeros a bordo de un tren agrupados por destino.
+    
+    Bajar en una estación saca el grupo completo de su destino de una vez,
+    sin recorrer a los demás pasajeros; len() es O(1).
+    
+    Con una TablaPasajeros los grupos guardan números de fila en arreglos
+    de enteros (8 bytes por pasajero) en vez de objetos; la iteración y
+    bajar() entregan vistas de la tabla.
+    
+    Attributes:
+        tabla: TablaPasajeros opcional de la que provienen las filas
+    """
+    
+    def __init__(
+        self,
+        pasajeros: Optional[List['Pasajero']] = None,
+        tabla: Optional['TablaPasajeros'] = None
+    ):
+        self.tabla = tabla
+        self._grupos: Dict[str, Any] = {}
+        self._total = 0
+        if pasajeros:
+            self.extend(pasajeros)
+    
+    def __len__(self) -> int:
+        return self._total
+    
+    def __iter__(self):
+        for grupo in list(self._grupos.values()):
+            if self.tabla is not None:
+                yield from self.tabla.vistas(grupo)
+            else:
+                yield from grupo
+    
+    def append(self, pasajero: 'Pasajero'):
+        """Sube un pasajero al grupo de su destino."""
+        self.abordar(pasajero.destino, [pasajero])
+    
+    def extend(self, pasajeros: List['Pasajero']):
+        """Sube pasajeros con cualquier destino."""
+        for pasajero in pasajeros:
+            self.append(pasajero)
+    
+    def _filas(self, pasajeros: List['Pasajero']) -> List[int]:
+        """Filas de la tabla para los pasajeros; los que no están en ella se copian."""
+        return [
+            pasajero.fila if getattr(pasajero, "tabla", None) is self.tabla
+            else self.tabla.agregar_pasajero(pasajero)
+            for pasajero in pasajeros
+        ]
+    
+    def abordar(self, destino: str, pasajeros: List['Pasajero']):
+        """
+        Sube de una vez un bloque de pasajeros que van al mismo destino.
+        
+        Args:
+            destino: Destino común de todos los pasajeros
+            pasajeros: Pasajeros que suben
+        """
+        if not pasajeros:
+            return
+        if self.tabla is not None:
+            self.abordar_filas(destino, self._filas(pasajeros))
+            return
+        grupo = self._grupos.get(destino)
+        if grupo is None:
+            self._grupos[destino] = list(pasajeros)
+        else:
+            grupo.extend(pasajeros)
+        self._total += len(pasajeros)
+    
+    def abordar_filas(self, destino: str, filas: List[int]):
+        """
+        Sube un bloque de pasajeros de la tabla por su número de fila.
+        
+        Raises:
+            ValueError: Si el contenedor no usa una tabla de pasajeros
+        """
+        if self.tabla is None:
+            raise ValueError("Los pasajeros a bordo no usan una tabla de pasajeros")
+        if not len(filas):
+            return
+        grupo = self._grupos.get(destino)
+        if grupo is None:
+            grupo = self._grupos[destino] = array('q')
+        grupo.extend(int(fila) for fila in filas)
+        self._total += len(filas)
+    
+    def bajar(self, destino: str) -> List['Pasajero']:
+        """
+        Baja a todos los pasajeros que van a un destino.
+        
+        Returns:
+            Lista de pasajeros que bajaron (vacía si no había ninguno)
+        """
+        grupo = self._grupos.pop(destino, None)
+        if grupo is None:
+            return []
+        self._total -= len(grupo)
+        if self.tabla is not None:
+            return self.tabla.vistas(grupo)
+        return grupo
+    
+    def bajar_filas(self, destino: str) -> List[int]:
+        """
+        Igual que bajar, pero retorna números de fila de la tabla.
+        
+        Raises:
+            ValueError: Si el contenedor no usa una tabla de pasajeros
+        """
+        if self.tabla is None:
+            raise ValueError("Los pasajeros a bordo no usan una tabla de pasajeros")
+        grupo = self._grupos.pop(destino, None)
+        if grupo is None:
+            return []
+        self._total -= len(grupo)
+        return grupo.tolist()
+    
+    def cantidad(self, destino: str) -> int:
+        """Pasajeros a bordo que van a un destino."""
+        return len(self._grupos.get(destino, ()))
+    
+    def destinos(self) -> Dict[str, int]:
+        """Diccionario {destino: cantidad de pasajeros a bordo}."""
+        return {destino: len(grupo) for destino, grupo in self._grupos.items()}
+    
+    def limpiar(self):
+        self._grupos.clear()
+        self._total = 0
+
 
 class Tren:
     """
@@ -17,16 +157,26 @@ class Tren:
         capacidad: Número máximo de pasajeros que puede transportar
         combustible: Tipo de combustible/energía (Diésel, Eléctrico, Híbrido)
         velocidad_max: Velocidad máxima en km/h
+        pasajeros: Pasajeros a bordo agrupados por destino; con una
+            TablaPasajeros (parámetro tabla) se guardan como filas de la tabla
     """
     
-    def __init__(self, nombre: str, capacidad: int, combustible: str, velocidad_max: int):
+    def __init__(
+        self,
+        nombre: str,
+        capacidad: int,
+        combustible: str,
+        velocidad_max: int,
+        tabla: Optional['TablaPasajeros'] = None
+    ):
         self._validar_parametros(nombre, capacidad, velocidad_max)
         
         self.nombre = nombre
         self.capacidad = capacidad
         self.combustible = combustible
         self.velocidad_max = velocidad_max
-        self.pasajeros = []   
+        self.pasajeros = PasajerosABordo(tabla=tabla)
+    
     @staticmethod
     def _validar_parametros(nombre: str, capacidad: int, velocidad_max: int):
         """Valida los parámetros de entrada."""
@@ -117,22 +267,46 @@ class Tren:
         )
 
 
+# Referencia para representar tiempos como segundos enteros
+# (independiente de la zona horaria)
+EPOCA = dt.datetime(1970, 1, 1)
+_UN_SEGUNDO = dt.timedelta(seconds=1)
+
+
+def a_segundos(momento: dt.datetime) -> int:
+    """Convierte un datetime a segundos enteros desde EPOCA."""
+    return (momento - EPOCA) // _UN_SEGUNDO
+
+
+def desde_segundos(segundos: int) -> dt.datetime:
+    """Convierte segundos enteros desde EPOCA a datetime."""
+    return EPOCA + dt.timedelta(seconds=int(segundos))
+
+
 class Pasajero:
     """
     Representa a un pasajero en la simulación.
     
+    Usa __slots__ y guarda los tiempos como segundos enteros desde EPOCA;
+    solo se convierten a datetime al leer tiempo_llegada/tiempo_partida
+    (serialización e interfaz). Los cálculos de espera usan los enteros.
+    
     Attributes:
         id: Identificador único del pasajero
         origen: Estación de origen
         destino: Estación de destino
         tiempo_llegada: Momento en que llegó a la estación
         tiempo_partida: Momento en que abordó el tren (None si aún espera)
+        segundos_llegada: tiempo_llegada como segundos enteros
+        segundos_partida: tiempo_partida como segundos enteros (None si aún espera)
     """
     
+    __slots__ = ("id", "origen", "destino", "segundos_llegada", "segundos_partida")
+    
     # Contador estático para asignar IDs únicos
     id_counter: int = 1000
 
-    def __init__(self, origen: str, destino: str, tiempo_llegada: dt.datetime):
+    def __init__(self, origen: str, destino: str, tiempo_llegada: Union[dt.datetime, int]):
         self._validar_parametros(origen, destino)
         
         self.id = Pasajero.id_counter
@@ -140,8 +314,31 @@ class Pasajero:
         
         self.origen = origen
         self.destino = destino
-        self.tiempo_llegada = tiempo_llegada
-        self.tiempo_partida: Optional[dt.datetime] = None
+        self.segundos_llegada = (
+            a_segundos(tiempo_llegada) if isinstance(tiempo_llegada, dt.datetime)
+            else int(tiempo_llegada)
+        )
+        self.segundos_partida: Optional[int] = None
+    
+    @property
+    def tiempo_llegada(self) -> dt.datetime:
+        """Momento de llegada a la estación."""
+        return desde_segundos(self.segundos_llegada)
+    
+    @tiempo_llegada.setter
+    def tiempo_llegada(self, tiempo: dt.datetime):
+        self.segundos_llegada = a_segundos(tiempo)
+    
+    @property
+    def tiempo_partida(self) -> Optional[dt.datetime]:
+        """Momento de abordaje, None si aún espera."""
+        if self.segundos_partida is None:
+            return None
+        return desde_segundos(self.segundos_partida)
+    
+    @tiempo_partida.setter
+    def tiempo_partida(self, tiempo: Optional[dt.datetime]):
+        self.segundos_partida = None if tiempo is None else a_segundos(tiempo)
     
     @staticmethod
     def _validar_parametros(origen: str, destino: str):
@@ -155,7 +352,7 @@ class Pasajero:
     
     def __str__(self) -> str:
         """Retorna una representación legible del objeto."""
-        estado = "En tránsito" if self.tiempo_partida else "Esperando"
+        estado = "En tránsito" if self.segundos_partida is not None else "Esperando"
         return f"Pasajero #{self.id} | {self.origen} → {self.destino} | Estado: {estado}"
     
     def __repr__(self) -> str:
@@ -172,7 +369,13 @@ class Pasajero:
         Args:
             tiempo: Momento de partida. Si es None, usa el tiempo actual.
         """
-        self.tiempo_partida = tiempo or dt.datetime.now()
+        self.segundos_partida = a_segundos(tiempo or dt.datetime.now())
+    
+    def segundos_espera(self) -> int:
+        """Segundos de espera como entero (0 si aún no parte)."""
+        if self.segundos_partida is None:
+            return 0
+        return self.segundos_partida - self.segundos_llegada
     
     def tiempo_espera(self) -> dt.timedelta:
         """
@@ -181,9 +384,7 @@ class Pasajero:
         Returns:
             Duración de la espera. Si aún no parte, retorna timedelta(0)
         """
-        if self.tiempo_partida:
-            return self.tiempo_partida - self.tiempo_llegada
-        return dt.timedelta(seconds=0)
+        return dt.timedelta(seconds=self.segundos_espera())
     
     def tiempo_espera_minutos(self) -> float:
         """
@@ -192,20 +393,21 @@ class Pasajero:
         Returns:
             Tiempo de espera en minutos
         """
-        return self.tiempo_espera().total_seconds() / 60
+        return self.segundos_espera() / 60
     
     def esta_esperando(self) -> bool:
         """Verifica si el pasajero aún está esperando."""
-        return self.tiempo_partida is None
+        return self.segundos_partida is None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convierte el objeto a diccionario para serialización."""
+        tiempo_partida = self.tiempo_partida
         return {
             'id': self.id,
             'origen': self.origen,
             'destino': self.destino,
             'tiempo_llegada': self.tiempo_llegada.isoformat(),
-            'tiempo_partida': self.tiempo_partida.isoformat() if self.tiempo_partida else None
+            'tiempo_partida': tiempo_partida.isoformat() if tiempo_partida else None
         }
     
     @classmethod
@@ -241,18 +443,120 @@ class Estacion:
         nombre: Nombre identificador de la estación
         coordenada_x: Posición X en el mapa
         coordenada_y: Posición Y en el mapa
-        pasajeros_esperando: Lista de pasajeros en la estación
+        pasajeros_esperando: Pasajeros en la estación (una cola FIFO por destino)
+        tabla: TablaPasajeros opcional; si existe, las colas guardan filas
+            de la tabla en vez de objetos Pasajero
     """
     
-    def __init__(self, nombre: str, coordenada_x: int, coordenada_y: int):
+    def __init__(
+        self,
+        nombre: str,
+        coordenada_x: int,
+        coordenada_y: int,
+        tabla: Optional['TablaPasajeros'] = None
+    ):
         self._validar_parametros(nombre, coordenada_x, coordenada_y)
         
         self.nombre = nombre
         self.coordenada_x = coordenada_x
         self.coordenada_y = coordenada_y
-        self.pasajeros_esperando: List[Pasajero] = []
-    def agregar_pasajero(self, pasajero):
-        self.pasajeros_esperando.append(pasajero)
+        self.tabla = tabla
+        
+        # Una cola FIFO por destino: (secuencia_llegada, pasajero), o el
+        # número de fila cuando se usa una tabla (las filas ya son crecientes)
+        self._colas_destino: Dict[str, Deque[Any]] = {}
+        self._total_esperando = 0
+        self._secuencia = itertools.count()
+        # Salidas acumuladas por destino (las llegadas son salidas + en espera)
+        self._salidas_destino: Dict[str, int] = {}
+    
+    @property
+    def pasajeros_esperando(self) -> List[Pasajero]:
+        """
+        Pasajeros en espera en orden de llegada.
+        
+        Retorna una copia construida desde las colas por destino; para
+        modificar la espera se deben usar los métodos de la estación.
+        """
+        if self.tabla is not None:
+            return self.tabla.vistas(heapq.merge(*self._colas_destino.values()))
+        return [p for _, p in heapq.merge(*self._colas_destino.values())]
+    
+    @pasajeros_esperando.setter
+    def pasajeros_esperando(self, pasajeros: List[Pasajero]):
+        """Reemplaza la espera completa conservando el orden de la lista."""
+        self.limpiar_pasajeros()
+        for pasajero in pasajeros:
+            self._encolar(pasajero)
+    
+    @property
+    def total_esperando(self) -> int:
+        """Cantidad total de pasajeros en espera (O(1))."""
+        return self._total_esperando
+    
+    def _encolar(self, pasajero: Pasajero):
+        """Añade un pasajero a la cola de su destino."""
+        if self.tabla is not None:
+            entrada = self.tabla.agregar_pasajero(pasajero)
+        else:
+            entrada = (next(self._secuencia), pasajero)
+        self._encolar_entrada(entrada, pasajero.destino)
+    
+    def _encolar_entrada(self, entrada: Any, destino: str):
+        """Añade una entrada (tupla o fila) a la cola del destino."""
+        cola = self._colas_destino.get(destino)
+        if cola is None:
+            cola = self._colas_destino[destino] = deque()
+        cola.append(entrada)
+        self._total_esperando += 1
+    
+    def _extraer(self, destino: str, cantidad: int) -> List[Any]:
+        """Saca hasta `cantidad` entradas de la cola de un destino."""
+        cola = self._colas_destino.get(destino)
+        if not cola or cantidad <= 0:
+            return []
+        
+        if cantidad >= len(cola):
+            # Se lleva la cola completa sin sacar las entradas una por una
+            entradas = list(cola)
+            del self._colas_destino[destino]
+        else:
+            entradas = [cola.popleft() for _ in range(cantidad)]
+        self._total_esperando -= len(entradas)
+        self._salidas_destino[destino] = self._salidas_destino.get(destino, 0) + len(entradas)
+        return entradas
+    
+    def _contar_primeros(self, cantidad: int) -> Dict[str, int]:
+        """
+        Cuántos de los primeros `cantidad` pasajeros en llegar van a cada destino.
+        Si caben todos, no se recorren las colas.
+        """
+        if cantidad <= 0:
+            return {}
+        if cantidad >= self._total_esperando:
+            return {destino: len(cola) for destino, cola in self._colas_destino.items()}
+        
+        # Las colas ya están ordenadas por llegada: basta mezclarlas hasta `cantidad`
+        conteo: Dict[str, int] = {}
+        colas = [
+            zip(cola, itertools.repeat(destino))
+            for destino, cola in self._colas_destino.items()
+        ]
+        for _, destino in itertools.islice(heapq.merge(*colas), cantidad):
+            conteo[destino] = conteo.get(destino, 0) + 1
+        return conteo
+    
+    def _registrar_salida(self, entradas: List[Any], tiempo: dt.datetime) -> List[Pasajero]:
+        """Marca la partida de las entradas y las retorna como pasajeros."""
+        if self.tabla is not None:
+            self.tabla.registrar_partida(entradas, tiempo)
+            return self.tabla.vistas(entradas)
+        
+        pasajeros = []
+        for _, pasajero in entradas:
+            pasajero.registrar_partida(tiempo)
+            pasajeros.append(pasajero)
+        return pasajeros
     
     @staticmethod
     def _validar_parametros(nombre: str, coordenada_x: int, coordenada_y: int):
@@ -269,7 +573,7 @@ class Estacion:
         return (
             f"Estación {self.nombre} | "
             f"Ubicación: ({self.coordenada_x}, {self.coordenada_y}) | "
-            f"Esperando: {len(self.pasajeros_esperando)} pax"
+            f"Esperando: {self._total_esperando} pax"
         )
     
     def __repr__(self) -> str:
@@ -295,13 +599,40 @@ class Estacion:
                 f"pero está en la estación '{self.nombre}'"
             )
         
-        self.pasajeros_esperando.append(pasajero)
+        self._encolar(pasajero)
     
     def agregar_pasajeros(self, pasajeros: List[Pasajero]):
         """Añade múltiples pasajeros a la cola."""
         for pasajero in pasajeros:
             self.agregar_pasajero(pasajero)
     
+    def recibir_transbordo(self, pasajeros: List[Pasajero], tiempo: dt.datetime):
+        """
+        Añade pasajeros que bajaron de un tren para seguir viaje desde aquí.
+        
+        Cada uno empieza un nuevo tramo: su origen pasa a ser esta estación
+        y su llegada el momento del transbordo, así la próxima espera se
+        mide en esta estación.
+        
+        Args:
+            pasajeros: Pasajeros que hacen transbordo
+            tiempo: Momento en que bajaron del tren
+            
+        Raises:
+            ValueError: Si algún pasajero tiene como destino esta estación
+        """
+        segundos = a_segundos(tiempo)
+        for pasajero in pasajeros:
+            Pasajero._validar_parametros(self.nombre, pasajero.destino)
+            if self.tabla is not None:
+                entrada = self.tabla.agregar(self.nombre, pasajero.destino, tiempo, pasajero.id)
+            else:
+                pasajero.origen = self.nombre
+                pasajero.segundos_llegada = segundos
+                pasajero.segundos_partida = None
+                entrada = (next(self._secuencia), pasajero)
+            self._encolar_entrada(entrada, pasajero.destino)
+    
     def despachar_pasajeros(
         self,
         destino: str,
@@ -319,26 +650,136 @@ class Estacion:
         Returns:
             Lista de pasajeros que abordan el tren
         """
-        pasajeros_a_cargar = []
-        pasajeros_restantes = []
-        cargados = 0
+        entradas = self._extraer(destino, capacidad_tren)
+        if not entradas:
+            return []
         
-        tiempo = tiempo_partida or dt.datetime.now()
+        return self._registrar_salida(entradas, tiempo_partida or dt.datetime.now())
+    
+    def agregar_filas(self, filas: List[int]):
+        """
+        Añade pasajeros que ya existen en la tabla de la estación.
         
-        for pasajero in self.pasajeros_esperando:
-            if pasajero.destino == destino and cargados < capacidad_tren:
-                pasajero.registrar_partida(tiempo)
-                pasajeros_a_cargar.append(pasajero)
-                cargados += 1
-            else:
-                pasajeros_restantes.append(pasajero)
+        Args:
+            filas: Números de fila en self.tabla
+            
+        Raises:
+            ValueError: Si la estación no usa tabla o alguna fila tiene otro origen
+        """
+        if self.tabla is None:
+            raise ValueError(f"La estación '{self.nombre}' no usa una tabla de pasajeros")
+        
+        filas = [int(fila) for fila in filas]
+        id_propio = self.tabla.id_estacion(self.nombre)
+        if any(self.tabla.origenes[filas] != id_propio):
+            raise ValueError(f"Hay filas cuyo origen no es la estación '{self.nombre}'")
+        
+        for fila, id_destino in zip(filas, self.tabla.destinos[filas].tolist()):
+            self._encolar_entrada(fila, self.tabla.nombre_estacion(id_destino))
+    
+    def despachar_filas(
+        self,
+        destino: str,
+        capacidad_tren: int,
+        tiempo_partida: Optional[dt.datetime] = None
+    ) -> List[int]:
+        """
+        Igual que despachar_pasajeros, pero retorna números de fila de la tabla.
+        
+        Raises:
+            ValueError: Si la estación no usa una tabla de pasajeros
+        """
+        if self.tabla is None:
+            raise ValueError(f"La estación '{self.nombre}' no usa una tabla de pasajeros")
+        
+        filas = self._extraer(destino, capacidad_tren)
+        if filas:
+            self.tabla.registrar_partida(filas, tiempo_partida or dt.datetime.now())
+        return filas
+    
+    def despachar_siguientes(
+        self,
+        cantidad: int,
+        tiempo_partida: Optional[dt.datetime] = None
+    ) -> List[Pasajero]:
+        """
+        Despacha los primeros pasajeros en llegar, sin importar su destino.
+        
+        Args:
+            cantidad: Cantidad máxima de pasajeros a despachar
+            tiempo_partida: Momento de partida (None usa tiempo actual)
+            
+        Returns:
+            Lista de pasajeros en orden de llegada
+        """
+        bloques = [
+            self._extraer(destino, n) for destino, n in self._contar_primeros(cantidad).items()
+        ]
+        entradas = list(heapq.merge(*bloques))
+        return self._registrar_salida(entradas, tiempo_partida or dt.datetime.now())
+    
+    def despachar_por_destino(
+        self,
+        cantidad: int,
+        tiempo_partida: Optional[dt.datetime] = None
+    ) -> Dict[str, List[Pasajero]]:
+        """
+        Igual que despachar_siguientes, pero agrupa a los pasajeros por destino.
+        Cada grupo sale de su cola en un solo bloque, listo para
+        PasajerosABordo.abordar().
+        
+        Args:
+            cantidad: Cantidad máxima de pasajeros a despachar
+            tiempo_partida: Momento de partida (None usa tiempo actual)
+            
+        Returns:
+            Diccionario {destino: pasajeros en orden de llegada}
+        """
+        tiempo_partida = tiempo_partida or dt.datetime.now()
+        return {
+            destino: self._registrar_salida(self._extraer(destino, n), tiempo_partida)
+            for destino, n in self._contar_primeros(cantidad).items()
+        }
+    
+    def despachar_filas_por_destino(
+        self,
+        cantidad: int,
+        tiempo_partida: Optional[dt.datetime] = None
+    ) -> Dict[str, List[int]]:
+        """
+        Igual que despachar_por_destino, pero retorna números de fila de la
+        tabla, listos para PasajerosABordo.abordar_filas().
+        
+        Raises:
+            ValueError: Si la estación no usa una tabla de pasajeros
+        """
+        if self.tabla is None:
+            raise ValueError(f"La estación '{self.nombre}' no usa una tabla de pasajeros")
         
-        self.pasajeros_esperando = pasajeros_restantes
-        return pasajeros_a_cargar
+        tiempo_partida = tiempo_partida or dt.datetime.now()
+        grupos = {
+            destino: self._extraer(destino, n)
+            for destino, n in self._contar_primeros(cantidad).items()
+        }
+        filas = [fila for grupo in grupos.values() for fila in grupo]
+        if filas:
+            self.tabla.registrar_partida(filas, tiempo_partida)
+        return grupos
+    
+    def quitar_primeros(self, destino: str, cantidad: int) -> int:
+        """
+        Saca de la cola a los pasajeros más antiguos de un destino sin
+        registrar su partida (ej: al aplicar una bitácora de guardado).
+        
+        Returns:
+            Cantidad de pasajeros quitados
+        """
+        return len(self._extraer(destino, cantidad))
     
     def contar_pasajeros_destino(self, destino: str) -> int:
         """Cuenta cuántos pasajeros esperan ir a un destino específico."""
-        return sum(1 for p in self.pasajeros_esperando if p.destino == destino)
+        cola = self._colas_destino.get(destino)
+        return len(cola) if cola else 0
     
     def obtener_destinos_demandados(self) -> Dict[str, int]:
         """
@@ -347,10 +788,7 @@ class Estacion:
         Returns:
             Dict con formato {destino: cantidad_pasajeros}
         """
-        destinos = {}
-        for pasajero in self.pasajeros_esperando:
-            destinos[pasajero.destino] = destinos.get(pasajero.destino, 0) + 1
-        return destinos
+        return {destino: len(cola) for destino, cola in self._colas_destino.items()}
     
     def tiempo_espera_promedio(self) -> float:
         """
@@ -359,20 +797,67 @@ class Estacion:
         Returns:
             Tiempo promedio en minutos, 0 si no hay pasajeros
         """
-        if not self.pasajeros_esperando:
+        if not self._total_esperando:
             return 0.0
         
         ahora = dt.datetime.now()
+        
+        if self.tabla is not None:
+            filas = [fila for cola in self._colas_destino.values() for fila in cola]
+            llegada_media = self.tabla.llegadas[filas].mean()
+            return (a_segundos(ahora) - llegada_media) / 60
+        
         total_minutos = sum(
             (ahora - p.tiempo_llegada).total_seconds() / 60
-            for p in self.pasajeros_esperando
+            for cola in self._colas_destino.values()
+            for _, p in cola
         )
         
-        return total_minutos / len(self.pasajeros_esperando)
+        return total_minutos / self._total_esperando
+    
+    def movimientos(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Salidas acumuladas y pasajeros en espera de cada destino.
+        Permite saber qué cambió en las colas desde un momento anterior
+        sin recorrerlas (ej: para guardar solo los cambios).
+        
+        Returns:
+            Diccionario {destino: (salidas acumuladas, en espera)}
+        """
+        resultado = {destino: (salidas, 0) for destino, salidas in self._salidas_destino.items()}
+        for destino, cola in self._colas_destino.items():
+            resultado[destino] = (self._salidas_destino.get(destino, 0), len(cola))
+        return resultado
+    
+    def ultimos_esperando(self, cantidades: Dict[str, int]) -> List[Pasajero]:
+        """
+        Los últimos pasajeros en llegar de cada destino.
+        
+        Args:
+            cantidades: Diccionario {destino: cantidad} a tomar del final de cada cola
+            
+        Returns:
+            Lista de pasajeros de todos los destinos, en orden de llegada
+        """
+        colas = []
+        for destino, cantidad in cantidades.items():
+            cola = self._colas_destino.get(destino)
+            if cola and cantidad > 0:
+                entradas = list(itertools.islice(reversed(cola), cantidad))
+                entradas.reverse()
+                colas.append(entradas)
+        
+        entradas = list(heapq.merge(*colas))
+        if self.tabla is not None:
+            return self.tabla.vistas(entradas)
+        return [p for _, p in entradas]
     
     def limpiar_pasajeros(self):
         """Elimina todos los pasajeros de la estación."""
-        self.pasajeros_esperando.clear()
+        for destino, cola in self._colas_destino.items():
+            self._salidas_destino[destino] = self._salidas_destino.get(destino, 0) + len(cola)
+        self._colas_destino.clear()
+        self._total_esperando = 0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convierte el objeto a diccionario para serialización."""
@@ -0,0 +1,180 @@
+"""
+Demanda de pasajeros agregada en cohortes.
+Para corridas de planificación de capacidad no se necesita la identidad de
+cada pasajero, solo cuántos hay. Una cohorte es la cantidad de pasajeros
+con el mismo origen, destino y minuto de llegada, así la memoria depende
+de la cantidad de pares origen-destino y no de la cantidad de pasajeros.
+"""
+
+import datetime as dt
+from collections import deque
+from typing import Deque, Dict, List, Tuple, Union
+
+from models.clases import a_segundos
+
+
+MINUTOS_POR_COHORTE = 1   # ancho del intervalo de llegada de cada cohorte
+
+Tiempo = Union[dt.datetime, int, float]
+
+
+def _segundos(tiempo: Tiempo) -> float:
+    return a_segundos(tiempo) if isinstance(tiempo, dt.datetime) else tiempo
+
+
+class CohortesEstacion:
+    """
+    Pasajeros esperando en una estación como conteos por (destino, minuto de llegada).
+
+    Cada destino tiene una cola FIFO de cohortes [minuto, cantidad]; las
+    llegadas del mismo intervalo se suman a la última cohorte. Expone
+    total_esperando y obtener_destinos_demandados igual que Estacion.
+
+    La espera de una cohorte se mide desde el inicio de su intervalo, por lo
+    que puede exceder la real en menos de minutos_por_cohorte.
+
+    Attributes:
+        nombre: Estación de origen de todas las cohortes
+        minutos_por_cohorte: Ancho del intervalo de llegada en minutos
+    """
+
+    def __init__(self, nombre: str, minutos_por_cohorte: int = MINUTOS_POR_COHORTE):
+        if minutos_por_cohorte <= 0:
+            raise ValueError("El ancho de las cohortes debe ser mayor a 0")
+
+        self.nombre = nombre
+        self.minutos_por_cohorte = minutos_por_cohorte
+        self._colas: Dict[str, Deque[List[int]]] = {}
+        self._por_destino: Dict[str, int] = {}
+        self._total_esperando = 0
+
+    @property
+    def total_esperando(self) -> int:
+        """Cantidad total de pasajeros en espera (O(1))."""
+        return self._total_esperando
+
+    def __len__(self) -> int:
+        """Cantidad de cohortes guardadas."""
+        return sum(len(cola) for cola in self._colas.values())
+
+    def agregar(self, destino: str, tiempo_llegada: Tiempo, cantidad: int = 1):
+        """
+        Registra la llegada de pasajeros a la estación.
+
+        Args:
+            destino: Estación de destino
+            tiempo_llegada: Momento de llegada (datetime o segundos desde EPOCA)
+            cantidad: Pasajeros que llegan
+
+        Raises:
+            ValueError: Si el destino es la misma estación o la cantidad no es positiva
+        """
+        if destino == self.nombre:
+            raise ValueError("El origen y destino deben ser diferentes")
+        if cantidad <= 0:
+            raise ValueError("La cantidad de pasajeros debe ser mayor a 0")
+
+        minuto = int(_segundos(tiempo_llegada) // 60) // self.minutos_por_cohorte * self.minutos_por_cohorte
+        cola = self._colas.get(destino)
+        if cola is None:
+            cola = self._colas[destino] = deque()
+        if cola and cola[-1][0] == minuto:
+            cola[-1][1] += cantidad
+        else:
+            cola.append([minuto, cantidad])
+
+        self._por_destino[destino] = self._por_destino.get(destino, 0) + cantidad
+        self._total_esperando += cantidad
+
+    def obtener_destinos_demandados(self) -> Dict[str, int]:
+        """Diccionario {destino: pasajeros esperando}."""
+        return dict(self._por_destino)
+
+    def cohortes(self, destino: str) -> List[Tuple[int, int]]:
+        """Cohortes (minuto de llegada, cantidad) de un destino en orden de llegada."""
+        return [(minuto, cantidad) for minuto, cantidad in self._colas.get(destino, ())]
+
+    def despachar(self, destino: str, capacidad: int, tiempo_partida: Tiempo) -> Tuple[int, float, float]:
+        """
+        Sube al tren a los pasajeros más antiguos de un destino.
+
+        Args:
+            destino: Estación de destino
+            capacidad: Espacio disponible en el tren
+            tiempo_partida: Momento de partida (datetime o segundos desde EPOCA)
+
+        Returns:
+            Tupla (pasajeros que suben, suma de sus esperas en minutos,
+            espera máxima en minutos)
+        """
+        cola = self._colas.get(destino)
+        if not cola or capacidad <= 0:
+            return 0, 0.0, 0.0
+
+        minuto_partida = _segundos(tiempo_partida) / 60
+        # La cohorte más antigua es la que más esperó
+        espera_maxima = minuto_partida - cola[0][0]
+        suben = 0
+        espera_total = 0.0
+
+        while cola and suben < capacidad:
+            cohorte = cola[0]
+            cantidad = min(cohorte[1], capacidad - suben)
+            espera_total += cantidad * (minuto_partida - cohorte[0])
+            suben += cantidad
+            cohorte[1] -= cantidad
+            if cohorte[1] == 0:
+                cola.popleft()
+
+        if not cola:
+            del self._colas[destino]
+            del self._por_destino[destino]
+        else:
+            self._por_destino[destino] -= suben
+        self._total_esperando -= suben
+        return suben, espera_total, espera_maxima
+
+    def limpiar(self):
+        self._colas.clear()
+        self._por_destino.clear()
+        self._total_esperando = 0
+
+
+class CohortesABordo:
+    """
+    Pasajeros a bordo de un tren como conteos por destino.
+    Reemplaza a PasajerosABordo en el modo de cohortes: bajar retorna la
+    cantidad de pasajeros en vez de la lista.
+    """
+
+    def __init__(self):
+        self._por_destino: Dict[str, int] = {}
+        self._total = 0
+
+    def __len__(self) -> int:
+        return self._total
+
+    def abordar(self, destino: str, cantidad: int):
+        """Sube `cantidad` pasajeros con un destino."""
+        if cantidad <= 0:
+            return
+        self._por_destino[destino] = self._por_destino.get(destino, 0) + cantidad
+        self._total += cantidad
+
+    def bajar(self, destino: str) -> int:
+        """Baja a todos los pasajeros de un destino y retorna cuántos eran."""
+        cantidad = self._por_destino.pop(destino, 0)
+        self._total -= cantidad
+        return cantidad
+
+    def cantidad(self, destino: str) -> int:
+        """Pasajeros a bordo que van a un destino."""
+        return self._por_destino.get(destino, 0)
+
+    def destinos(self) -> Dict[str, int]:
+        """Diccionario {destino: cantidad de pasajeros a bordo}."""
+        return dict(self._por_destino)
+
+    def limpiar(self):
+        self._por_destino.clear()
+        self._total = 0
@@ -0,0 +1,120 @@
+"""
+Índice espacial de estaciones.
+Responde "qué estación está en o cerca de este punto" sin recorrer
+simulador.estaciones: estación más cercana, estaciones en un radio y en un
+rectángulo. Se mantiene sincronizado al añadir y quitar estaciones.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models.clases import Estacion
+from models.rejilla_espacial import RejillaEspacial, TAMANO_CELDA
+
+
+class IndiceEstaciones:
+    """
+    Índice de estaciones por coordenadas respaldado por una rejilla uniforme.
+
+    Las consultas cuestan O(celdas revisadas + candidatos), independiente
+    del total de estaciones mientras la densidad sea pareja.
+
+    Attributes:
+        tamano_celda: Lado de cada celda en unidades del mapa
+    """
+
+    def __init__(self, tamano_celda: float = TAMANO_CELDA):
+        self.tamano_celda = tamano_celda
+        self._rejilla = RejillaEspacial(tamano_celda)
+        self._posiciones: Dict[str, Tuple[float, float]] = {}
+
+    @classmethod
+    def desde_estaciones(cls, estaciones: Dict[str, Estacion], tamano_celda: float = TAMANO_CELDA) -> 'IndiceEstaciones':
+        """Construye el índice a partir del diccionario {nombre: Estacion}."""
+        indice = cls(tamano_celda)
+        for estacion in estaciones.values():
+            indice.agregar(estacion)
+        return indice
+
+    def __len__(self) -> int:
+        return len(self._posiciones)
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self._posiciones
+
+    # ========== SINCRONIZACIÓN ==========
+
+    def agregar(self, estacion: Estacion):
+        """Añade o reubica una estación."""
+        posicion = (estacion.coordenada_x, estacion.coordenada_y)
+        self._posiciones[estacion.nombre] = posicion
+        self._rejilla.insertar(estacion.nombre, *posicion)
+
+    def quitar(self, nombre: str) -> bool:
+        """Quita una estación. Retorna False si no estaba indexada."""
+        if self._posiciones.pop(nombre, None) is None:
+            return False
+        return self._rejilla.quitar(nombre)
+
+    def sincronizar(self, estaciones: Dict[str, Estacion]) -> int:
+        """
+        Aplica las altas, bajas y movimientos respecto del diccionario actual.
+
+        Returns:
+            Cantidad de estaciones actualizadas en el índice
+        """
+        cambios = 0
+        for nombre in [n for n in self._posiciones if n not in estaciones]:
+            self.quitar(nombre)
+            cambios += 1
+        for nombre, estacion in estaciones.items():
+            if self._posiciones.get(nombre) != (estacion.coordenada_x, estacion.coordenada_y):
+                self.agregar(estacion)
+                cambios += 1
+        return cambios
+
+    # ========== CONSULTAS ==========
+
+    def mas_cercana(self, x: float, y: float, radio_max: Optional[float] = None) -> Optional[str]:
+        """
+        Estación más cercana a un punto.
+
+        Args:
+            x, y: Coordenadas del punto
+            radio_max: Distancia máxima aceptada (None sin límite)
+
+        Returns:
+            Nombre de la estación o None si no hay ninguna en el radio
+        """
+        resultado = self._rejilla.mas_cercano(x, y, radio_max)
+        return None if resultado is None else resultado[1]
+
+    def distancia_mas_cercana(self, x: float, y: float) -> Optional[Tuple[str, float]]:
+        """Tupla (nombre, distancia) de la estación más cercana, None si el índice está vacío."""
+        resultado = self._rejilla.mas_cercano(x, y)
+        return None if resultado is None else (resultado[1], resultado[0])
+
+    def en_radio(self, x: float, y: float, radio: float) -> List[str]:
+        """Estaciones a distancia menor o igual a radio, de la más cercana a la más lejana."""
+        return [nombre for _, nombre in self._rejilla.en_radio(x, y, radio)]
+
+    def en_rectangulo(self, x1: float, y1: float, x2: float, y2: float) -> List[str]:
+        """Estaciones dentro del rectángulo (x1, y1)-(x2, y2)."""
+        return list(self._rejilla.en_rectangulo(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)))
+
+    def asignar_captacion(
+        self,
+        puntos: Iterable[Tuple[float, float]],
+        radio_max: Optional[float] = None
+    ) -> List[Optional[str]]:
+        """
+        Asigna cada punto (por ejemplo, el domicilio de un cliente) a la
+        estación más cercana, para generar pasajeros por área de captación.
+
+        Args:
+            puntos: Coordenadas (x, y) a asignar
+            radio_max: Distancia máxima a una estación (None sin límite)
+
+        Returns:
+            Nombre de la estación de cada punto (None si queda fuera del radio)
+        """
+        return [self.mas_cercana(x, y, radio_max) for x, y in puntos]
@@ -0,0 +1,172 @@
+"""
+Registro indexado de rutas.
+Reemplaza a la lista simulador.rutas manteniendo su interfaz (iterar,
+len, append, remove) y agrega índices para que verificar, buscar y quitar
+rutas no requiera recorrer toda la red.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from models.clases import Ruta
+
+
+class RegistroRutas:
+    """
+    Colección de rutas con índice por par de estaciones y por estación.
+
+    Las rutas se consideran bidireccionales: el par (A, B) es el mismo que
+    (B, A). Se conserva el orden de inserción al iterar.
+
+    Complejidad:
+        existe / buscar / quitar: O(1) (más las rutas paralelas del par)
+        quitar_estacion: O(grado de la estación)
+    """
+
+    def __init__(self, rutas: Optional[Iterable[Ruta]] = None):
+        # Ruta define __eq__ sin __hash__, por eso se indexa por id()
+        self._rutas: Dict[int, Ruta] = {}
+        self._por_par: Dict[frozenset, List[Ruta]] = {}
+        self._adyacencia: Dict[str, Set[frozenset]] = {}
+
+        for ruta in rutas or ():
+            self.append(ruta)
+
+    @staticmethod
+    def _par(origen: str, destino: str) -> frozenset:
+        return frozenset((origen, destino))
+
+    def __len__(self) -> int:
+        return len(self._rutas)
+
+    def __iter__(self) -> Iterator[Ruta]:
+        return iter(list(self._rutas.values()))
+
+    def __contains__(self, ruta: Ruta) -> bool:
+        return self.existe(ruta.origen, ruta.destino, ruta.distancia_km)
+
+    def __repr__(self) -> str:
+        return f"RegistroRutas({list(self._rutas.values())!r})"
+
+    # ========== ALTAS Y BAJAS ==========
+
+    def append(self, ruta: Ruta):
+        """Añade una ruta al registro."""
+        par = self._par(ruta.origen, ruta.destino)
+        self._rutas[id(ruta)] = ruta
+        self._por_par.setdefault(par, []).append(ruta)
+        self._adyacencia.setdefault(ruta.origen, set()).add(par)
+        self._adyacencia.setdefault(ruta.destino, set()).add(par)
+
+    def extend(self, rutas: Iterable[Ruta]):
+        """Añade varias rutas al registro."""
+        for ruta in rutas:
+            self.append(ruta)
+
+    def _descartar(self, ruta: Ruta):
+        """Quita una ruta concreta de todos los índices."""
+        par = self._par(ruta.origen, ruta.destino)
+        del self._rutas[id(ruta)]
+
+        paralelas = self._por_par[par]
+        paralelas.remove(ruta)
+        if paralelas:
+            return
+
+        del self._por_par[par]
+        for estacion in par:
+            vecinas = self._adyacencia.get(estacion)
+            if vecinas is not None:
+                vecinas.discard(par)
+                if not vecinas:
+                    del self._adyacencia[estacion]
+
+    def remove(self, ruta: Ruta):
+        """
+        Quita una ruta igual a la indicada (en cualquier dirección).
+
+        Raises:
+            ValueError: Si la ruta no está registrada
+        """
+        if self.quitar(ruta.origen, ruta.destino, ruta.distancia_km) is None:
+            raise ValueError(f"La ruta no está registrada: {ruta}")
+
+    def quitar(self, origen: str, destino: str, distancia: Optional[float] = None) -> Optional[Ruta]:
+        """
+        Quita una ruta entre dos estaciones (en cualquier dirección).
+
+        Args:
+            origen: Estación de un extremo
+            destino: Estación del otro extremo
+            distancia: Si se indica, solo quita la ruta con esa distancia
+
+        Returns:
+            La ruta eliminada o None si no existía
+        """
+        ruta = self.buscar(origen, destino, distancia)
+        if ruta is not None:
+            self._descartar(ruta)
+        return ruta
+
+    def quitar_estacion(self, estacion: str) -> int:
+        """
+        Quita todas las rutas que llegan o salen de una estación.
+
+        Returns:
+            Cantidad de rutas eliminadas
+        """
+        eliminadas = 0
+        for par in list(self._adyacencia.get(estacion, ())):
+            for ruta in list(self._por_par.get(par, ())):
+                self._descartar(ruta)
+                eliminadas += 1
+        return eliminadas
+
+    def limpiar(self):
+        """Elimina todas las rutas."""
+        self._rutas.clear()
+        self._por_par.clear()
+        self._adyacencia.clear()
+
+    # ========== CONSULTAS ==========
+
+    def buscar(self, origen: str, destino: str, distancia: Optional[float] = None) -> Optional[Ruta]:
+        """
+        Busca una ruta entre dos estaciones (en cualquier dirección).
+
+        Args:
+            origen: Estación de un extremo
+            destino: Estación del otro extremo
+            distancia: Si se indica, la ruta debe tener esa distancia
+
+        Returns:
+            La primera ruta encontrada o None
+        """
+        for ruta in self._por_par.get(self._par(origen, destino), ()):
+            if distancia is None or ruta.distancia_km == distancia:
+                return ruta
+        return None
+
+    def existe(self, origen: str, destino: str, distancia: Optional[float] = None) -> bool:
+        """Verifica si existe una ruta entre dos estaciones (en cualquier dirección)."""
+        return self.buscar(origen, destino, distancia) is not None
+
+    def rutas_de(self, estacion: str) -> List[Ruta]:
+        """Rutas que llegan o salen de una estación."""
+        return [
+            ruta
+            for par in self._adyacencia.get(estacion, ())
+            for ruta in self._por_par[par]
+        ]
+
+    def vecinos(self, estacion: str) -> Set[str]:
+        """Estaciones unidas directamente a la indicada."""
+        return {
+            otra
+            for par in self._adyacencia.get(estacion, ())
+            for otra in par
+            if otra != estacion
+        }
+
+    def grado(self, estacion: str) -> int:
+        """Cantidad de estaciones vecinas de una estación."""
+        return len(self._adyacencia.get(estacion, ()))
@@ -0,0 +1,245 @@
+"""
+Rejilla espacial uniforme sobre coordenadas del mapa.
+Divide el plano en celdas cuadradas y guarda en cada celda las claves de
+los elementos (puntos o cajas) que la tocan, para consultar qué hay en un
+rectángulo sin recorrer todos los elementos.
+"""
+
+import itertools
+import math
+from typing import Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+
+TAMANO_CELDA = 100
+# Elementos que tocan más celdas que esto se revisan aparte en cada consulta
+MAX_CELDAS_POR_ELEMENTO = 64
+
+Caja = Tuple[float, float, float, float]
+
+
+class RejillaEspacial:
+    """
+    Índice espacial de celdas uniformes.
+
+    Cada elemento se registra con su caja (x1, y1, x2, y2); un punto es una
+    caja degenerada. Insertar, mover y quitar cuestan O(celdas que toca el
+    elemento) y una consulta O(celdas del rectángulo + candidatos). Las
+    cajas muy grandes (rutas largas) no se reparten en celdas: se guardan
+    en una lista aparte que se revisa en cada consulta.
+
+    Attributes:
+        tamano_celda: Lado de cada celda en unidades del mapa
+    """
+
+    def __init__(self, tamano_celda: float = TAMANO_CELDA):
+        if tamano_celda <= 0:
+            raise ValueError("El tamaño de celda debe ser mayor a 0")
+
+        self.tamano_celda = tamano_celda
+        self._celdas: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._cajas: Dict[Hashable, Caja] = {}
+        self._grandes: Set[Hashable] = set()
+        # Celdas extremas usadas alguna vez (acota la búsqueda del más cercano)
+        self._extension: Optional[Tuple[int, int, int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._cajas)
+
+    def __contains__(self, clave: Hashable) -> bool:
+        return clave in self._cajas
+
+    def celda(self, x: float, y: float) -> Tuple[int, int]:
+        """Celda que contiene un punto."""
+        return math.floor(x / self.tamano_celda), math.floor(y / self.tamano_celda)
+
+    def _cantidad_celdas(self, caja: Caja) -> int:
+        """Cantidad de celdas que toca una caja."""
+        cx1, cy1 = self.celda(min(caja[0], caja[2]), min(caja[1], caja[3]))
+        cx2, cy2 = self.celda(max(caja[0], caja[2]), max(caja[1], caja[3]))
+        return (cx2 - cx1 + 1) * (cy2 - cy1 + 1)
+
+    def _celdas_de(self, caja: Caja) -> Iterator[Tuple[int, int]]:
+        """Recorre las celdas que toca una caja."""
+        cx1, cy1 = self.celda(min(caja[0], caja[2]), min(caja[1], caja[3]))
+        cx2, cy2 = self.celda(max(caja[0], caja[2]), max(caja[1], caja[3]))
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                yield cx, cy
+
+    # ========== ALTAS Y BAJAS ==========
+
+    def insertar(self, clave: Hashable, x1: float, y1: float, x2: float = None, y2: float = None):
+        """
+        Registra un punto (x1, y1) o una caja (x1, y1, x2, y2).
+        Si la clave ya existía, se reemplaza su posición.
+        """
+        if clave in self._cajas:
+            self.quitar(clave)
+
+        caja = (x1, y1, x1 if x2 is None else x2, y1 if y2 is None else y2)
+        self._cajas[clave] = caja
+        if self._cantidad_celdas(caja) > MAX_CELDAS_POR_ELEMENTO:
+            self._grandes.add(clave)
+            return
+        for celda in self._celdas_de(caja):
+            self._celdas.setdefault(celda, set()).add(clave)
+            self._extender(celda)
+
+    def _extender(self, celda: Tuple[int, int]):
+        if self._extension is None:
+            self._extension = (celda[0], celda[1], celda[0], celda[1])
+            return
+        cx1, cy1, cx2, cy2 = self._extension
+        self._extension = (
+            min(cx1, celda[0]), min(cy1, celda[1]),
+            max(cx2, celda[0]), max(cy2, celda[1])
+        )
+
+    def mover(self, clave: Hashable, x1: float, y1: float, x2: float = None, y2: float = None):
+        """Cambia la posición de un elemento ya registrado."""
+        self.insertar(clave, x1, y1, x2, y2)
+
+    def quitar(self, clave: Hashable) -> bool:
+        """Quita un elemento. Retorna False si no estaba registrado."""
+        caja = self._cajas.pop(clave, None)
+        if caja is None:
+            return False
+        if clave in self._grandes:
+            self._grandes.discard(clave)
+            return True
+
+        for celda in self._celdas_de(caja):
+            claves = self._celdas.get(celda)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._celdas[celda]
+        return True
+
+    def limpiar(self):
+        """Elimina todos los elementos."""
+        self._celdas.clear()
+        self._cajas.clear()
+        self._grandes.clear()
+        self._extension = None
+
+    # ========== CONSULTAS ==========
+
+    def caja(self, clave: Hashable) -> Caja:
+        """Caja registrada de un elemento (KeyError si no existe)."""
+        return self._cajas[clave]
+
+    def en_rectangulo(self, x1: float, y1: float, x2: float, y2: float) -> Set[Hashable]:
+        """
+        Elementos cuya caja se intersecta con el rectángulo indicado.
+
+        Args:
+            x1, y1: Esquina superior izquierda
+            x2, y2: Esquina inferior derecha
+
+        Returns:
+            Conjunto de claves
+        """
+        encontrados = set()
+        cx1, cy1 = self.celda(x1, y1)
+        cx2, cy2 = self.celda(x2, y2)
+
+        # Si el rectángulo abarca más celdas de las que hay ocupadas, se recorren las ocupadas
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._celdas):
+            celdas = (
+                claves for (cx, cy), claves in self._celdas.items()
+                if cx1 <= cx <= cx2 and cy1 <= cy <= cy2
+            )
+        else:
+            celdas = (
+                self._celdas[(cx, cy)]
+                for cx in range(cx1, cx2 + 1)
+                for cy in range(cy1, cy2 + 1)
+                if (cx, cy) in self._celdas
+            )
+
+        for claves in itertools.chain(celdas, (self._grandes,)):
+            for clave in claves:
+                if clave in encontrados:
+                    continue
+                bx1, by1, bx2, by2 = self._cajas[clave]
+                if (min(bx1, bx2) <= x2 and max(bx1, bx2) >= x1 and
+                        min(by1, by2) <= y2 and max(by1, by2) >= y1):
+                    encontrados.add(clave)
+        return encontrados
+
+    def distancia(self, clave: Hashable, x: float, y: float) -> float:
+        """Distancia de un punto a la caja de un elemento (0 si está dentro)."""
+        bx1, by1, bx2, by2 = self._cajas[clave]
+        dx = max(min(bx1, bx2) - x, 0.0, x - max(bx1, bx2))
+        dy = max(min(by1, by2) - y, 0.0, y - max(by1, by2))
+        return math.hypot(dx, dy)
+
+    def en_radio(self, x: float, y: float, radio: float) -> List[Tuple[float, Hashable]]:
+        """
+        Elementos a distancia menor o igual a radio de un punto.
+
+        Returns:
+            Lista de tuplas (distancia, clave) ordenada por distancia
+        """
+        candidatos = self.en_rectangulo(x - radio, y - radio, x + radio, y + radio)
+        encontrados = []
+        for clave in candidatos:
+            distancia = self.distancia(clave, x, y)
+            if distancia <= radio:
+                encontrados.append((distancia, clave))
+        encontrados.sort(key=lambda par: par[0])
+        return encontrados
+
+    def mas_cercano(self, x: float, y: float, radio_max: Optional[float] = None) -> Optional[Tuple[float, Hashable]]:
+        """
+        Elemento más cercano a un punto, buscando en anillos de celdas
+        alrededor del punto hasta que ningún anillo pueda mejorar el resultado.
+
+        Args:
+            x, y: Punto de consulta
+            radio_max: Distancia máxima aceptada (None sin límite)
+
+        Returns:
+            Tupla (distancia, clave) o None si no hay elementos en el radio
+        """
+        mejor: Optional[Tuple[float, Hashable]] = None
+        for clave in self._grandes:
+            distancia = self.distancia(clave, x, y)
+            if mejor is None or distancia < mejor[0]:
+                mejor = (distancia, clave)
+
+        if self._extension is not None:
+            cx, cy = self.celda(x, y)
+            ex1, ey1, ex2, ey2 = self._extension
+            # Ningún elemento en celdas queda más allá de este anillo
+            anillo_max = max(cx - ex1, ex2 - cx, cy - ey1, ey2 - cy, 0)
+            if radio_max is not None:
+                anillo_max = min(anillo_max, int(radio_max // self.tamano_celda) + 1)
+
+            for anillo in range(anillo_max + 1):
+                # Todo punto de este anillo está al menos a (anillo - 1) celdas
+                if mejor is not None and mejor[0] <= (anillo - 1) * self.tamano_celda:
+                    break
+                for celda in self._anillo(cx, cy, anillo):
+                    for clave in self._celdas.get(celda, ()):
+                        distancia = self.distancia(clave, x, y)
+                        if mejor is None or distancia < mejor[0]:
+                            mejor = (distancia, clave)
+
+        if mejor is None or (radio_max is not None and mejor[0] > radio_max):
+            return None
+        return mejor
+
+    @staticmethod
+    def _anillo(cx: int, cy: int, anillo: int) -> Iterator[Tuple[int, int]]:
+        """Celdas a distancia de Chebyshev exactamente `anillo` de (cx, cy)."""
+        if anillo == 0:
+            yield cx, cy
+            return
+        for dx in range(-anillo, anillo + 1):
+            yield cx + dx, cy - anillo
+            yield cx + dx, cy + anillo
+        for dy in range(-anillo + 1, anillo):
+            yield cx - anillo, cy + dy
+            yield cx + anillo, cy + dy
@@ -0,0 +1,319 @@
+"""
+Almacenamiento columnar de pasajeros.
+Guarda ids, estaciones de origen/destino y tiempos como arreglos de NumPy
+(estructura de arreglos) en vez de un objeto Python por pasajero. Las
+estaciones y los trenes se refieren a los pasajeros por su número de fila.
+
+NumPy es una dependencia opcional: solo se necesita si se usa esta tabla.
+"""
+
+import datetime as dt
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy es opcional
+    np = None
+
+from models.clases import Pasajero, a_segundos, desde_segundos
+
+
+SIN_PARTIDA = -1
+CAPACIDAD_INICIAL = 1024
+
+
+class PasajeroVista:
+    """
+    Vista liviana de una fila de TablaPasajeros.
+
+    Ofrece la misma interfaz de lectura que Pasajero, convirtiendo los
+    tiempos a datetime solo cuando se consultan.
+    """
+
+    __slots__ = ("_tabla", "fila")
+
+    def __init__(self, tabla: 'TablaPasajeros', fila: int):
+        self._tabla = tabla
+        self.fila = fila
+
+    @property
+    def tabla(self) -> 'TablaPasajeros':
+        return self._tabla
+
+    @property
+    def id(self) -> int:
+        return int(self._tabla._ids[self.fila])
+
+    @property
+    def origen(self) -> str:
+        return self._tabla.nombre_estacion(self._tabla._origenes[self.fila])
+
+    @property
+    def destino(self) -> str:
+        return self._tabla.nombre_estacion(self._tabla._destinos[self.fila])
+
+    @property
+    def tiempo_llegada(self) -> dt.datetime:
+        return desde_segundos(self._tabla._llegadas[self.fila])
+
+    @property
+    def tiempo_partida(self) -> Optional[dt.datetime]:
+        partida = self._tabla._partidas[self.fila]
+        return None if partida == SIN_PARTIDA else desde_segundos(partida)
+
+    def __str__(self) -> str:
+        estado = "Esperando" if self.esta_esperando() else "En tránsito"
+        return f"Pasajero #{self.id} | {self.origen} → {self.destino} | Estado: {estado}"
+
+    def __repr__(self) -> str:
+        return f"PasajeroVista(fila={self.fila}, id={self.id})"
+
+    def registrar_partida(self, tiempo: Optional[dt.datetime] = None):
+        """Registra el momento en que el pasajero aborda el tren."""
+        self._tabla.registrar_partida([self.fila], tiempo or dt.datetime.now())
+
+    def tiempo_espera(self) -> dt.timedelta:
+        """Duración de la espera. Si aún no parte, retorna timedelta(0)."""
+        return dt.timedelta(seconds=int(self._tabla.tiempos_espera([self.fila])[0]))
+
+    def tiempo_espera_minutos(self) -> float:
+        """Tiempo de espera en minutos."""
+        return float(self._tabla.tiempos_espera([self.fila])[0]) / 60
+
+    def esta_esperando(self) -> bool:
+        """Verifica si el pasajero aún está esperando."""
+        return self._tabla._partidas[self.fila] == SIN_PARTIDA
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte la fila a diccionario con el formato de Pasajero.to_dict."""
+        partida = self.tiempo_partida
+        return {
+            'id': self.id,
+            'origen': self.origen,
+            'destino': self.destino,
+            'tiempo_llegada': self.tiempo_llegada.isoformat(),
+            'tiempo_partida': partida.isoformat() if partida else None
+        }
+
+
+class TablaPasajeros:
+    """
+    Tabla columnar de pasajeros respaldada por arreglos de NumPy.
+
+    Cada pasajero ocupa una fila. Los tiempos se guardan como segundos
+    enteros (int64) desde EPOCA y las estaciones como ids enteros.
+
+    Attributes:
+        ids: Identificadores de pasajero (int64)
+        origenes: Id de la estación de origen (int32)
+        destinos: Id de la estación de destino (int32)
+        llegadas: Llegada a la estación en segundos (int64)
+        partidas: Abordaje en segundos, SIN_PARTIDA si aún espera (int64)
+    """
+
+    def __init__(self, capacidad_inicial: int = CAPACIDAD_INICIAL):
+        if np is None:
+            raise ImportError("TablaPasajeros requiere NumPy (pip install numpy)")
+
+        capacidad = max(1, capacidad_inicial)
+        self._n = 0
+        self._ids = np.empty(capacidad, dtype=np.int64)
+        self._origenes = np.empty(capacidad, dtype=np.int32)
+        self._destinos = np.empty(capacidad, dtype=np.int32)
+        self._llegadas = np.empty(capacidad, dtype=np.int64)
+        self._partidas = np.full(capacidad, SIN_PARTIDA, dtype=np.int64)
+
+        self._nombres: List[str] = []
+        self._indice_estaciones: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._n
+
+    # ========== COLUMNAS ==========
+
+    @property
+    def ids(self):
+        return self._ids[:self._n]
+
+    @property
+    def origenes(self):
+        return self._origenes[:self._n]
+
+    @property
+    def destinos(self):
+        return self._destinos[:self._n]
+
+    @property
+    def llegadas(self):
+        return self._llegadas[:self._n]
+
+    @property
+    def partidas(self):
+        return self._partidas[:self._n]
+
+    # ========== ESTACIONES ==========
+
+    def id_estacion(self, nombre: str) -> int:
+        """Retorna el id entero de una estación, registrándola si es nueva."""
+        id_estacion = self._indice_estaciones.get(nombre)
+        if id_estacion is None:
+            id_estacion = len(self._nombres)
+            self._indice_estaciones[nombre] = id_estacion
+            self._nombres.append(nombre)
+        return id_estacion
+
+    def nombre_estacion(self, id_estacion: int) -> str:
+        """Retorna el nombre de una estación a partir de su id."""
+        return self._nombres[int(id_estacion)]
+
+    # ========== ALTAS ==========
+
+    def _asegurar_capacidad(self, extra: int):
+        """Duplica el tamaño de las columnas cuando no caben `extra` filas más."""
+        requerido = self._n + extra
+        capacidad = len(self._ids)
+        if requerido <= capacidad:
+            return
+
+        while capacidad < requerido:
+            capacidad *= 2
+
+        for nombre in ("_ids", "_origenes", "_destinos", "_llegadas"):
+            viejo = getattr(self, nombre)
+            nuevo = np.empty(capacidad, dtype=viejo.dtype)
+            nuevo[:self._n] = viejo[:self._n]
+            setattr(self, nombre, nuevo)
+
+        partidas = np.full(capacidad, SIN_PARTIDA, dtype=np.int64)
+        partidas[:self._n] = self._partidas[:self._n]
+        self._partidas = partidas
+
+    def agregar(
+        self,
+        origen: str,
+        destino: str,
+        tiempo_llegada: dt.datetime,
+        id_pasajero: Optional[int] = None
+    ) -> int:
+        """
+        Añade un pasajero a la tabla.
+
+        Args:
+            origen: Estación de origen
+            destino: Estación de destino
+            tiempo_llegada: Momento de llegada a la estación
+            id_pasajero: Id a usar (None toma el siguiente de Pasajero.id_counter)
+
+        Returns:
+            Número de fila del pasajero
+        """
+        Pasajero._validar_parametros(origen, destino)
+
+        if id_pasajero is None:
+            id_pasajero = Pasajero.id_counter
+        if id_pasajero >= Pasajero.id_counter:
+            Pasajero.id_counter = id_pasajero + 1
+
+        self._asegurar_capacidad(1)
+        fila = self._n
+        self._ids[fila] = id_pasajero
+        self._origenes[fila] = self.id_estacion(origen)
+        self._destinos[fila] = self.id_estacion(destino)
+        self._llegadas[fila] = a_segundos(tiempo_llegada)
+        self._partidas[fila] = SIN_PARTIDA
+        self._n += 1
+        return fila
+
+    def agregar_pasajero(self, pasajero: Pasajero) -> int:
+        """Copia un objeto Pasajero a la tabla, conservando su id y partida."""
+        fila = self.agregar(
+            pasajero.origen, pasajero.destino, pasajero.tiempo_llegada, pasajero.id
+        )
+        if pasajero.tiempo_partida:
+            self._partidas[fila] = a_segundos(pasajero.tiempo_partida)
+        return fila
+
+    def agregar_lote(self, origenes: Sequence[int], destinos: Sequence[int], llegadas: Sequence[int]):
+        """
+        Añade un lote de pasajeros en una sola operación.
+
+        Args:
+            origenes: Ids de estación de origen
+            destinos: Ids de estación de destino
+            llegadas: Tiempos de llegada en segundos desde EPOCA
+
+        Returns:
+            Arreglo con los números de fila asignados
+
+        Raises:
+            ValueError: Si los largos no coinciden, algún id de estación no
+                existe o algún origen es igual a su destino
+        """
+        origenes = np.asarray(origenes, dtype=np.int32)
+        destinos = np.asarray(destinos, dtype=np.int32)
+        llegadas = np.asarray(llegadas, dtype=np.int64)
+
+        cantidad = len(origenes)
+        if len(destinos) != cantidad or len(llegadas) != cantidad:
+            raise ValueError("Los arreglos del lote deben tener el mismo largo")
+        if cantidad == 0:
+            return np.empty(0, dtype=np.int64)
+        if np.any(origenes == destinos):
+            raise ValueError("El origen y destino deben ser diferentes")
+        ids_estacion = np.concatenate((origenes, destinos))
+        if ids_estacion.min() < 0 or ids_estacion.max() >= len(self._nombres):
+            raise ValueError("El lote contiene ids de estación no registrados")
+
+        self._asegurar_capacidad(cantidad)
+        inicio, fin = self._n, self._n + cantidad
+        self._ids[inicio:fin] = np.arange(Pasajero.id_counter, Pasajero.id_counter + cantidad)
+        self._origenes[inicio:fin] = origenes
+        self._destinos[inicio:fin] = destinos
+        self._llegadas[inicio:fin] = llegadas
+        self._partidas[inicio:fin] = SIN_PARTIDA
+
+        Pasajero.id_counter += cantidad
+        self._n = fin
+        return np.arange(inicio, fin, dtype=np.int64)
+
+    # ========== OPERACIONES POR FILAS ==========
+
+    def registrar_partida(self, filas: Sequence[int], tiempo: dt.datetime):
+        """Registra el mismo momento de abordaje para varias filas."""
+        self._partidas[np.asarray(filas, dtype=np.int64)] = a_segundos(tiempo)
+
+    def tiempos_espera(self, filas: Sequence[int]):
+        """Segundos de espera de cada fila (0 para quienes aún esperan)."""
+        filas = np.asarray(filas, dtype=np.int64)
+        partidas = self._partidas[filas]
+        return np.where(partidas == SIN_PARTIDA, 0, partidas - self._llegadas[filas])
+
+    def separar_por_destino(self, filas: Sequence[int], destino: str) -> Tuple[Any, Any]:
+        """
+        Separa filas según si su destino es la estación indicada.
+        Pensado para el desembarque de un tren que guarda filas.
+
+        Returns:
+            Tupla (filas_que_bajan, filas_que_siguen)
+        """
+        filas = np.asarray(filas, dtype=np.int64)
+        id_destino = self._indice_estaciones.get(destino)
+        if id_destino is None:
+            return filas[:0], filas
+        bajan = self._destinos[filas] == id_destino
+        return filas[bajan], filas[~bajan]
+
+    def vista(self, fila: int) -> PasajeroVista:
+        """Retorna una vista compatible con Pasajero para la fila."""
+        return PasajeroVista(self, int(fila))
+
+    def vistas(self, filas: Sequence[int]) -> List[PasajeroVista]:
+        """Retorna vistas para varias filas."""
+        return [PasajeroVista(self, int(fila)) for fila in filas]
+
+    def memoria_bytes(self) -> int:
+        """Memoria reservada por las columnas, en bytes."""
+        return sum(
+            columna.nbytes
+            for columna in (self._ids, self._origenes, self._destinos, self._llegadas, self._partidas)
+        )
@@ -0,0 +1,199 @@
+"""
+Pruebas del guardado incremental con bitácora: ida y vuelta de los cambios
+y recuperación cuando un guardado interrumpido deja la bitácora dañada.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import contextlib
+import datetime as dt
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from logic import Guardado, bitacora_guardado
+from logic.bitacora_guardado import BitacoraGuardado
+from logic.Guardado import cargar_datos, serializar_trenes, serializar_estaciones, serializar_rutas
+from models.clases import Tren, Estacion, Ruta, Pasajero
+from tests.test_guardado_binario import FECHA, crear_estado
+
+
+class PruebaBitacora(unittest.TestCase):
+
+    def setUp(self):
+        self._directorio = tempfile.TemporaryDirectory()
+        directorio = self._directorio.name
+        ruta_datos = os.path.join(directorio, Guardado.DATA_FILENAME)
+        parches = [
+            mock.patch.multiple(
+                Guardado,
+                SAVE_DIR=directorio,
+                DATA_FILE_PATH=ruta_datos,
+                BACKUP_FILE_PATH=os.path.join(directorio, Guardado.BACKUP_FILENAME),
+                CATALOG_FILE_PATH=os.path.join(directorio, Guardado.CATALOG_FILENAME)
+            ),
+            mock.patch.object(bitacora_guardado, "DATA_FILE_PATH", ruta_datos)
+        ]
+        for parche in parches:
+            parche.start()
+            self.addCleanup(parche.stop)
+        self.addCleanup(self._directorio.cleanup)
+
+        self.trenes, self.estaciones, self.rutas = crear_estado()
+
+    def _silencio(self):
+        return contextlib.redirect_stdout(io.StringIO())
+
+    def _cargar(self):
+        """Carga con una bitácora nueva, como al abrir el simulador."""
+        bitacora = BitacoraGuardado()
+        with self._silencio():
+            data = bitacora.cargar()
+        trenes, estaciones, rutas = data["trenes"], data["estaciones"], data["rutas"]
+        bitacora.marcar_guardado(trenes, estaciones, rutas, bitacora.id_cargado)
+        return bitacora, trenes, estaciones, rutas
+
+    def _guardar(self, bitacora, trenes, estaciones, rutas):
+        with self._silencio():
+            self.assertTrue(bitacora.guardar(trenes, estaciones, rutas))
+
+    def _agregar(self, estaciones, cantidad: int, minuto: int = 0):
+        for i in range(cantidad):
+            estaciones["Rancagua"].agregar_pasajero(
+                Pasajero("Rancagua", "Talca", FECHA + dt.timedelta(minutes=minuto + i))
+            )
+
+    def _anexar(self, bitacora, texto: str):
+        with open(bitacora.ruta_bitacora, 'a', encoding='utf-8') as f:
+            f.write(texto)
+
+    def _estado(self, trenes, estaciones, rutas) -> dict:
+        return {
+            "trenes": serializar_trenes(trenes),
+            "estaciones": serializar_estaciones(estaciones),
+            "rutas": sorted(map(tuple, serializar_rutas(rutas)))
+        }
+
+    def _guardado_inicial(self, pasajeros: int):
+        """Compacta el estado base y guarda `pasajeros` en Rancagua en la bitácora."""
+        bitacora = BitacoraGuardado()
+        with self._silencio():
+            self.assertTrue(bitacora.compactar(self.trenes, self.estaciones, self.rutas))
+        self._agregar(self.estaciones, pasajeros)
+        self._guardar(bitacora, self.trenes, self.estaciones, self.rutas)
+        return bitacora
+
+    # ========== IDA Y VUELTA ==========
+
+    def test_ida_y_vuelta(self):
+        bitacora = self._guardado_inicial(3)
+
+        self.trenes["MERVAL"] = Tren("MERVAL", 400, "Eléctrico", 100)
+        del self.trenes["EMU"]
+        self.estaciones["Talca"].coordenada_x = 220
+        self.estaciones["Curicó"] = Estacion("Curicó", 180, 300)
+        del self.estaciones["Chillán"]
+        self.rutas = [r for r in self.rutas if r.destino != "Chillán"] + [Ruta("Talca", "Curicó", 70)]
+        self.estaciones["Santiago"].despachar_por_destino(5, FECHA + dt.timedelta(hours=2))
+        self._guardar(bitacora, self.trenes, self.estaciones, self.rutas)
+
+        _, trenes, estaciones, rutas = self._cargar()
+        self.assertEqual(
+            self._estado(trenes, estaciones, rutas),
+            self._estado(self.trenes, self.estaciones, self.rutas)
+        )
+
+    def test_carga_sin_diccionarios_de_pasajeros(self):
+        bitacora = self._guardado_inicial(3)
+        self.estaciones["Santiago"].despachar_por_destino(7, FECHA + dt.timedelta(hours=1))
+        self._agregar(self.estaciones, 4, minuto=20)
+        self._guardar(bitacora, self.trenes, self.estaciones, self.rutas)
+
+        # La carga de la bitácora construye los objetos mientras lee el archivo base
+        with mock.patch.object(Guardado, "cargar_datos", side_effect=AssertionError("carga completa")):
+            _, trenes, estaciones, rutas = self._cargar()
+
+        with self._silencio():
+            data = cargar_datos(Guardado.DATA_FILE_PATH)
+        self.assertEqual(self._estado(trenes, estaciones, rutas), {
+            "trenes": data["trenes"],
+            "estaciones": data["estaciones"],
+            "rutas": sorted(map(tuple, data["rutas"]))
+        })
+        self.assertEqual(estaciones["Rancagua"].total_esperando, 7)
+
+    def test_guardados_sucesivos_tras_cargar(self):
+        self._guardado_inicial(3)
+
+        bitacora, trenes, estaciones, rutas = self._cargar()
+        self.assertIsNotNone(bitacora.id_cargado)
+        self._agregar(estaciones, 5, minuto=10)
+        self._guardar(bitacora, trenes, estaciones, rutas)
+
+        _, _, estaciones, _ = self._cargar()
+        self.assertEqual(estaciones["Rancagua"].total_esperando, 8)
+
+    # ========== RECUPERACIÓN ==========
+
+    def test_linea_cortada_al_final(self):
+        bitacora = self._guardado_inicial(3)
+        self._anexar(bitacora, '{"tipo":"pasajeros","estacion":"Ranc')
+
+        bitacora, trenes, estaciones, rutas = self._cargar()
+        self.assertEqual(estaciones["Rancagua"].total_esperando, 3)
+        self._agregar(estaciones, 5, minuto=10)
+        self._guardar(bitacora, trenes, estaciones, rutas)
+
+        _, _, estaciones, _ = self._cargar()
+        self.assertEqual(estaciones["Rancagua"].total_esperando, 8)
+
+    def test_registros_sin_fin(self):
+        bitacora = self._guardado_inicial(3)
+        # Registro completo de un guardado interrumpido antes de su "fin"
+        llegan = [Pasajero("Rancagua", "Talca", FECHA).to_dict()]
+        self._anexar(bitacora, json.dumps({
+            "tipo": "pasajeros", "estacion": "Rancagua", "salen": {"Talca": 2}, "llegan": llegan
+        }) + "\n")
+
+        bitacora, trenes, estaciones, rutas = self._cargar()
+        self.assertEqual(estaciones["Rancagua"].total_esperando, 3)
+        self._agregar(estaciones, 5, minuto=10)
+        self._guardar(bitacora, trenes, estaciones, rutas)
+
+        _, _, estaciones, _ = self._cargar()
+        self.assertEqual(estaciones["Rancagua"].total_esperando, 8)
+
+    def test_fin_sin_salto_de_linea(self):
+        bitacora = self._guardado_inicial(3)
+        with open(bitacora.ruta_bitacora, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            f.truncate()
+
+        bitacora, trenes, estaciones, rutas = self._cargar()
+        # El último guardado quedó sin terminar: solo vale el estado compactado
+        self.assertEqual(estaciones["Rancagua"].total_esperando, 0)
+        self._agregar(estaciones, 5, minuto=10)
+        self._guardar(bitacora, trenes, estaciones, rutas)
+
+        _, _, estaciones, _ = self._cargar()
+        self.assertEqual(estaciones["Rancagua"].total_esperando, 5)
+
+    def test_bitacora_ausente_compacta(self):
+        bitacora = self._guardado_inicial(3)
+        os.remove(bitacora.ruta_bitacora)
+
+        bitacora, trenes, estaciones, rutas = self._cargar()
+        self.assertIsNone(bitacora.id_cargado)
+        self._agregar(estaciones, 5, minuto=10)
+        self._guardar(bitacora, trenes, estaciones, rutas)
+
+        _, _, estaciones, _ = self._cargar()
+        self.assertEqual(estaciones["Rancagua"].total_esperando, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
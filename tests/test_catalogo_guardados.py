@@ -0,0 +1,106 @@
+"""
+Pruebas del catálogo de guardados: entradas vigentes, entradas que se
+refrescan cuando el archivo cambia y entradas de archivos borrados.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from logic import Guardado
+from logic.Guardado import (
+    eliminar_guardado, escribir_guardado, exportar_datos, listar_guardados_con_info
+)
+from tests.test_guardado_binario import crear_estado
+
+
+class PruebaCatalogo(unittest.TestCase):
+
+    def setUp(self):
+        self._directorio = tempfile.TemporaryDirectory()
+        directorio = self._directorio.name
+        parche = mock.patch.multiple(
+            Guardado,
+            SAVE_DIR=directorio,
+            DATA_FILE_PATH=os.path.join(directorio, Guardado.DATA_FILENAME),
+            BACKUP_FILE_PATH=os.path.join(directorio, Guardado.BACKUP_FILENAME),
+            CATALOG_FILE_PATH=os.path.join(directorio, Guardado.CATALOG_FILENAME)
+        )
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.addCleanup(self._directorio.cleanup)
+
+        self.trenes, self.estaciones, self.rutas = crear_estado()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for nombre in ("a.json", "b.bin"):
+                self.assertTrue(exportar_datos(self.trenes, self.estaciones, self.rutas, nombre))
+
+    def _listar(self) -> dict:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return {entrada["nombre"]: entrada for entrada in listar_guardados_con_info()}
+
+    def _catalogo(self) -> dict:
+        with open(Guardado.CATALOG_FILE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _alterar_catalogo(self, nombre: str, **cambios):
+        catalogo = self._catalogo()
+        catalogo[nombre].update(cambios)
+        with open(Guardado.CATALOG_FILE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(catalogo, f)
+
+    def _ruta(self, nombre: str) -> str:
+        return os.path.join(Guardado.SAVE_DIR, nombre)
+
+    def test_entrada_vigente_no_relee_el_archivo(self):
+        self._alterar_catalogo("a.json", num_pasajeros=999)
+
+        with mock.patch.object(Guardado, "leer_info", side_effect=AssertionError("lectura")):
+            guardados = self._listar()
+        self.assertEqual(guardados["a.json"]["num_pasajeros"], 999)
+        self.assertEqual(guardados["b.bin"]["num_pasajeros"], 45)
+
+    def test_cambio_de_tamano_refresca_la_entrada(self):
+        for nombre in ("a.json", "b.bin"):
+            with self.subTest(nombre=nombre):
+                self.estaciones["Talca"].limpiar_pasajeros()
+                # Se reescribe el archivo sin pasar por el catálogo
+                escribir_guardado(self._ruta(nombre), self.trenes, self.estaciones, self.rutas)
+
+                guardados = self._listar()
+                self.assertEqual(guardados[nombre]["num_pasajeros"], 40)
+                self.assertEqual(guardados[nombre]["tamaño_archivo"], os.path.getsize(self._ruta(nombre)))
+                self.assertEqual(self._catalogo()[nombre]["num_pasajeros"], 40)
+
+    def test_cambio_de_fecha_refresca_la_entrada(self):
+        self._alterar_catalogo("a.json", num_pasajeros=999)
+        estado = os.stat(self._ruta("a.json"))
+        os.utime(self._ruta("a.json"), ns=(estado.st_atime_ns, estado.st_mtime_ns + 10**9))
+
+        guardados = self._listar()
+        self.assertEqual(guardados["a.json"]["num_pasajeros"], 45)
+        self.assertEqual(self._catalogo()["a.json"]["modificado_ns"], estado.st_mtime_ns + 10**9)
+
+    def test_archivos_borrados_se_quitan(self):
+        os.remove(self._ruta("b.bin"))
+
+        self.assertEqual(list(self._listar()), ["a.json"])
+        self.assertNotIn("b.bin", self._catalogo())
+
+    def test_eliminar_guardado_quita_la_entrada(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(eliminar_guardado("a.json"))
+
+        self.assertNotIn("a.json", self._catalogo())
+        self.assertIn("b.bin", self._catalogo())
+
+
+if __name__ == '__main__':
+    unittest.main()
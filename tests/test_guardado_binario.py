@@ -0,0 +1,126 @@
+"""
+Pruebas de ida y vuelta del formato binario contra el formato JSON.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import contextlib
+import datetime as dt
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from logic import Guardado
+from logic.Guardado import (
+    cargar_datos, exportar_datos, deserializar_trenes, deserializar_estaciones,
+    deserializar_rutas, serializar_trenes, serializar_estaciones, serializar_rutas
+)
+from models.clases import Tren, Estacion, Ruta, Pasajero
+
+
+FECHA = dt.datetime(2015, 3, 1, 7, 0)
+
+
+def crear_estado():
+    """Estado con pasajeros que esperan, pasajeros que ya partieron y una estación vacía."""
+    trenes = {
+        "BMU": Tren("BMU", 236, "Híbrido", 160),
+        "EMU": Tren("EMU", 300, "Eléctrico", 120)
+    }
+    estaciones = {
+        "Santiago": Estacion("Santiago", 100, 200),
+        "Rancagua": Estacion("Rancagua", 150, 260),
+        "Talca": Estacion("Talca", 210, 330),
+        "Chillán": Estacion("Chillán", 260, 400)
+    }
+    rutas = [
+        Ruta("Santiago", "Rancagua", 87),
+        Ruta("Rancagua", "Talca", 170),
+        Ruta("Talca", "Chillán", 150)
+    ]
+
+    for i in range(40):
+        destino = ("Rancagua", "Talca", "Chillán")[i % 3]
+        pasajero = Pasajero("Santiago", destino, FECHA + dt.timedelta(seconds=45 * i))
+        if i % 4 == 0:
+            pasajero.registrar_partida(FECHA + dt.timedelta(minutes=30 + i))
+        estaciones["Santiago"].agregar_pasajero(pasajero)
+
+    for i in range(5):
+        estaciones["Talca"].agregar_pasajero(
+            Pasajero("Talca", "Chillán", FECHA + dt.timedelta(minutes=i))
+        )
+    # Rancagua y Chillán quedan sin pasajeros
+
+    return trenes, estaciones, rutas
+
+
+class PruebaRoundTripBinario(unittest.TestCase):
+
+    def setUp(self):
+        self._directorio = tempfile.TemporaryDirectory()
+        directorio = self._directorio.name
+        parche = mock.patch.multiple(
+            Guardado,
+            SAVE_DIR=directorio,
+            CATALOG_FILE_PATH=os.path.join(directorio, Guardado.CATALOG_FILENAME)
+        )
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.addCleanup(self._directorio.cleanup)
+
+        self.trenes, self.estaciones, self.rutas = crear_estado()
+
+    def _exportar_y_cargar(self, nombre_archivo: str) -> dict:
+        """Exporta el estado, lo vuelve a cargar y lo serializa como guardar_datos."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(exportar_datos(self.trenes, self.estaciones, self.rutas, nombre_archivo))
+            data = cargar_datos(os.path.join(Guardado.SAVE_DIR, nombre_archivo))
+
+        return {
+            "trenes": serializar_trenes(deserializar_trenes(data["trenes"])),
+            "estaciones": serializar_estaciones(deserializar_estaciones(data["estaciones"])),
+            "rutas": serializar_rutas(deserializar_rutas(data["rutas"]))
+        }
+
+    def test_binario_igual_a_json(self):
+        desde_json = self._exportar_y_cargar("estado.json")
+        desde_binario = self._exportar_y_cargar("estado.bin")
+
+        self.assertEqual(desde_binario, desde_json)
+
+    def test_binario_conserva_estado_original(self):
+        desde_binario = self._exportar_y_cargar("estado.bin")
+
+        self.assertEqual(desde_binario["trenes"], serializar_trenes(self.trenes))
+        self.assertEqual(desde_binario["estaciones"], serializar_estaciones(self.estaciones))
+        self.assertEqual(desde_binario["rutas"], serializar_rutas(self.rutas))
+
+    def test_pasajeros_que_partieron(self):
+        estaciones = self._exportar_y_cargar("estado.bin")["estaciones"]
+        pasajeros = estaciones["Santiago"]["pasajeros_esperando"]
+
+        partidas = [p["tiempo_partida"] for p in pasajeros]
+        self.assertEqual(sum(partida is not None for partida in partidas), 10)
+        self.assertEqual(partidas[0], (FECHA + dt.timedelta(minutes=30)).isoformat())
+        self.assertIsNone(partidas[1])
+
+    def test_estaciones_sin_pasajeros(self):
+        estaciones = self._exportar_y_cargar("estado.bin")["estaciones"]
+
+        self.assertEqual(estaciones["Rancagua"]["pasajeros_esperando"], [])
+        self.assertEqual(estaciones["Chillán"]["pasajeros_esperando"], [])
+        self.assertEqual(len(estaciones["Talca"]["pasajeros_esperando"]), 5)
+
+    def test_estado_sin_pasajeros(self):
+        for estacion in self.estaciones.values():
+            estacion.limpiar_pasajeros()
+
+        self.assertEqual(self._exportar_y_cargar("vacio.bin"), self._exportar_y_cargar("vacio.json"))
+
+
+if __name__ == '__main__':
+    unittest.main()
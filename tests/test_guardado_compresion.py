@@ -0,0 +1,90 @@
+"""
+Pruebas de los guardados comprimidos: ida y vuelta con cada códec y carga
+desde los backups cuando el guardado principal comprimido está dañado.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from logic import Guardado
+from logic.compresion import CODECS
+from logic.Guardado import (
+    cargar_datos, guardar_datos, deserializar_estaciones, serializar_estaciones
+)
+from tests.test_guardado_binario import crear_estado
+
+
+class PruebaGuardadoComprimido(unittest.TestCase):
+
+    def setUp(self):
+        self._directorio = tempfile.TemporaryDirectory()
+        directorio = self._directorio.name
+        parche = mock.patch.multiple(
+            Guardado,
+            SAVE_DIR=directorio,
+            DATA_FILE_PATH=os.path.join(directorio, Guardado.DATA_FILENAME),
+            BACKUP_FILE_PATH=os.path.join(directorio, Guardado.BACKUP_FILENAME),
+            CATALOG_FILE_PATH=os.path.join(directorio, Guardado.CATALOG_FILENAME)
+        )
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.addCleanup(self._directorio.cleanup)
+
+        self.trenes, self.estaciones, self.rutas = crear_estado()
+
+    def _guardar(self, compresion):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(guardar_datos(self.trenes, self.estaciones, self.rutas, compresion=compresion))
+
+    def _cargar(self) -> dict:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return cargar_datos()
+
+    def _estaciones_cargadas(self, data: dict) -> dict:
+        return serializar_estaciones(deserializar_estaciones(data["estaciones"]))
+
+    def _danar_principal(self, corte: float):
+        ruta = Guardado.DATA_FILE_PATH
+        with open(ruta, 'rb') as f:
+            contenido = f.read()
+        with open(ruta, 'wb') as f:
+            f.write(contenido[:int(len(contenido) * corte)])
+
+    def test_ida_y_vuelta_por_codec(self):
+        for compresion in CODECS:
+            with self.subTest(compresion=compresion):
+                self._guardar(compresion)
+                data = self._cargar()
+                self.assertEqual(self._estaciones_cargadas(data), serializar_estaciones(self.estaciones))
+
+    def test_principal_cortado_usa_backup(self):
+        for compresion in CODECS:
+            for corte in (0.5, 0.95):
+                with self.subTest(compresion=compresion, corte=corte):
+                    self._guardar(compresion)
+                    self._guardar(compresion)
+                    self._danar_principal(corte)
+
+                    data = self._cargar()
+                    self.assertEqual(self._estaciones_cargadas(data), serializar_estaciones(self.estaciones))
+
+    def test_backup_mas_reciente_danado_usa_el_siguiente(self):
+        for _ in range(3):
+            self._guardar("gzip")
+        self._danar_principal(0.5)
+        with open(Guardado.ruta_backup(1), 'wb') as f:
+            f.write(b"\x1f\x8b\x08\x00danado")
+
+        data = self._cargar()
+        self.assertEqual(self._estaciones_cargadas(data), serializar_estaciones(self.estaciones))
+
+
+if __name__ == '__main__':
+    unittest.main()
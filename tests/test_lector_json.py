@@ -0,0 +1,127 @@
+"""
+Pruebas del lector JSON incremental contra json.loads, con bloques de
+pocos bytes para que los valores queden cortados entre bloques.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from logic.lector_json import LectorJSON, leer_guardado
+
+
+DOCUMENTOS_ALEATORIOS = 300
+TEXTOS = ["", "a", "Chillán", "línea\nnueva", 'comillas "dobles"', "\\", "☃", "\U0001f686", "\x00\x1f"]
+
+
+def valor_aleatorio(rng: random.Random, profundidad: int = 0):
+    """Valor JSON al azar con números, textos y anidamiento."""
+    tipo = rng.randrange(9 if profundidad < 4 else 6)
+    if tipo == 0:
+        return rng.choice([None, True, False])
+    if tipo == 1:
+        return rng.randint(-10**12, 10**12)
+    if tipo == 2:
+        return rng.choice([0, -0.0, 1.5, -2.25e-7, 3e21, 123456.789, rng.uniform(-1e6, 1e6)])
+    if tipo == 3:
+        return rng.randint(0, 9)
+    if tipo in (4, 5):
+        return rng.choice(TEXTOS)
+    if tipo in (6, 7):
+        return [valor_aleatorio(rng, profundidad + 1) for _ in range(rng.randrange(5))]
+    return {
+        rng.choice(TEXTOS) + str(i): valor_aleatorio(rng, profundidad + 1)
+        for i in range(rng.randrange(5))
+    }
+
+
+def recorrer(lector: LectorJSON):
+    """Reconstruye el siguiente valor usando claves() y elementos() en los contenedores."""
+    caracter = lector.caracter()
+    if caracter == '{':
+        return {clave: recorrer(lector) for clave in lector.claves()}
+    if caracter == '[':
+        return [recorrer(lector) for _ in lector.elementos()]
+    return lector.valor()
+
+
+def leer(texto: str, tamano_bloque: int, recorrido: bool):
+    lector = LectorJSON(io.BytesIO(texto.encode('utf-8')), tamano_bloque=tamano_bloque)
+    resultado = recorrer(lector) if recorrido else lector.valor()
+    lector.verificar_fin()
+    return resultado
+
+
+class PruebaLectorJSON(unittest.TestCase):
+
+    def test_documentos_aleatorios(self):
+        rng = random.Random(0)
+        for numero in range(DOCUMENTOS_ALEATORIOS):
+            documento = valor_aleatorio(rng)
+            texto = json.dumps(
+                documento, ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 2])
+            )
+            esperado = json.loads(texto)
+            for tamano_bloque in range(1, 8):
+                with self.subTest(documento=numero, tamano_bloque=tamano_bloque):
+                    self.assertEqual(leer(texto, tamano_bloque, recorrido=True), esperado)
+                    self.assertEqual(leer(texto, tamano_bloque, recorrido=False), esperado)
+
+    def test_numeros_cortados_entre_bloques(self):
+        for texto in ["-0.5", "12345678", "1e10", "-2.5E-3", "[10, -20.75, 3e2]", '{"n": 123.456}']:
+            for tamano_bloque in range(1, 8):
+                with self.subTest(texto=texto, tamano_bloque=tamano_bloque):
+                    self.assertEqual(leer(texto, tamano_bloque, recorrido=True), json.loads(texto))
+
+    def test_documentos_invalidos(self):
+        for texto in ['{"a": 1', '[1, 2', '{"a" 1}', '[1 2]', '{1: 2}', '{"a": 1} x', '', '[01]']:
+            for tamano_bloque in (1, 3, 1 << 20):
+                with self.subTest(texto=texto, tamano_bloque=tamano_bloque):
+                    with self.assertRaises(json.JSONDecodeError):
+                        leer(texto, tamano_bloque, recorrido=True)
+
+
+class PruebaLeerGuardado(unittest.TestCase):
+
+    def setUp(self):
+        self._directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directorio.cleanup)
+
+    def _eventos(self, documento: dict, tamano_lote: int) -> list:
+        ruta = os.path.join(self._directorio.name, "guardado.json")
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(documento, f, ensure_ascii=False, indent=4)
+        return list(leer_guardado(ruta, tamano_lote))
+
+    def test_eventos_por_lotes(self):
+        pasajeros = [{"id": i, "destino": "Talca"} for i in range(5)]
+        documento = {
+            "version": "1.0",
+            "estaciones": {
+                "Santiago": {"coord_x": 1, "pasajeros_esperando": pasajeros, "coord_y": 2},
+                "Chillán": {"coord_x": 3, "coord_y": 4, "pasajeros_esperando": []}
+            },
+            "rutas": [["Santiago", "Chillán", 400]]
+        }
+
+        self.assertEqual(self._eventos(documento, tamano_lote=2), [
+            ("campo", "version", "1.0"),
+            ("campo", "estaciones", {}),
+            ("pasajeros", "Santiago", pasajeros[0:2]),
+            ("pasajeros", "Santiago", pasajeros[2:4]),
+            ("pasajeros", "Santiago", pasajeros[4:5]),
+            ("estacion", "Santiago", {"coord_x": 1, "coord_y": 2}),
+            ("pasajeros", "Chillán", []),
+            ("estacion", "Chillán", {"coord_x": 3, "coord_y": 4}),
+            ("campo", "rutas", [["Santiago", "Chillán", 400]])
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Pruebas de la simulación sin interfaz: métricas y viajes por la red.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import datetime as dt
+import unittest
+
+from logic.simulacion_sin_interfaz import SimulacionSinInterfaz
+from models.clases import Estacion, Pasajero
+from tests.test_guardado_binario import FECHA, crear_estado
+
+
+class PruebaMetricas(unittest.TestCase):
+
+    def _simular(self, modo_cohortes: bool) -> dict:
+        trenes, estaciones, rutas = crear_estado()
+        # Estado cargado con muchos pasajeros esperando desde antes del inicio
+        llegada = FECHA - dt.timedelta(minutes=30)
+        estaciones["Santiago"].agregar_pasajeros(
+            [Pasajero("Santiago", "Rancagua", llegada) for _ in range(2000)]
+        )
+        simulacion = SimulacionSinInterfaz(trenes, estaciones, rutas, semilla=1, modo_cohortes=modo_cohortes)
+        return simulacion.ejecutar(1)
+
+    def test_espera_promedio_con_pasajeros_cargados(self):
+        for modo_cohortes in (False, True):
+            with self.subTest(modo_cohortes=modo_cohortes):
+                metricas = self._simular(modo_cohortes)
+
+                # Nadie viajaba al inicio: todo el que subió llegó, sigue a bordo o transbordó
+                self.assertEqual(
+                    metricas["pasajeros_embarcados"],
+                    metricas["pasajeros_transportados"] + metricas["pasajeros_a_bordo"]
+                    + metricas["transbordos"]
+                )
+                self.assertGreater(metricas["pasajeros_embarcados"], metricas["pasajeros_generados"])
+                self.assertGreaterEqual(metricas["espera_promedio_min"], 30)
+                self.assertLessEqual(metricas["espera_promedio_min"], metricas["espera_maxima_min"])
+
+
+class PruebaEnrutamiento(unittest.TestCase):
+
+    def test_viajes_de_varios_tramos(self):
+        # Red en línea Santiago - Rancagua - Talca - Chillán: la mayoría de
+        # los pasajeros cargados va a estaciones que no son vecinas
+        for modo_cohortes in (False, True):
+            with self.subTest(modo_cohortes=modo_cohortes):
+                trenes, estaciones, rutas = crear_estado()
+                simulacion = SimulacionSinInterfaz(
+                    trenes, estaciones, rutas, semilla=1,
+                    probabilidad_llegada=1e-9, modo_cohortes=modo_cohortes
+                )
+                metricas = simulacion.ejecutar(1)
+
+                self.assertEqual(metricas["pasajeros_generados"], 0)
+                self.assertEqual(metricas["pasajeros_transportados"], 45)
+                self.assertEqual(metricas["pasajeros_esperando"], 0)
+                self.assertEqual(metricas["pasajeros_a_bordo"], 0)
+
+    def test_destinos_generados_alcanzables(self):
+        trenes, estaciones, rutas = crear_estado()
+        for estacion in estaciones.values():
+            estacion.limpiar_pasajeros()
+        # Estación sin rutas: nadie viaja hacia ella ni se genera en ella
+        estaciones["Arica"] = Estacion("Arica", 0, 0)
+        # Sin trenes los pasajeros generados se quedan esperando
+        simulacion = SimulacionSinInterfaz({}, estaciones, rutas, semilla=2, probabilidad_llegada=0.5)
+        simulacion.avanzar(3600)
+
+        destinos = {p.destino for p in estaciones["Santiago"].pasajeros_esperando}
+        self.assertEqual(destinos, {"Rancagua", "Talca", "Chillán"})
+        self.assertEqual(estaciones["Arica"].total_esperando, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()